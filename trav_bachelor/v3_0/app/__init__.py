@@ -1,8 +1,10 @@
 import os
+import mimetypes
 
-from flask import Flask, Blueprint, render_template, redirect
-from flask_socketio import SocketIO
+from flask import Flask, Blueprint, render_template, redirect, request, send_file, abort, url_for
 from .api import api_bp  # Importer le Blueprint api
+from .websocket import socketio, init_app as init_socketio
+from .core.static_assets import asset_manifest, IMMUTABLE_MAX_AGE
 
 # Chemin vers le dossier statique
 static_folder = os.path.join(os.path.dirname(__file__), 'static')
@@ -13,8 +15,6 @@ core_bp = Blueprint("core", __name__,
                    static_folder=static_folder,
                    static_url_path='/static')
 
-socketio = SocketIO()
-
 @core_bp.route("/")
 def index():
     return render_template("core/index.html")
@@ -35,6 +35,46 @@ def live_broadcast():
 def settings():
     return render_template("core/settings.html")
 
+# Page de tally d'une caméra (mobile, sans dépendance)
+@core_bp.route("/tally/<input_number>")
+def tally(input_number):
+    return render_template("core/tally.html", input_number=input_number)
+
+# Ressources statiques à empreinte (style.<empreinte>.css, précompressées, cache immuable)
+@core_bp.app_template_global()
+def asset_url(path):
+    """URL à empreinte d'une ressource de static (URL statique classique si non gérée)"""
+    return asset_manifest.url(path) or url_for('static', filename=path)
+
+@core_bp.route("/assets/<path:filename>")
+def assets(filename):
+    path, encoding = asset_manifest.resolve(filename, request.headers.get('Accept-Encoding', ''))
+    if path is None:
+        abort(404)
+
+    # Le type MIME est celui du fichier d'origine, pas celui de l'archive .gz/.br
+    mimetype = mimetypes.guess_type(filename)[0] if encoding else None
+
+    response = send_file(path, mimetype=mimetype, conditional=True, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# Médias adressés par contenu : leur URL change avec leur contenu, ils peuvent être mis en cache sans limite
+IMMUTABLE_STATIC_PREFIXES = ('/static/media/store/', '/static/media/team_logos/renditions/')
+
+@core_bp.after_app_request
+def immutable_media_cache(response):
+    if response.status_code == 200 and request.path.startswith(IMMUTABLE_STATIC_PREFIXES):
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
+
 # Routes de test à supprimer ultérieurement
 @core_bp.route("/hello")
 def hello():
@@ -69,4 +109,7 @@ def create_app(test_config=None):
     app.register_blueprint(core_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
 
+    # Canal de push temps réel (Socket.IO)
+    init_socketio(app)
+
     return app
@@ -23,9 +23,21 @@ from .vmix import vmix_bp
 from .teams import teams_bp
 from .stream import stream_bp
 from .replay import replay_bp
+from .scheduler import scheduler_bp
+from .media import media_bp
+from .live import live_bp
+from .tally import tally_bp
+from .export import export_bp
+from .overlays import overlays_bp
 
 # Enregistrer les Blueprints
 api_bp.register_blueprint(vmix_bp, url_prefix='/vmix')
 api_bp.register_blueprint(teams_bp, url_prefix='/teams')
 api_bp.register_blueprint(stream_bp, url_prefix='/stream')
 api_bp.register_blueprint(replay_bp, url_prefix='/replay')
+api_bp.register_blueprint(scheduler_bp, url_prefix='/scheduler')
+api_bp.register_blueprint(media_bp, url_prefix='/media')
+api_bp.register_blueprint(live_bp, url_prefix='/live')
+api_bp.register_blueprint(tally_bp, url_prefix='/tally')
+api_bp.register_blueprint(export_bp, url_prefix='/export')
+api_bp.register_blueprint(overlays_bp, url_prefix='/overlays')
@@ -0,0 +1,68 @@
+from flask import Blueprint, request, jsonify, send_file
+import os
+import logging
+from .replay import replay_manager
+from .live import live_monitor
+from ..core.score_manager import score_manager
+from ..core.match_export import MatchExporter, EXPORT_FILES, to_epoch
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('export_api')
+
+export_bp = Blueprint('export', __name__)
+
+# Exports d'après-match (data/exports/<match>/)
+match_exporter = MatchExporter(
+    replay_manager, score_manager, live_monitor,
+    os.path.join(replay_manager.base_path, 'data', 'exports')
+)
+
+
+@export_bp.route('', methods=['POST'])
+def start_export():
+    """
+    Lancer l'export d'un match (chapitres VOD, liste de coupes, rapport)
+
+    Corps JSON (tous facultatifs) : match, recordingStart (ISO), recordingFile (chemin du fichier vMix),
+    padBefore, padAfter
+    """
+    data = request.json or {}
+    options = {}
+    try:
+        if data.get('recordingStart'):
+            # Heure ISO (locale) ou secondes epoch
+            start = data['recordingStart']
+            options['recording_start'] = to_epoch(start) if isinstance(start, str) else float(start)
+        if data.get('recordingFile'):
+            # Chemin réel de l'enregistrement vMix (une ligne de la liste de coupes par directive)
+            recording_file = str(data['recordingFile']).strip()
+            if '\n' in recording_file or '\r' in recording_file:
+                raise ValueError(recording_file)
+            options['recording_file'] = recording_file
+        if data.get('padBefore') is not None:
+            options['pad_before'] = max(0.0, float(data['padBefore']))
+        if data.get('padAfter') is not None:
+            options['pad_after'] = max(0.0, float(data['padAfter']))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Paramètres d'export invalides"}), 400
+
+    job = match_exporter.start(data.get('match'), **options)
+    return jsonify(job), 202
+
+
+@export_bp.route('/status', methods=['GET'])
+def get_export_status():
+    """Récupérer l'état de l'export d'un match (paramètre match, par défaut le match en cours)"""
+    return jsonify(match_exporter.status(request.args.get('match')))
+
+
+@export_bp.route('/<match_id>/<filename>', methods=['GET'])
+def download_export(match_id, filename):
+    """Télécharger un fichier d'export (chapters.txt, highlights.ffconcat, report.json)"""
+    if filename not in EXPORT_FILES:
+        return jsonify({"error": "Fichier d'export inconnu"}), 404
+    path = os.path.join(match_exporter.match_dir(match_id), filename)
+    if not os.path.isfile(path):
+        return jsonify({"error": "Export introuvable pour ce match"}), 404
+    return send_file(path, as_attachment=True, download_name=filename)
@@ -0,0 +1,216 @@
+from flask import Blueprint, request, jsonify, Response
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+from .vmix import vmix_manager, categorize_inputs, stream_manager, data_dir
+from .teams import team_manager
+from .replay import replay_manager
+from ..core.score_manager import score_manager
+from ..core.event_bus import event_bus, match_room
+from ..core.live_monitor import LiveMonitor
+from ..core.audio_meter import AudioMeter
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('live_api')
+
+live_bp = Blueprint('live', __name__)
+
+# Surveillance de vMix en arrière-plan (publie les changements sur le bus d'événements,
+# sessions d'enregistrement conservées pour les exports d'après-match)
+live_monitor = LiveMonitor(vmix_manager, sessions_file=os.path.join(data_dir, 'recording_sessions.json'),
+                           stream_manager=stream_manager)
+
+# Vumètres audio (démarrés à l'abonnement d'un client Socket.IO au salon 'meters')
+audio_meter = AudioMeter(vmix_manager)
+
+# Dernier état assemblé, réutilisé tant que les versions des sources ne changent pas
+_state_cache = {'versions': None, 'body': None}
+_state_lock = threading.Lock()
+
+# Les versions repartent de zéro au redémarrage : l'ETag inclut un identifiant du processus
+_process_id = uuid.uuid4().hex
+
+# Intervalle des commentaires keep-alive du flux SSE (évite la coupure par les proxys)
+SSE_KEEPALIVE = 15
+
+
+def state_versions(snapshot):
+    """
+    Versions des sources de l'état du direct (aucune lecture de fichier ni requête supplémentaire)
+
+    Args:
+        snapshot (dict): Instantané vMix utilisé pour la réponse
+
+    Returns:
+        tuple: Versions de vMix, du dépôt des équipes, des replays, du score, du match en cours
+               et heures de début du streaming/enregistrement
+    """
+    # get_match() recharge le match s'il a été modifié par un autre processus
+    team_manager.repository.get_match()
+    streaming = live_monitor.streaming_status(snapshot)
+    return (
+        snapshot['version'],
+        team_manager.repository.version,
+        replay_manager.events_store.revision(),
+        score_manager.version,
+        event_bus.match_id,
+        streaming['streamingStartTime'],
+        streaming['recordingStartTime']
+    )
+
+
+def build_state(snapshot):
+    """
+    Assemble l'état complet du direct à partir de l'instantané vMix et des données en mémoire
+
+    Args:
+        snapshot (dict): Instantané vMix (VMixManager.get_snapshot)
+
+    Returns:
+        dict: Mêmes données que /vmix/status, /vmix/inputs, /vmix/streaming-status,
+              /teams/match/current et /replay/events
+    """
+    match = team_manager.get_current_match() or {}
+
+    return {
+        "vmix": {
+            "connected": snapshot['connected'],
+            "host": vmix_manager.host,
+            "port": vmix_manager.port
+        },
+        "inputs": categorize_inputs(snapshot['inputs']),
+        "tally": {
+            "program": snapshot['active'],
+            "preview": snapshot['preview'],
+            "overlays": snapshot['overlays']
+        },
+        "streaming": live_monitor.streaming_status(snapshot),
+        "matchId": event_bus.match_id,
+        "match": {
+            "team_a": match.get('team_a'),
+            "team_b": match.get('team_b')
+        },
+        "score": score_manager.get_state(),
+        "replay": {
+            "events": replay_manager.events_store.load([]) or []
+        }
+    }
+
+
+@live_bp.route('/state', methods=['GET'])
+def get_live_state():
+    """
+    Récupérer en une seule requête l'état du tableau de bord du direct
+
+    L'ETag est calculé à partir des versions des sources : si le client
+    possède déjà cet état (If-None-Match), la réponse est un 304 sans
+    assemblage ni sérialisation.
+    """
+    try:
+        snapshot = vmix_manager.get_snapshot()
+        versions = state_versions(snapshot)
+        etag = hashlib.sha1(f"{_process_id}:{versions}".encode('utf-8')).hexdigest()
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            with _state_lock:
+                if _state_cache['versions'] != versions:
+                    _state_cache['body'] = json.dumps(build_state(snapshot))
+                    _state_cache['versions'] = versions
+                body = _state_cache['body']
+            response = Response(body, mimetype='application/json')
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        logger.error(f"Erreur lors de l'assemblage de l'état du direct: {str(e)}")
+        return jsonify({"error": f"Erreur lors de la récupération de l'état du direct: {str(e)}"}), 500
+
+
+def format_sse(event):
+    """Formate un événement du bus pour le flux SSE (données déjà sérialisées par le bus)"""
+    return f"id: {event_bus.event_id(event)}\nevent: {event['name']}\ndata: {event['json']}\n\n"
+
+
+@live_bp.route('/events', methods=['GET'])
+def stream_live_events():
+    """
+    Flux Server-Sent Events des événements du direct (alternative à Socket.IO)
+
+    Transmet les événements globaux (vMix, tally, streaming) et ceux du match
+    demandé (?match_id=, par défaut le match en cours). À la reconnexion, le
+    navigateur envoie l'en-tête Last-Event-ID : seuls les événements manqués
+    sont renvoyés. Si le journal ne les contient plus (reconnexion tardive ou
+    client trop lent), un événement 'reset' demande au client de recharger
+    /api/live/state.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    room = match_room(request.args.get('match_id') or event_bus.match_id)
+
+    # Sans identifiant, le client vient de charger l'état complet : seuls les nouveaux événements sont transmis
+    missed, position = event_bus.since(last_event_id or event_bus.last_id())
+
+    live_monitor.start()
+
+    def generate():
+        current = position
+        # Délai de reconnexion conseillé au navigateur
+        yield "retry: 3000\n\n"
+
+        if missed is None:
+            yield f"id: {event_bus.last_id()}\nevent: reset\ndata: {{}}\n\n"
+        else:
+            for event in missed:
+                if event['room'] in (None, room):
+                    yield format_sse(event)
+
+        while True:
+            events = event_bus.wait(current, timeout=SSE_KEEPALIVE)
+            if events is None:
+                # Événements perdus : repartir du dernier événement publié
+                reset_id = event_bus.last_id()
+                _, current = event_bus.since(reset_id)
+                yield f"id: {reset_id}\nevent: reset\ndata: {{}}\n\n"
+                continue
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                current = event['id']
+                if event['room'] in (None, room):
+                    yield format_sse(event)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@live_bp.route('/meters', methods=['GET'])
+def get_meters():
+    """Récupérer la configuration des vumètres et la dernière trame envoyée"""
+    return jsonify({
+        "config": audio_meter.config(),
+        "frame": audio_meter.last_frame
+    })
+
+
+@live_bp.route('/meters/config', methods=['POST'])
+def configure_meters():
+    """
+    Modifier les fréquences des vumètres
+
+    Corps JSON: {"sampleRate": 20, "frameRate": 10} (Hz)
+    """
+    data = request.json or {}
+    try:
+        config = audio_meter.configure(data.get('sampleRate'), data.get('frameRate'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Fréquences invalides"}), 400
+    return jsonify({"success": True, "config": config})
@@ -0,0 +1,31 @@
+from flask import Blueprint, request, jsonify
+import logging
+from ..core.media_store import media_store
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('media_api')
+
+media_bp = Blueprint('media', __name__)
+
+@media_bp.route('/stats', methods=['GET'])
+def get_media_stats():
+    """Statistiques du stockage des médias (fichiers, taille, orphelins)"""
+    return jsonify({"stats": media_store.stats()})
+
+@media_bp.route('/gc', methods=['POST'])
+def collect_media():
+    """Supprimer les médias qui ne sont plus référencés"""
+    data = request.get_json(silent=True) or {}
+
+    try:
+        grace = float(data['grace']) if 'grace' in data else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Le délai de grâce doit être un nombre"}), 400
+
+    if grace is not None and grace < 0:
+        return jsonify({"error": "Le délai de grâce doit être positif"}), 400
+
+    result = media_store.gc(grace)
+    logger.info(f"Ramasse-miettes demandé: {result['removed']} fichiers supprimés")
+    return jsonify({"status": "success", "result": result})
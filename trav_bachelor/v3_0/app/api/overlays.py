@@ -0,0 +1,163 @@
+from flask import Blueprint, request, jsonify, Response
+import logging
+from .vmix import vmix_manager, team_manager
+from ..core.overlay_manager import OverlayManager
+from ..core.score_manager import score_manager
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('overlays_api')
+
+overlays_bp = Blueprint('overlays', __name__)
+
+# Gestionnaire d'overlays partagé (canaux, presets, rotation des sponsors)
+overlay_manager = OverlayManager(vmix_manager)
+
+# Un point marqué termine l'échange en cours (fin de l'interruption des sponsors)
+score_manager.add_listener(overlay_manager.sponsor_rotation.on_match_event)
+
+
+@overlays_bp.route('/channels', methods=['GET'])
+def get_overlay_channels():
+    """Récupérer l'état des canaux d'overlay (input, à l'antenne, transition)"""
+    overlay_manager.channels.sync()
+    return jsonify({"channels": overlay_manager.channels.state(), "skipped": overlay_manager.channels.skipped})
+
+
+@overlays_bp.route('/sponsors', methods=['GET'])
+def get_sponsor_rotation():
+    """Récupérer l'état de la rotation des sponsors"""
+    return jsonify(overlay_manager.sponsor_rotation.status())
+
+
+@overlays_bp.route('/sponsors/start', methods=['POST'])
+def start_sponsor_rotation():
+    """
+    Démarrer la rotation des sponsors
+
+    Corps JSON : sponsors [{name, logo, weight, minAirtime}], interval (secondes), inputs (titres A/B)
+    """
+    data = request.json or {}
+    try:
+        started = overlay_manager.start_sponsor_rotation(data.get('sponsors') or [], data.get('interval', 30),
+                                                         data.get('inputs'))
+    except (TypeError, ValueError, KeyError):
+        return jsonify({"error": "Liste de sponsors invalide"}), 400
+    if not started:
+        return jsonify({"error": "Aucun sponsor ou aucun titre sponsor disponible"}), 400
+    return jsonify(overlay_manager.sponsor_rotation.status())
+
+
+@overlays_bp.route('/sponsors/stop', methods=['POST'])
+def stop_sponsor_rotation():
+    """Arrêter la rotation des sponsors"""
+    overlay_manager.stop_sponsor_rotation()
+    return jsonify(overlay_manager.sponsor_rotation.status())
+
+
+@overlays_bp.route('/sponsors/blackout', methods=['POST'])
+def set_sponsor_blackout():
+    """
+    Interrompre ou reprendre la rotation
+
+    Corps JSON : reason ('rally' : échange en cours, terminé par le point suivant ; 'manual'), active
+    """
+    data = request.json or {}
+    reason = data.get('reason', 'manual')
+    if reason not in ('rally', 'manual'):
+        return jsonify({"error": "Motif d'interruption invalide"}), 400
+    overlay_manager.sponsor_rotation.set_blackout(reason, bool(data.get('active', True)))
+    return jsonify(overlay_manager.sponsor_rotation.status())
+
+
+@overlays_bp.route('/sponsors/report', methods=['GET'])
+def get_sponsor_report():
+    """Rapport du temps d'antenne par sponsor (paramètres : match, format=json|csv)"""
+    match_id = request.args.get('match')
+    if request.args.get('format') == 'csv':
+        report = overlay_manager.sponsor_rotation.report_csv(match_id)
+        response = Response(report, mimetype='text/csv')
+        response.headers['Content-Disposition'] = 'attachment; filename=temps_antenne_sponsors.csv'
+        return response
+    return jsonify(overlay_manager.sponsor_rotation.report(match_id))
+
+
+def _player_card_request():
+    """Joueur et nom d'équipe d'une requête de fiche joueur (None si le joueur manque)"""
+    data = request.json or {}
+    player = data.get('player')
+    if not isinstance(player, dict) or not player:
+        return None, None
+    team_name = data.get('teamName')
+    if not team_name and data.get('teamId'):
+        team = team_manager.get_team(data['teamId'])
+        team_name = team['name'] if team else None
+    return player, team_name
+
+
+@overlays_bp.route('/player-card', methods=['GET'])
+def get_player_card():
+    """Récupérer l'état des fiches joueur (tampons A/B, fiche à l'antenne)"""
+    overlay_manager.channels.sync()
+    return jsonify(overlay_manager.player_cards.status())
+
+
+@overlays_bp.route('/player-card', methods=['POST'])
+def show_player_card():
+    """
+    Afficher la fiche d'un joueur (un seul changement d'overlay si elle est préparée)
+
+    Corps JSON : player, teamId ou teamName, duration (secondes, optionnel)
+    """
+    player, team_name = _player_card_request()
+    if player is None:
+        return jsonify({"error": "Les données du joueur sont requises"}), 400
+    try:
+        duration = float((request.json or {}).get('duration') or 0) or None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Durée d'affichage invalide"}), 400
+    if not overlay_manager.player_cards.show(player, team_name, duration):
+        return jsonify({"error": "Erreur lors de l'affichage de la fiche joueur dans vMix"}), 500
+    return jsonify(overlay_manager.player_cards.status())
+
+
+@overlays_bp.route('/player-card/prepare', methods=['POST'])
+def prepare_player_card():
+    """
+    Préparer hors antenne la fiche d'un joueur probable (corps JSON : player, teamId ou teamName)
+
+    Sans effet si le seul titre de fiche est à l'antenne : la fiche sera écrite à l'affichage.
+    """
+    player, team_name = _player_card_request()
+    if player is None:
+        return jsonify({"error": "Les données du joueur sont requises"}), 400
+    if overlay_manager.player_cards.prepare(player, team_name) is None:
+        return jsonify({"error": "Erreur lors de la préparation de la fiche joueur"}), 500
+    return jsonify(overlay_manager.player_cards.status())
+
+
+@overlays_bp.route('/player-card/hide', methods=['POST'])
+def hide_player_card():
+    """Retirer la fiche joueur de l'antenne"""
+    if not overlay_manager.player_cards.hide():
+        return jsonify({"error": "Erreur lors du masquage de la fiche joueur"}), 500
+    return jsonify(overlay_manager.player_cards.status())
+
+
+@overlays_bp.route('/player-card/buffers', methods=['POST'])
+def configure_player_card_buffers():
+    """Définir les deux titres tampons des fiches (corps JSON : inputs [A, B], channel)"""
+    data = request.json or {}
+    inputs = data.get('inputs')
+    if not isinstance(inputs, list) or len(inputs) != 2 or inputs[0] == inputs[1]:
+        return jsonify({"error": "Deux titres vMix distincts sont requis"}), 400
+    try:
+        channel = int(data['channel']) if data.get('channel') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Canal d'overlay invalide"}), 400
+    if channel is not None and channel not in (1, 2, 3, 4):
+        return jsonify({"error": "Canal d'overlay invalide"}), 400
+    state = overlay_manager.player_cards.configure(inputs, channel)
+    if state is None:
+        return jsonify({"error": "Deux titres vMix distincts sont requis"}), 400
+    return jsonify(state)
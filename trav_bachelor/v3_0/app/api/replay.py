@@ -2,7 +2,12 @@ from flask import Blueprint, request, jsonify
 import os
 import json
 import logging
+from datetime import datetime
 from ..core.replay_manager import ReplayManager
+from ..core.highlight_builder import HighlightBuilder, ORDERS
+from ..core.score_manager import score_manager
+from ..core.replay_catalog import DEFAULT_PAGE_SIZE
+from ..core.event_bus import event_bus
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -13,6 +18,12 @@ replay_bp = Blueprint('replay', __name__)
 # Instance du gestionnaire de replay
 replay_manager = ReplayManager()
 
+# Replays automatiques déclenchés par les événements de match (point, set, match)
+score_manager.add_listener(replay_manager.on_match_event)
+
+# Résumés (enchaînement de clips programmé dans le planificateur)
+highlight_builder = HighlightBuilder(replay_manager)
+
 @replay_bp.route('/config', methods=['GET'])
 def get_replay_config():
     """Récupérer la configuration des replays"""
@@ -23,6 +34,39 @@ def get_replay_config():
         logger.error(f"Erreur lors de la récupération de la configuration des replays: {str(e)}")
         return jsonify({"error": "Erreur lors de la récupération de la configuration"}), 500
 
+@replay_bp.route('/config', methods=['POST'])
+def update_replay_config():
+    """Mettre à jour les réglages du replay automatique"""
+    try:
+        data = request.json
+
+        if not data:
+            return jsonify({"error": "Aucune donnée fournie"}), 400
+
+        pre_roll = data.get('preRoll')
+        if pre_roll is not None:
+            try:
+                pre_roll = int(pre_roll)
+            except (TypeError, ValueError):
+                return jsonify({"error": "Le pré-roll doit être un nombre entier"}), 400
+
+            if pre_roll < 1 or pre_roll > 60:
+                return jsonify({"error": "Le pré-roll doit être entre 1 et 60 secondes"}), 400
+
+        result = replay_manager.update_auto_replay_config(
+            enabled=data.get('enableAutoReplay'),
+            events=data.get('events'),
+            pre_roll=pre_roll
+        )
+
+        if result:
+            return jsonify({"status": "success", "config": replay_manager.config})
+        else:
+            return jsonify({"error": "Erreur lors de l'enregistrement de la configuration"}), 500
+    except Exception as e:
+        logger.error(f"Erreur lors de la mise à jour de la configuration des replays: {str(e)}")
+        return jsonify({"error": f"Erreur lors de la mise à jour de la configuration: {str(e)}"}), 500
+
 @replay_bp.route('/set-duration', methods=['POST'])
 def set_replay_duration():
     """Définir la durée du buffer de replay"""
@@ -141,8 +185,12 @@ def mark_replay_event():
         if data and 'type' in data:
             event_type = data['type']
 
+        # Joueurs impliqués et tags libres (catalogue des replays)
+        players = (data or {}).get('players') or []
+        tags = (data or {}).get('tags') or []
+
         # Marquer l'événement
-        result, events = replay_manager.mark_event(name, event_type)
+        result, events = replay_manager.mark_event(name, event_type, players=players, tags=tags)
 
         if result:
             return jsonify({
@@ -162,11 +210,11 @@ def play_replay_event():
     try:
         data = request.json
 
-        # Valider les données
-        if not data or 'eventIndex' not in data:
+        # Valider les données (identifiant stable, ou index pour les anciens clients)
+        if not data or ('eventId' not in data and 'eventIndex' not in data):
             return jsonify({"error": "L'index de l'événement est requis"}), 400
 
-        event_index = int(data['eventIndex'])
+        event_ref = data['eventId'] if 'eventId' in data else int(data['eventIndex'])
 
         # Vitesse par défaut
         speed = 100
@@ -180,20 +228,55 @@ def play_replay_event():
                 return jsonify({"error": "La vitesse doit être l'une des valeurs suivantes: 25, 50, 75, 100"}), 400
 
         # Lire l'événement
-        result = replay_manager.play_event(event_index, speed)
+        result = replay_manager.play_event(event_ref, speed)
 
         if result:
-            return jsonify({"status": "success", "message": f"Lecture de l'événement {event_index} à {speed}%"})
+            return jsonify({"status": "success", "message": f"Lecture de l'événement {event_ref} à {speed}%"})
         else:
             return jsonify({"error": "Erreur lors de la lecture de l'événement"}), 500
     except Exception as e:
         logger.error(f"Erreur lors de la lecture de l'événement: {str(e)}")
         return jsonify({"error": f"Erreur lors de la lecture de l'événement: {str(e)}"}), 500
 
+# Critères de recherche du catalogue des replays
+SEARCH_PARAMS = ('match', 'type', 'set', 'player', 'tag', 'from', 'to', 'page', 'per_page')
+
 @replay_bp.route('/events', methods=['GET'])
 def get_replay_events():
-    """Récupérer la liste des événements de replay"""
+    """
+    Récupérer la liste des événements de replay
+
+    Sans paramètre, retourne tous les événements du match en cours. Avec
+    des critères (?type=point&set=2&player=...&tag=...&from=...&to=...
+    &match=...&page=1&per_page=50), retourne une page de résultats du
+    catalogue indexé (match en cours ou archive d'un match précédent).
+    """
     try:
+        args = request.args
+        if any(param in args for param in SEARCH_PARAMS):
+            try:
+                start = datetime.fromisoformat(args['from']).isoformat() if args.get('from') else None
+                end = args['to'] if args.get('to') else None
+                if end:
+                    datetime.fromisoformat(end)
+                set_number = int(args['set']) if args.get('set') else None
+                page = int(args.get('page', 1))
+                per_page = int(args.get('per_page', DEFAULT_PAGE_SIZE))
+            except ValueError:
+                return jsonify({"error": "Critères de recherche invalides"}), 400
+
+            return jsonify(replay_manager.search(
+                match_id=args.get('match') or None,
+                event_type=args.get('type') or None,
+                set_number=set_number,
+                player=args.get('player') or None,
+                tag=args.get('tag') or None,
+                start=start,
+                end=end,
+                page=page,
+                per_page=per_page
+            ))
+
         events = replay_manager.load_events()
         return jsonify({"events": events})
     except Exception as e:
@@ -216,14 +299,14 @@ def delete_replay_event():
     try:
         data = request.json
 
-        # Valider les données
-        if not data or 'eventIndex' not in data:
+        # Valider les données (identifiant stable, ou index pour les anciens clients)
+        if not data or ('eventId' not in data and 'eventIndex' not in data):
             return jsonify({"error": "L'index de l'événement est requis"}), 400
 
-        event_index = int(data['eventIndex'])
+        event_ref = data['eventId'] if 'eventId' in data else int(data['eventIndex'])
 
         # Supprimer l'événement
-        success, events, warning = replay_manager.delete_event(event_index)
+        success, events, warning = replay_manager.delete_event(event_ref)
 
         if success:
             return jsonify({
@@ -237,3 +320,117 @@ def delete_replay_event():
     except Exception as e:
         logger.error(f"Erreur lors de la suppression de l'événement: {str(e)}")
         return jsonify({"error": f"Erreur lors de la suppression de l'événement: {str(e)}"}), 500
+
+@replay_bp.route('/vmix-state', methods=['GET'])
+def get_replay_vmix_state():
+    """Récupérer l'état du replay lu dans vMix (liste d'événements, enregistrement) et les compteurs par liste"""
+    replay = replay_manager.reconcile(max_age=0)
+    if replay is None:
+        return jsonify({"connected": False, "counts": replay_manager.vmix_event_counts})
+    return jsonify(replay)
+
+@replay_bp.route('/vmix-state/resync', methods=['POST'])
+def resync_replay_vmix_state():
+    """
+    Recaler le nombre d'événements d'une liste vMix (après l'avoir vidée ou modifiée dans vMix)
+
+    Corps JSON: {"eventsList": 1, "count": 0}
+    """
+    data = request.json or {}
+    try:
+        events_list = int(data.get('eventsList', 1))
+        count = int(data.get('count', 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Liste ou nombre d'événements invalide"}), 400
+    if not 1 <= events_list <= 20 or count < 0:
+        return jsonify({"error": "Liste ou nombre d'événements invalide"}), 400
+
+    counts = replay_manager.resync_vmix_events(events_list, count)
+    return jsonify({"status": "success", "counts": counts, "events": replay_manager.events})
+
+@replay_bp.route('/events/<event_id>/metadata', methods=['POST'])
+def update_replay_event_metadata(event_id):
+    """
+    Modifier les tags libres et les joueurs impliqués d'un événement
+
+    Corps JSON: {"tags": ["ace", "top5"], "players": ["Dupont"]}
+    """
+    data = request.json or {}
+    tags, players = data.get('tags'), data.get('players')
+    if (tags is not None and not isinstance(tags, list)) or (players is not None and not isinstance(players, list)):
+        return jsonify({"error": "Les tags et les joueurs doivent être des listes"}), 400
+
+    event = replay_manager.update_event_metadata(event_id, tags=tags, players=players)
+    if event is None:
+        return jsonify({"error": "Événement introuvable"}), 404
+    return jsonify({"status": "success", "event": event})
+
+@replay_bp.route('/matches', methods=['GET'])
+def get_replay_matches():
+    """Récupérer la liste des matchs dont les événements de replay sont archivés"""
+    return jsonify({"current": event_bus.match_id, "archived": replay_manager.archive.matches()})
+
+def _highlight_criteria(data):
+    """Extrait les critères de sélection d'un résumé du corps JSON (None si invalides)"""
+    criteria = {key: data.get(key) for key in ('ids', 'type', 'set', 'player', 'tag', 'team', 'limit', 'order')
+                if data.get(key) not in (None, '', [])}
+    if 'ids' in criteria and not isinstance(criteria['ids'], list):
+        return None
+    if criteria.get('order') and criteria['order'] not in ORDERS:
+        return None
+    try:
+        if 'limit' in criteria:
+            criteria['limit'] = int(criteria['limit'])
+        if 'set' in criteria and criteria['set'] != 'last':
+            criteria['set'] = int(criteria['set'])
+    except (TypeError, ValueError):
+        return None
+    return criteria
+
+@replay_bp.route('/highlights/preview', methods=['POST'])
+def preview_highlights():
+    """
+    Prévisualiser la sélection d'un résumé sans le lire
+
+    Corps JSON: {"type": "point", "set": "last", "limit": 5} ou {"ids": [...]}
+    """
+    criteria = _highlight_criteria(request.json or {})
+    if criteria is None:
+        return jsonify({"error": "Critères de sélection invalides"}), 400
+    return jsonify({"events": highlight_builder.select(criteria)})
+
+@replay_bp.route('/highlights/play', methods=['POST'])
+def play_highlights():
+    """
+    Lancer un résumé : les clips sélectionnés s'enchaînent automatiquement
+
+    Corps JSON: critères de sélection + {"speed": 100, "gap": 0.5, "name": "Top 5 du set"}
+    """
+    data = request.json or {}
+    criteria = _highlight_criteria(data)
+    if criteria is None:
+        return jsonify({"error": "Critères de sélection invalides"}), 400
+
+    try:
+        speed = int(data.get('speed', 100))
+        gap = float(data.get('gap', 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Vitesse ou pause invalide"}), 400
+    if speed not in [25, 50, 75, 100] or gap < 0:
+        return jsonify({"error": "La vitesse doit être l'une des valeurs suivantes: 25, 50, 75, 100"}), 400
+
+    reel = highlight_builder.play(criteria, speed=speed, gap=gap, name=data.get('name'))
+    if reel is None:
+        return jsonify({"error": "Aucun événement ne correspond aux critères"}), 404
+    return jsonify({"status": "success", "highlight": reel})
+
+@replay_bp.route('/highlights/stop', methods=['POST'])
+def stop_highlights():
+    """Arrêter le résumé en cours"""
+    stopped = highlight_builder.stop()
+    return jsonify({"status": "success" if stopped else "idle", "highlight": highlight_builder.status()})
+
+@replay_bp.route('/highlights/status', methods=['GET'])
+def get_highlights_status():
+    """Récupérer l'avancement du résumé en cours"""
+    return jsonify(highlight_builder.status())
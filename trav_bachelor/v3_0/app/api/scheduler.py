@@ -0,0 +1,44 @@
+from flask import Blueprint, request, jsonify
+import logging
+from ..core.scheduler import scheduler
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('scheduler_api')
+
+scheduler_bp = Blueprint('scheduler', __name__)
+
+@scheduler_bp.route('/jobs', methods=['GET'])
+def get_scheduled_jobs():
+    """Lister les actions différées en attente"""
+    return jsonify({"jobs": scheduler.list_jobs()})
+
+@scheduler_bp.route('/jobs/<path:key>', methods=['DELETE'])
+def cancel_scheduled_job(key):
+    """Annuler une action différée"""
+    if not scheduler.cancel(key):
+        return jsonify({"error": f"Aucune tâche programmée pour '{key}'"}), 404
+
+    return jsonify({"status": "success", "message": f"Tâche '{key}' annulée"})
+
+@scheduler_bp.route('/jobs/<path:key>/reschedule', methods=['POST'])
+def reschedule_job(key):
+    """Reprogrammer une action différée avec un nouveau délai"""
+    data = request.json
+
+    if not data or 'delay' not in data:
+        return jsonify({"error": "Le délai est requis"}), 400
+
+    try:
+        delay = float(data['delay'])
+    except (TypeError, ValueError):
+        return jsonify({"error": "Le délai doit être un nombre"}), 400
+
+    if delay < 0:
+        return jsonify({"error": "Le délai doit être positif"}), 400
+
+    if not scheduler.reschedule(key, delay):
+        return jsonify({"error": f"Aucune tâche programmée pour '{key}'"}), 404
+
+    logger.info(f"Tâche '{key}' reprogrammée dans {delay}s")
+    return jsonify({"status": "success", "message": f"Tâche '{key}' reprogrammée dans {delay}s"})
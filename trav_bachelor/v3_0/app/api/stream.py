@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app
 import os
-import json
 from werkzeug.utils import secure_filename
-import uuid
 import logging
+from ..core.score_manager import score_manager
+from ..core.persistence import JsonStore
+from ..core.media_store import media_store
+from ..core.team_manager import TeamManager
+from ..core.thumbnail_renderer import MatchThumbnailRenderer, ThumbnailUnavailable
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -13,39 +16,42 @@ stream_bp = Blueprint('stream', __name__)
 
 # Chemin pour les données de configuration
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'stream_config.json')
-THUMBNAILS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'thumbnails')
 
-# Créer les répertoires s'ils n'existent pas
+# Créer le répertoire s'il n'existe pas
 os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-os.makedirs(THUMBNAILS_DIR, exist_ok=True)
+
+# Configuration persistante (gardée en mémoire, écriture atomique et différée)
+config_store = JsonStore.for_file(CONFIG_FILE)
+
+# Génération de la miniature du match à partir des équipes configurées
+team_manager = TeamManager()
+thumbnail_renderer = MatchThumbnailRenderer(team_manager.logo_pipeline)
 
 # Initialiser le fichier de configuration s'il n'existe pas
-if not os.path.exists(CONFIG_FILE):
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump({
-            'title': '',
-            'service': 'custom',
-            'quality': '1080p30',
-            'rtmpUrl': '',
-            'streamKey': '',
-            'description': '',
-            'autoStartRecording': False,
-            'autoStartStreaming': False,
-            'thumbnailUrl': None
-        }, f, indent=2)
+if not config_store.exists():
+    config_store.save_now({
+        'title': '',
+        'service': 'custom',
+        'quality': '1080p30',
+        'rtmpUrl': '',
+        'streamKey': '',
+        'description': '',
+        'autoStartRecording': False,
+        'autoStartStreaming': False,
+        'thumbnailUrl': None
+    })
 
 @stream_bp.route('/config', methods=['GET'])
 def get_stream_config():
     """Récupérer la configuration du streaming"""
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
+        config = config_store.load({})
 
-            # Ne pas renvoyer la clé de stream complète pour des raisons de sécurité
-            if 'streamKey' in config and config['streamKey']:
-                config['streamKey'] = '••••••••••••••••'
+        # Ne pas renvoyer la clé de stream complète pour des raisons de sécurité
+        if 'streamKey' in config and config['streamKey']:
+            config['streamKey'] = '••••••••••••••••'
 
-            return jsonify({"config": config})
+        return jsonify({"config": config})
     except Exception as e:
         logger.error(f"Erreur lors de la récupération de la configuration du streaming: {str(e)}")
         return jsonify({"error": "Erreur lors de la récupération de la configuration"}), 500
@@ -55,8 +61,7 @@ def save_stream_config():
     """Enregistrer la configuration du streaming"""
     try:
         # Récupérer la configuration existante
-        with open(CONFIG_FILE, 'r') as f:
-            existing_config = json.load(f)
+        existing_config = config_store.load({})
 
         # Mettre à jour les champs simples
         for field in ['title', 'service', 'quality', 'rtmpUrl', 'description']:
@@ -71,34 +76,18 @@ def save_stream_config():
         if 'streamKey' in request.form and request.form['streamKey'] and request.form['streamKey'] != '••••••••••••••••':
             existing_config['streamKey'] = request.form['streamKey']
 
-        # Traiter la miniature si fournie
+        # Traiter la miniature si fournie (stockage par empreinte, servie directement en statique)
+        thumbnail_hash = None
         if 'thumbnail' in request.files and request.files['thumbnail'].filename:
             thumbnail_file = request.files['thumbnail']
-
-            # Sécuriser le nom de fichier
-            filename = secure_filename(thumbnail_file.filename)
-            # Ajouter un identifiant unique pour éviter les collisions
-            unique_filename = f"{uuid.uuid4()}_{filename}"
-            # Chemin complet
-            filepath = os.path.join(THUMBNAILS_DIR, unique_filename)
-
-            # Enregistrer le fichier
-            thumbnail_file.save(filepath)
-
-            # Mettre à jour l'URL dans la configuration
-            existing_config['thumbnailUrl'] = f"/static/thumbnails/{unique_filename}"
-
-            # Créer un lien symbolique vers le dossier static si nécessaire
-            static_thumbnails_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'thumbnails')
-            os.makedirs(static_thumbnails_dir, exist_ok=True)
-
-            # Copier le fichier dans le dossier static
-            import shutil
-            shutil.copy2(filepath, os.path.join(static_thumbnails_dir, unique_filename))
+            blob = media_store.put(thumbnail_file, secure_filename(thumbnail_file.filename))
+            existing_config['thumbnailUrl'] = blob['url']
+            thumbnail_hash = blob['hash']
 
         # Enregistrer la configuration mise à jour
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(existing_config, f, indent=2)
+        config_store.save(existing_config)
+        if thumbnail_hash:
+            media_store.set_ref('stream:thumbnail', thumbnail_hash)
 
         return jsonify({
             "message": "Configuration du streaming enregistrée avec succès",
@@ -113,8 +102,7 @@ def start_streaming():
     """Démarrer le streaming"""
     try:
         # Récupérer la configuration
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
+        config = config_store.load({})
 
         # Importer le gestionnaire vMix
         from ..core.vmix_manager import VMixManager
@@ -166,13 +154,11 @@ def toggle_thumbnail():
         show = data.get('show', False)
 
         # Mettre à jour la configuration
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
+        config = config_store.load({})
 
         config['thumbnailVisible'] = show
 
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        config_store.save(config)
 
         # Importer le gestionnaire vMix
         from ..core.vmix_manager import VMixManager
@@ -227,49 +213,15 @@ def upload_thumbnail():
             }), 400
 
         # Récupérer la configuration existante
-        with open(CONFIG_FILE, 'r') as f:
-            existing_config = json.load(f)
-
-        # Supprimer l'ancienne miniature si elle existe
-        if 'thumbnailUrl' in existing_config and existing_config['thumbnailUrl']:
-            try:
-                old_filename = os.path.basename(existing_config['thumbnailUrl'])
-                old_filepath = os.path.join(THUMBNAILS_DIR, old_filename)
-                if os.path.exists(old_filepath):
-                    os.remove(old_filepath)
-
-                # Supprimer également du dossier static
-                static_thumbnails_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'thumbnails')
-                old_static_filepath = os.path.join(static_thumbnails_dir, old_filename)
-                if os.path.exists(old_static_filepath):
-                    os.remove(old_static_filepath)
-            except Exception as e:
-                logger.warning(f"Erreur lors de la suppression de l'ancienne miniature: {str(e)}")
-
-        # Sécuriser le nom de fichier
-        filename = secure_filename(thumbnail_file.filename)
-        # Ajouter un identifiant unique pour éviter les collisions
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        # Chemin complet
-        filepath = os.path.join(THUMBNAILS_DIR, unique_filename)
-
-        # Enregistrer le fichier
-        thumbnail_file.save(filepath)
-
-        # Mettre à jour l'URL dans la configuration
-        existing_config['thumbnailUrl'] = f"/static/thumbnails/{unique_filename}"
-
-        # Créer un lien symbolique vers le dossier static si nécessaire
-        static_thumbnails_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'thumbnails')
-        os.makedirs(static_thumbnails_dir, exist_ok=True)
-
-        # Copier le fichier dans le dossier static
-        import shutil
-        shutil.copy2(filepath, os.path.join(static_thumbnails_dir, unique_filename))
+        existing_config = config_store.load({})
 
-        # Enregistrer la configuration mise à jour
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(existing_config, f, indent=2)
+        # Enregistrer le fichier (un contenu déjà connu n'est pas dupliqué)
+        blob = media_store.put(thumbnail_file, secure_filename(thumbnail_file.filename))
+        existing_config['thumbnailUrl'] = blob['url']
+
+        # Enregistrer la configuration mise à jour ; l'ancienne miniature est libérée
+        config_store.save(existing_config)
+        media_store.set_ref('stream:thumbnail', blob['hash'])
 
         return jsonify({
             "success": True,
@@ -283,13 +235,61 @@ def upload_thumbnail():
             "message": f"Erreur lors du téléchargement de la miniature: {str(e)}"
         }), 500
 
+@stream_bp.route('/thumbnail/generate', methods=['POST'])
+def generate_thumbnail():
+    """Générer la miniature du match (logos, noms, compétition, date et score optionnel)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        config = config_store.load({})
+
+        current_match = team_manager.get_current_match()
+        if not current_match or not current_match.get('team_a') or not current_match.get('team_b'):
+            return jsonify({
+                "success": False,
+                "message": "Aucune équipe configurée pour le match"
+            }), 400
+
+        result = thumbnail_renderer.render(
+            current_match['team_a'],
+            current_match['team_b'],
+            competition=data.get('competition', config.get('title', '')),
+            date=data.get('date'),
+            score=score_manager.get_state() if data.get('includeScore') else None
+        )
+
+        # Utiliser la miniature générée comme miniature du stream (par défaut)
+        if data.get('apply', True):
+            config['thumbnailUrl'] = result['url']
+            config_store.save(config)
+            media_store.set_ref('stream:thumbnail', result['hash'])
+
+            # Mettre à jour l'image dans vMix si un input est indiqué
+            if data.get('input'):
+                from ..core.vmix_manager import VMixManager
+                VMixManager().set_image(data['input'], data.get('field', 'Image'), result['path'])
+
+        return jsonify({
+            "success": True,
+            "message": "Miniature reprise du cache" if result['cached'] else "Miniature générée",
+            "thumbnailUrl": result['url'],
+            "path": result['path'],
+            "cached": result['cached']
+        })
+    except ThumbnailUnavailable as e:
+        return jsonify({"success": False, "message": str(e)}), 501
+    except Exception as e:
+        logger.error(f"Erreur lors de la génération de la miniature: {str(e)}")
+        return jsonify({
+            "success": False,
+            "message": f"Erreur lors de la génération de la miniature: {str(e)}"
+        }), 500
+
 @stream_bp.route('/remove-thumbnail', methods=['POST'])
 def remove_thumbnail():
     """Supprimer la miniature actuelle"""
     try:
         # Récupérer la configuration existante
-        with open(CONFIG_FILE, 'r') as f:
-            existing_config = json.load(f)
+        existing_config = config_store.load({})
 
         # Vérifier si une miniature existe
         if 'thumbnailUrl' not in existing_config or not existing_config['thumbnailUrl']:
@@ -298,28 +298,13 @@ def remove_thumbnail():
                 "message": "Aucune miniature à supprimer"
             }), 400
 
-        # Supprimer le fichier
-        try:
-            filename = os.path.basename(existing_config['thumbnailUrl'])
-            filepath = os.path.join(THUMBNAILS_DIR, filename)
-            if os.path.exists(filepath):
-                os.remove(filepath)
-
-            # Supprimer également du dossier static
-            static_thumbnails_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'thumbnails')
-            static_filepath = os.path.join(static_thumbnails_dir, filename)
-            if os.path.exists(static_filepath):
-                os.remove(static_filepath)
-        except Exception as e:
-            logger.warning(f"Erreur lors de la suppression du fichier de miniature: {str(e)}")
-
         # Mettre à jour la configuration
         existing_config['thumbnailUrl'] = None
         existing_config['thumbnailVisible'] = False
 
-        # Enregistrer la configuration mise à jour
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(existing_config, f, indent=2)
+        # Enregistrer la configuration mise à jour ; le fichier est supprimé par le ramasse-miettes
+        config_store.save(existing_config)
+        media_store.release('stream:thumbnail')
 
         # Désactiver la miniature dans vMix si elle était activée
         try:
@@ -372,6 +357,9 @@ def update_score():
             sets_b=team_b.get('sets', 0),
             title_input="scoreboard"
         )
+
+        # Détecter les événements de match (traités hors du thread de la requête)
+        score_manager.update(team_a, team_b)
         
         if result:
             logger.info(f"Score mis à jour: {team_a.get('name')} {team_a.get('score')}-{team_b.get('score')} {team_b.get('name')}, sets: {team_a.get('sets')}-{team_b.get('sets')}")
@@ -0,0 +1,63 @@
+from flask import Blueprint, request, jsonify, Response
+import logging
+from .vmix import vmix_manager
+from ..core.tally import TallyService
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('tally_api')
+
+tally_bp = Blueprint('tally', __name__)
+
+# Service de tally (démarré à la première demande d'un cadreur)
+tally_service = TallyService(vmix_manager)
+
+# Intervalle des commentaires keep-alive du flux SSE (évite la coupure par les proxys)
+SSE_KEEPALIVE = 15
+
+
+@tally_bp.route('', methods=['GET'])
+def get_tally():
+    """Récupérer l'état de tally des inputs à l'antenne ou en preview"""
+    tally_service.start()
+    return jsonify({
+        "source": tally_service.source,
+        "inputs": tally_service.states()
+    })
+
+
+@tally_bp.route('/<input_number>', methods=['GET'])
+def get_input_tally(input_number):
+    """Récupérer l'état d'un input (un caractère : 0 hors antenne, +1 program, +2 preview, +4 overlay)"""
+    tally_service.start()
+    response = Response(tally_service.state(input_number), mimetype='text/plain')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@tally_bp.route('/<input_number>/events', methods=['GET'])
+def stream_input_tally(input_number):
+    """
+    Flux Server-Sent Events du tally d'un seul input
+
+    Chaque changement de l'input est envoyé sous la forme d'un seul
+    caractère ; les changements des autres inputs ne sont pas transmis.
+    """
+    tally_service.start()
+
+    def generate():
+        yield "retry: 2000\n\n"
+        state = tally_service.state(input_number)
+        yield f"data: {state}\n\n"
+        while True:
+            current = tally_service.wait(input_number, state, timeout=SSE_KEEPALIVE)
+            if current == state:
+                yield ": keep-alive\n\n"
+                continue
+            state = current
+            yield f"data: {state}\n\n"
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -6,6 +6,7 @@ import csv
 import io
 from werkzeug.utils import secure_filename
 from ..core.team_manager import TeamManager
+from ..core.roster_importer import RosterImportError
 
 teams_bp = Blueprint('teams', __name__)
 team_manager = TeamManager()
@@ -61,6 +62,31 @@ def create_team():
         }
     })
 
+@teams_bp.route('/import', methods=['POST'])
+def import_roster():
+    """Importer un fichier CSV contenant les joueurs de plusieurs équipes"""
+    if 'roster_csv' not in request.files or not request.files['roster_csv'].filename:
+        return jsonify({"error": "Le fichier CSV est requis"}), 400
+
+    try:
+        column_map = json.loads(request.form['column_map']) if request.form.get('column_map') else None
+    except ValueError:
+        return jsonify({"error": "Correspondance des colonnes invalide"}), 400
+
+    try:
+        report = team_manager.import_roster(
+            request.files['roster_csv'],
+            column_map=column_map,
+            default_team=request.form.get('default_team') or None,
+            mode=request.form.get('mode', 'replace'),
+            skip_invalid=request.form.get('skip_invalid', 'true').lower() == 'true',
+            dry_run=request.form.get('dry_run', 'false').lower() == 'true'
+        )
+    except RosterImportError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"report": report})
+
 @teams_bp.route('/<team_id>', methods=['GET'])
 def get_team(team_id):
     """Récupérer les détails d'une équipe"""
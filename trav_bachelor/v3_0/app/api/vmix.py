@@ -1,13 +1,27 @@
 from flask import Blueprint, request, jsonify
 import os
 import json
-from ..core.vmix_manager import VMixManager
+from ..core.vmix_manager import VMixManager, categorize_inputs
 from ..core.team_manager import TeamManager
+from ..core.score_manager import score_manager
+from ..core.audio_ducker import AudioDucker
+from ..core.audio_scenes import AudioSceneManager
+from ..core.stream_manager import StreamManager
 
 vmix_bp = Blueprint('vmix', __name__)
 vmix_manager = VMixManager()
 team_manager = TeamManager()
 
+# Ducking automatique des ambiances (démarré au lancement s'il est activé)
+data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+audio_ducker = AudioDucker(vmix_manager, os.path.join(data_dir, 'audio_ducking.json'))
+
+# Scènes audio (jeu, temps mort, interview, pause...)
+audio_scenes = AudioSceneManager(vmix_manager, os.path.join(data_dir, 'audio_scenes.json'))
+
+# Streaming et enregistrement (heure exacte de début des enregistrements lancés depuis l'application)
+stream_manager = StreamManager(vmix_manager, data_dir)
+
 @vmix_bp.route('/status', methods=['GET'])
 def get_vmix_status():
     """Vérifier le statut de connexion à vMix"""
@@ -108,39 +122,7 @@ def get_vmix_inputs():
             vmix_manager.check_connection()
 
         inputs = vmix_manager.get_inputs()
-
-        # Catégoriser les inputs
-        categorized_inputs = {
-            'video': [],
-            'audio': [],
-            'title': [],
-            'other': []
-        }
-
-        for input_data in inputs:
-            input_type = input_data.get('type', '').lower()
-            name = input_data.get('title', '').lower()
-
-            # Déterminer la catégorie de l'input
-            if any(keyword in input_type for keyword in ['capture', 'camera', 'video']):
-                category = 'video'
-            elif any(keyword in input_type for keyword in ['audio', 'sound']) or \
-                 any(keyword in name for keyword in ['mic', 'audio', 'sound', 'comment', 'ambiance']):
-                category = 'audio'
-            elif any(keyword in input_type for keyword in ['title', 'gt']):
-                category = 'title'
-            else:
-                category = 'other'
-
-            # Ajouter l'input à sa catégorie avec toutes les informations nécessaires
-            categorized_inputs[category].append({
-                'id': input_data.get('number'),
-                'name': input_data.get('title'),
-                'type': input_data.get('type'),
-                'state': input_data.get('state')
-            })
-
-        return jsonify(categorized_inputs)
+        return jsonify(categorize_inputs(inputs))
 
     except Exception as e:
         return jsonify({
@@ -184,7 +166,7 @@ def stop_streaming():
 def start_recording():
     """Démarrer l'enregistrement dans vMix"""
     try:
-        success = vmix_manager.start_recording()
+        success = stream_manager.start_recording()
         if success:
             return jsonify({"message": "Enregistrement démarré avec succès"})
         else:
@@ -196,7 +178,7 @@ def start_recording():
 def stop_recording():
     """Arrêter l'enregistrement dans vMix"""
     try:
-        success = vmix_manager.stop_recording()
+        success = stream_manager.stop_recording()
         if success:
             return jsonify({"message": "Enregistrement arrêté avec succès"})
         else:
@@ -256,12 +238,14 @@ def load_teams_to_vmix():
             "Sets": "0-0"
         })
 
-        # 2. Envoyer les logos des équipes si disponibles
+        # 2. Envoyer les logos des équipes si disponibles (déclinaison scoreboard, chemin local pour vMix)
         logo_success = True
-        if team_a.get('logo'):
-            logo_success = logo_success and vmix_manager.set_image("ScoreOverlay", "LogoA", team_a['logo'])
-        if team_b.get('logo'):
-            logo_success = logo_success and vmix_manager.set_image("ScoreOverlay", "LogoB", team_b['logo'])
+        logo_a = team_manager.get_logo_path(team_a)
+        logo_b = team_manager.get_logo_path(team_b)
+        if logo_a:
+            logo_success = logo_success and vmix_manager.set_image("ScoreOverlay", "LogoA", logo_a)
+        if logo_b:
+            logo_success = logo_success and vmix_manager.set_image("ScoreOverlay", "LogoB", logo_b)
 
         # 3. Envoyer les rosters des équipes
         roster_a_success = True
@@ -372,6 +356,79 @@ def get_audio_status():
             "message": f"Erreur lors de la récupération du statut audio: {str(e)}"
         }), 500
 
+@vmix_bp.route('/audio/ducking', methods=['GET'])
+def get_audio_ducking():
+    """Récupérer la configuration et l'état du ducking automatique"""
+    return jsonify({"status": "success", "ducking": audio_ducker.status()})
+
+@vmix_bp.route('/audio/ducking', methods=['POST'])
+def configure_audio_ducking():
+    """
+    Configurer le ducking automatique des ambiances
+
+    Corps JSON : enabled, commentary (inputs), ambiance (inputs), threshold (dBFS),
+    duckVolume (%), attack, release, hold, minInterval (secondes), minChange (%), sampleRate (Hz)
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({"status": "error", "message": "Configuration du ducking requise"}), 400
+
+    try:
+        state = audio_ducker.configure(**data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    return jsonify({"status": "success", "ducking": state})
+
+@vmix_bp.route('/audio/scenes', methods=['GET'])
+def list_audio_scenes():
+    """Lister les scènes audio enregistrées"""
+    return jsonify({"status": "success", "scenes": audio_scenes.list(), "current": audio_scenes.current})
+
+@vmix_bp.route('/audio/scenes', methods=['POST'])
+def capture_audio_scene():
+    """Enregistrer l'état audio actuel de vMix comme scène (corps JSON : name)"""
+    data = request.get_json()
+    name = str((data or {}).get('name', '')).strip()
+    if not name:
+        return jsonify({"status": "error", "message": "Le nom de la scène est requis"}), 400
+
+    scene = audio_scenes.capture(name)
+    if scene is None:
+        return jsonify({"status": "error", "message": "vMix est injoignable"}), 503
+    return jsonify({"status": "success", "scene": scene})
+
+@vmix_bp.route('/audio/scenes/<name>', methods=['GET'])
+def get_audio_scene(name):
+    """Récupérer une scène audio et les commandes qu'enverrait son rappel (paramètre fade)"""
+    scene = audio_scenes.get(name)
+    if scene is None:
+        return jsonify({"status": "error", "message": "Scène audio introuvable"}), 404
+    preview = audio_scenes.recall(name, request.args.get('fade', 0, type=int), dry_run=True)
+    return jsonify({"status": "success", "scene": scene, "changes": preview['commands'] if preview else None})
+
+@vmix_bp.route('/audio/scenes/<name>', methods=['DELETE'])
+def delete_audio_scene(name):
+    """Supprimer une scène audio"""
+    if not audio_scenes.delete(name):
+        return jsonify({"status": "error", "message": "Scène audio introuvable"}), 404
+    return jsonify({"status": "success", "message": f"Scène {name} supprimée"})
+
+@vmix_bp.route('/audio/scenes/<name>/recall', methods=['POST'])
+def recall_audio_scene(name):
+    """Rappeler une scène audio (corps JSON facultatif : fade en millisecondes)"""
+    if audio_scenes.get(name) is None:
+        return jsonify({"status": "error", "message": "Scène audio introuvable"}), 404
+    try:
+        fade = int((request.get_json(silent=True) or {}).get('fade') or 0)
+    except (TypeError, ValueError):
+        return jsonify({"status": "error", "message": "La durée du fondu doit être un nombre entier"}), 400
+
+    result = audio_scenes.recall(name, fade)
+    if result is None:
+        return jsonify({"status": "error", "message": "vMix est injoignable"}), 503
+    return jsonify({"status": "success", "recall": result})
+
 @vmix_bp.route('/update-score', methods=['POST'])
 def update_score():
     """
@@ -423,6 +480,9 @@ def update_score():
             team_b['sets'],
             title_input
         )
+
+        # Détecter les événements de match (traités hors du thread de la requête)
+        score_manager.update(team_a, team_b)
         
         if success:
             return jsonify({
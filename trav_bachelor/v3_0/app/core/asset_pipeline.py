@@ -0,0 +1,244 @@
+#fonctionnalités à implémenter :
+# -génération de déclinaisons normalisées des logos à l'upload (scoreboard, roster, vignette web)
+# -cache par empreinte du contenu, -choix de la plus petite déclinaison adaptée pour vMix et le navigateur
+
+import os
+import logging
+from .media_store import media_store as default_media_store
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow absent : les logos sont servis tels quels
+    Image = None
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('asset_pipeline')
+
+# Déclinaisons générées pour chaque logo (taille = côté maximal en pixels)
+RENDITIONS = {
+    'web': {'size': 160, 'format': 'WEBP', 'square': False},
+    'scoreboard': {'size': 256, 'format': 'PNG', 'square': True},
+    'roster': {'size': 512, 'format': 'PNG', 'square': True}
+}
+
+# Déclinaison utilisée par défaut pour chaque destination
+DEFAULT_RENDITION = {'vmix': 'scoreboard', 'browser': 'web'}
+
+EXTENSIONS = {'PNG': 'png', 'WEBP': 'webp'}
+
+
+class LogoPipeline:
+    """
+    Chaîne de traitement des logos.
+
+    Chaque logo est identifié par l'empreinte SHA-256 de son contenu : les
+    déclinaisons sont nommées `<empreinte>-<déclinaison>-<taille>.<ext>` et ne
+    sont générées qu'une seule fois, quel que soit le nombre d'uploads du même
+    fichier. vMix reçoit le chemin local de la déclinaison adaptée au lieu de
+    l'image d'origine (souvent plusieurs Mo).
+    """
+
+    def __init__(self, output_dir, url_prefix, media_store=None):
+        """
+        Initialise la chaîne de traitement
+
+        Args:
+            output_dir: Répertoire (servi en statique) des déclinaisons
+            url_prefix: Préfixe d'URL correspondant à output_dir
+            media_store: Stockage des fichiers d'origine (par défaut le stockage partagé)
+        """
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix.rstrip('/')
+        self.media_store = media_store or default_media_store
+        self.static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Les déclinaisons sont supprimées avec leur fichier d'origine
+        self.media_store.register_derived_dir(self.output_dir)
+
+        self.webp = Image is not None and features.check('webp')
+        if Image is None:
+            logger.warning("Pillow non disponible: les logos ne seront pas redimensionnés")
+
+    def process(self, upload, filename=None):
+        """
+        Enregistre un logo uploadé et génère ses déclinaisons (si absentes du cache)
+
+        Args:
+            upload: Fichier uploadé (FileStorage) ou flux binaire
+            filename: Nom d'origine (pour l'extension), par défaut upload.filename
+
+        Returns:
+            dict: {'hash', 'original', 'renditions': {nom: {'url', 'path', 'width', 'height', 'bytes'}}}
+        """
+        blob = self.media_store.put(upload, filename)
+        return self.process_file(blob['path'], blob['hash'])
+
+    def process_file(self, path, content_hash):
+        """
+        Génère les déclinaisons d'un fichier déjà présent sur le disque
+
+        Args:
+            path: Chemin du fichier d'origine
+            content_hash: Empreinte du fichier dans le stockage des médias
+
+        Returns:
+            dict: Même format que process()
+        """
+        asset = {'hash': content_hash, 'original': path, 'renditions': {}}
+
+        image = None
+        for name, spec in RENDITIONS.items():
+            target = self._rendition_path(content_hash, name)
+            if not os.path.exists(target):
+                if Image is None:
+                    continue
+                if image is None:
+                    image = self._open(path)
+                    if image is None:
+                        break
+                self._render(image, spec, target)
+                logger.info(f"Déclinaison '{name}' générée: {os.path.basename(target)}")
+            asset['renditions'][name] = self._describe(target)
+
+        if len(asset['renditions']) < len(RENDITIONS):
+            # Pillow absent ou image illisible : servir le fichier d'origine pour chaque déclinaison
+            fallback = {'url': self.media_store.get(content_hash)['url'], 'path': path, 'bytes': os.path.getsize(path)}
+            for name in RENDITIONS:
+                asset['renditions'].setdefault(name, fallback)
+
+        return asset
+
+    def url_for(self, logo, rendition=None, target='browser'):
+        """
+        Retourne l'URL de la déclinaison d'un logo
+
+        Args:
+            logo: URL du logo enregistrée dans l'équipe
+            rendition: Nom de la déclinaison (par défaut celle de la destination)
+            target: 'browser' ou 'vmix'
+
+        Returns:
+            str: URL de la déclinaison, ou l'URL d'origine si elle n'existe pas
+        """
+        content_hash = self.hash_from_url(logo)
+        name = rendition or DEFAULT_RENDITION[target]
+        if content_hash:
+            path = self._rendition_path(content_hash, name)
+            if os.path.exists(path):
+                return f"{self.url_prefix}/{os.path.basename(path)}"
+        return logo
+
+    def path_for(self, logo, rendition=None, target='vmix'):
+        """
+        Retourne le chemin local de la plus petite déclinaison adaptée (pour vMix)
+
+        Les logos enregistrés avant la mise en place des déclinaisons sont
+        servis tels quels (voir import_legacy() pour les importer).
+
+        Args:
+            logo: URL du logo enregistrée dans l'équipe
+            rendition: Nom de la déclinaison (par défaut celle de la destination)
+            target: 'vmix' ou 'browser'
+
+        Returns:
+            str: Chemin absolu du fichier, ou None si le logo est introuvable
+        """
+        if not logo:
+            return None
+
+        name = rendition or DEFAULT_RENDITION[target]
+        content_hash = self.hash_from_url(logo)
+        if content_hash:
+            path = self._rendition_path(content_hash, name)
+            if os.path.exists(path):
+                return path
+
+        # Logo historique (copie statique du fichier d'origine)
+        return self.static_path(logo)
+
+    def import_legacy(self, logo):
+        """
+        Importe un logo historique dans le stockage des médias et génère ses déclinaisons
+
+        Le fichier importé n'est référencé par personne : l'appelant doit
+        enregistrer la référence de son propriétaire (media_store.set_ref)
+        avant le passage du ramasse-miettes.
+
+        Args:
+            logo: URL du logo enregistrée dans l'équipe
+
+        Returns:
+            dict: Même format que process(), ou None si le logo est déjà importé ou introuvable
+        """
+        if not logo or self.hash_from_url(logo):
+            return None
+        legacy = self.static_path(logo)
+        if legacy is None:
+            return None
+        blob = self.media_store.put_file(legacy)
+        logger.info(f"Logo historique importé: {logo} -> {blob['hash']}")
+        return self.process_file(blob['path'], blob['hash'])
+
+    def static_path(self, url):
+        """Convertit une URL /static/... en chemin local (None si absent)"""
+        if not url or not url.startswith('/static/'):
+            return url if url and os.path.isabs(url) and os.path.exists(url) else None
+        path = os.path.join(self.static_dir, *url[len('/static/'):].split('/'))
+        return path if os.path.exists(path) else None
+
+    def hash_from_url(self, url):
+        """Retourne l'empreinte contenue dans le nom d'une déclinaison ou d'un original (None sinon)"""
+        return self.media_store.hash_from_url(url)
+
+    def _rendition_path(self, content_hash, name):
+        """Chemin d'une déclinaison (le nom inclut la taille pour invalider le cache si elle change)"""
+        spec = RENDITIONS[name]
+        image_format = spec['format'] if spec['format'] != 'WEBP' or self.webp else 'PNG'
+        return os.path.join(self.output_dir, f"{content_hash}-{name}-{spec['size']}.{EXTENSIONS[image_format]}")
+
+    def _open(self, path):
+        """Ouvre une image en RGBA en tenant compte de l'orientation EXIF"""
+        try:
+            with Image.open(path) as image:
+                image = ImageOps.exif_transpose(image)
+                return image.convert('RGBA')
+        except Exception as e:
+            logger.error(f"Impossible de lire l'image {path}: {e}")
+            return None
+
+    def _render(self, image, spec, target):
+        """Redimensionne une image et l'écrit de façon atomique"""
+        size = spec['size']
+        rendition = image.copy()
+        rendition.thumbnail((size, size), Image.LANCZOS)
+
+        if spec['square']:
+            # Canevas carré transparent : taille constante pour les champs image de vMix
+            canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+            canvas.paste(rendition, ((size - rendition.width) // 2, (size - rendition.height) // 2), rendition)
+            rendition = canvas
+
+        tmp_path = f"{target}.tmp"
+        if target.endswith('.webp'):
+            rendition.save(tmp_path, 'WEBP', quality=85, method=6)
+        else:
+            rendition.save(tmp_path, 'PNG', optimize=True)
+        os.replace(tmp_path, target)
+
+    def _describe(self, path):
+        """Décrit une déclinaison générée"""
+        info = {
+            'url': f"{self.url_prefix}/{os.path.basename(path)}",
+            'path': path,
+            'bytes': os.path.getsize(path)
+        }
+        if Image is not None:
+            try:
+                with Image.open(path) as image:
+                    info['width'], info['height'] = image.size
+            except Exception:
+                pass
+        return info
@@ -0,0 +1,269 @@
+#fonctionnalités à implémenter :
+# -ducking automatique : baisse des micros d'ambiance quand les commentateurs parlent
+# -lissage attaque/relâchement, fondus SetVolumeFade de vMix
+# -limitation du débit des commandes, seuil minimal de variation avant envoi
+
+import os
+import math
+import time
+import logging
+import threading
+from .persistence import JsonStore
+from .audio_meter import to_db
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('audio_ducker')
+
+# Configuration par défaut (durées en secondes, volumes en % de vMix)
+DEFAULT_CONFIG = {
+    'enabled': False,
+    'commentary': [],      # Inputs des micros commentateurs (numéros vMix)
+    'ambiance': [],        # Inputs baissés pendant les commentaires
+    'threshold': -40,      # Niveau (dBFS) au-delà duquel un commentateur parle
+    'duckVolume': 40,      # Volume des ambiances pendant le ducking (% de leur volume normal)
+    'attack': 0.15,        # Constante de temps de la baisse
+    'release': 1.2,        # Constante de temps de la remontée
+    'hold': 0.8,           # Maintien du ducking après la dernière parole (silences entre les mots)
+    'minChange': 3,        # Variation minimale de volume justifiant une commande
+    'minInterval': 0.25,   # Intervalle minimal entre deux commandes pour un même input
+    'sampleRate': 20       # Fréquence de lecture des niveaux (Hz)
+}
+
+
+class AudioDucker:
+    """
+    Moteur de ducking audio.
+
+    Un thread lit les niveaux des micros commentateurs (instantané XML
+    partagé de VMixManager, comme les vumètres). Dès qu'un micro non coupé
+    dépasse le seuil, le gain des ambiances tend vers `duckVolume` avec la
+    constante de temps `attack` ; après `hold` secondes de silence il revient
+    vers 100 % avec la constante `release`.
+
+    Le volume de chaque ambiance (volume normal × gain) n'est envoyé à vMix
+    que s'il s'écarte d'au moins `minChange` de la dernière valeur envoyée,
+    au plus une fois toutes les `minInterval` secondes par input, par un
+    SetVolumeFade de cette durée : vMix interpole entre deux commandes.
+    Le volume normal d'une ambiance est relu dans vMix hors ducking, un
+    réglage manuel de l'opérateur est donc conservé.
+    """
+
+    def __init__(self, vmix_manager, config_file, bus=None):
+        """
+        Initialise le moteur
+
+        Args:
+            vmix_manager: Gestionnaire vMix (niveaux et commandes)
+            config_file: Fichier JSON de configuration du ducking
+            bus: Bus d'événements (par défaut le bus partagé)
+        """
+        self.vmix_manager = vmix_manager
+        self.bus = bus or event_bus
+        self.store = JsonStore.for_file(config_file)
+        os.makedirs(os.path.dirname(config_file), exist_ok=True)
+        self.config = dict(DEFAULT_CONFIG, **(self.store.load({}) or {}))
+
+        self.gain = 1.0
+        self.ducking = False
+        self._base = {}
+        self._sent = {}
+        self._last_voice = -math.inf
+        self.commands = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """Indique si le thread de ducking est actif"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def configure(self, **options):
+        """
+        Modifie la configuration (démarre ou arrête le moteur selon 'enabled')
+
+        Args:
+            **options: Clés de DEFAULT_CONFIG
+
+        Returns:
+            dict: État du moteur
+
+        Raises:
+            ValueError: Option inconnue ou valeur invalide
+        """
+        unknown = set(options) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"Options de ducking inconnues: {', '.join(sorted(unknown))}")
+
+        with self._lock:
+            config = dict(self.config)
+            for key, value in options.items():
+                if key in ('commentary', 'ambiance'):
+                    config[key] = [str(number) for number in value or []]
+                elif key == 'enabled':
+                    config[key] = bool(value)
+                else:
+                    config[key] = float(value)
+            config['duckVolume'] = max(0.0, min(100.0, config['duckVolume']))
+            config['sampleRate'] = max(1.0, min(50.0, config['sampleRate']))
+            for key in ('attack', 'release', 'hold', 'minChange', 'minInterval'):
+                if config[key] < 0:
+                    raise ValueError(f"La valeur de {key} doit être positive")
+            if set(config['commentary']) & set(config['ambiance']):
+                raise ValueError("Un input ne peut pas être à la fois commentateur et ambiance")
+
+            removed = set(self.config['ambiance']) - set(config['ambiance'])
+            self.config = config
+            self.store.save(config)
+
+        # Ambiances retirées de la configuration : retour à leur volume normal
+        for number in removed:
+            self._restore(number)
+
+        if config['enabled']:
+            self.start()
+        else:
+            self.stop()
+        return self.status()
+
+    def status(self):
+        """État du moteur (configuration, gain et volumes envoyés)"""
+        return {
+            'config': dict(self.config),
+            'running': self.running,
+            'ducking': self.ducking,
+            'gain': round(self.gain, 3),
+            'volumes': dict(self._sent),
+            'commands': self.commands
+        }
+
+    def start(self):
+        """Démarre le thread de ducking s'il n'est pas actif"""
+        with self._lock:
+            if self.running and self._stop.is_set():
+                # Arrêt en cours (retour des volumes normaux) : attendre sa fin
+                self._thread.join(timeout=2)
+            if not self.running:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='audio-ducker', daemon=True)
+                self._thread.start()
+                logger.info(f"Ducking démarré: {self.config['commentary']} -> {self.config['ambiance']}")
+
+    def stop(self):
+        """Arrête le thread de ducking (les ambiances reviennent à leur volume normal)"""
+        self._stop.set()
+
+    def target_gain(self, levels, inputs, now):
+        """
+        Gain visé pour les ambiances
+
+        Args:
+            levels (dict): Niveaux des inputs {numéro: (gauche, droite)}
+            inputs (dict): Inputs de l'instantané {numéro: input}
+            now: Horodatage (time.monotonic)
+
+        Returns:
+            float: 1.0 (pas de commentaire) ou duckVolume / 100
+        """
+        for number in self.config['commentary']:
+            if inputs.get(number, {}).get('muted', True):
+                continue
+            if to_db(max(levels.get(number, (0.0, 0.0)))) > self.config['threshold']:
+                self._last_voice = now
+                break
+        self.ducking = now - self._last_voice < self.config['hold']
+        return self.config['duckVolume'] / 100 if self.ducking else 1.0
+
+    def smooth(self, target, elapsed):
+        """
+        Fait tendre le gain vers sa cible (filtre du premier ordre)
+
+        Args:
+            target: Gain visé
+            elapsed: Temps écoulé depuis l'étape précédente (secondes)
+
+        Returns:
+            float: Nouveau gain
+        """
+        constant = self.config['attack'] if target < self.gain else self.config['release']
+        if constant <= 0:
+            self.gain = target
+        else:
+            self.gain += (target - self.gain) * (1 - math.exp(-elapsed / constant))
+        if abs(self.gain - target) < 0.005:
+            self.gain = target
+        return self.gain
+
+    def apply(self, inputs, now):
+        """
+        Envoie à vMix les volumes des ambiances qui ont suffisamment changé
+
+        Args:
+            inputs (dict): Inputs de l'instantané {numéro: input}
+            now: Horodatage (time.monotonic)
+        """
+        interval = self.config['minInterval']
+        for number in self.config['ambiance']:
+            current = inputs.get(number)
+            if current is None:
+                continue
+            try:
+                volume = float(current.get('volume') or 100)
+            except ValueError:
+                volume = 100.0
+
+            sent = self._sent.get(number)
+            if number not in self._base or (self.gain == 1.0 and sent and now - sent['at'] > interval * 2
+                                             and abs(volume - sent['volume']) >= self.config['minChange']):
+                # Volume normal relu hors ducking (réglage manuel de l'opérateur)
+                self._base[number] = volume
+                self._sent[number] = sent = {'volume': volume, 'at': now}
+
+            wanted = round(self._base[number] * self.gain, 1)
+            if sent and wanted == sent['volume']:
+                continue
+            # Dernière étape vers la cible : envoyée même si la variation est faible
+            settled = self.gain in (1.0, self.config['duckVolume'] / 100)
+            if sent and not settled and abs(wanted - sent['volume']) < self.config['minChange']:
+                continue
+            if sent and now - sent['at'] < interval:
+                continue
+            if self.vmix_manager.set_volume_fade(number, wanted, interval * 1000):
+                self.commands += 1
+                self._sent[number] = {'volume': wanted, 'at': now}
+
+    def _restore(self, number):
+        """Ramène une ambiance à son volume normal"""
+        base = self._base.pop(number, None)
+        sent = self._sent.pop(number, None)
+        if base is not None and sent and sent['volume'] != base:
+            self.vmix_manager.set_volume_fade(number, base, self.config['release'] * 1000)
+
+    def _run(self):
+        """Boucle de ducking : lecture des niveaux, lissage, envoi des volumes"""
+        previous = time.monotonic()
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                snapshot = self.vmix_manager.get_snapshot(max_age=0.5 / self.config['sampleRate'])
+                levels = self.vmix_manager.get_levels(max_age=0.5 / self.config['sampleRate'])['inputs']
+                if snapshot['connected']:
+                    inputs = {item['number']: item for item in snapshot['inputs']}
+                    was_ducking = self.ducking
+                    self.smooth(self.target_gain(levels, inputs, started), started - previous)
+                    self.apply(inputs, started)
+                    if self.ducking != was_ducking:
+                        self.bus.publish('audio_ducking', {'ducking': self.ducking}, transient=True)
+            except Exception as e:
+                logger.error(f"Erreur du ducking audio: {e}")
+            previous = started
+            self._stop.wait(max(0.0, 1 / self.config['sampleRate'] - (time.monotonic() - started)))
+
+        # Arrêt : les ambiances reviennent à leur volume normal
+        for number in list(self._base):
+            self._restore(number)
+        self.gain = 1.0
+        self.ducking = False
+        logger.info("Ducking arrêté")
@@ -0,0 +1,195 @@
+#fonctionnalités à implémenter :
+# -lecture des niveaux audio de vMix (inputs, master, bus) à fréquence réglable
+# -sous-échantillonnage et maintien des crêtes côté serveur, -trames compactes poussées aux navigateurs
+
+import math
+import time
+import logging
+import threading
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('audio_meter')
+
+# Salon Socket.IO des navigateurs qui affichent les vumètres
+METERS_ROOM = 'meters'
+
+# Plancher d'affichage (dBFS) : les niveaux plus faibles sont affichés comme silence
+FLOOR_DB = -60
+
+
+def to_db(level):
+    """Convertit une amplitude linéaire (0-1) en dBFS entier, borné au plancher"""
+    if level <= 0:
+        return FLOOR_DB
+    return max(FLOOR_DB, min(0, int(round(20 * math.log10(level)))))
+
+
+class AudioMeter:
+    """
+    Service de vumètres audio.
+
+    Un seul thread lit les niveaux de vMix à `sample_rate` Hz (la lecture
+    partage l'instantané XML de VMixManager), garde la crête de chaque canal
+    sur la fenêtre d'une trame, puis publie `frame_rate` trames par seconde
+    dans le salon 'meters'. Chaque trame associe à chaque canal
+    [gauche, droite, crête gauche, crête droite] en dBFS entiers ; la crête
+    est maintenue `hold_time` secondes puis redescend de `decay` dB/s.
+    Le service s'arrête de lui-même quand plus aucun navigateur n'écoute.
+    """
+
+    def __init__(self, vmix_manager, sample_rate=20, frame_rate=10, hold_time=1.5, decay=20, bus=None):
+        """
+        Initialise le service
+
+        Args:
+            vmix_manager: Gestionnaire vMix (source des niveaux)
+            sample_rate: Fréquence de lecture des niveaux (Hz)
+            frame_rate: Fréquence des trames envoyées aux navigateurs (Hz, <= sample_rate)
+            hold_time: Durée de maintien des crêtes (secondes)
+            decay: Vitesse de retombée des crêtes après maintien (dB/s)
+            bus: Bus d'événements (par défaut le bus partagé)
+        """
+        self.vmix_manager = vmix_manager
+        self.hold_time = hold_time
+        self.decay = decay
+        self.bus = bus or event_bus
+
+        # Fonction indiquant si des navigateurs écoutent (fournie par le canal Socket.IO)
+        self.listeners = lambda: True
+
+        self.sequence = 0
+        self.last_frame = None
+        self._holds = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.sample_rate = sample_rate
+        self.frame_rate = frame_rate
+        self.configure(sample_rate, frame_rate)
+
+    def configure(self, sample_rate=None, frame_rate=None):
+        """
+        Modifie les fréquences de lecture et d'envoi
+
+        Args:
+            sample_rate: Fréquence de lecture (1-50 Hz)
+            frame_rate: Fréquence des trames (1-sample_rate Hz)
+
+        Returns:
+            dict: Configuration appliquée
+        """
+        if sample_rate is not None:
+            self.sample_rate = max(1.0, min(50.0, float(sample_rate)))
+        if frame_rate is not None:
+            self.frame_rate = float(frame_rate)
+        self.frame_rate = max(1.0, min(self.sample_rate, self.frame_rate))
+        return self.config()
+
+    def config(self):
+        """Configuration actuelle du service"""
+        return {
+            'sampleRate': self.sample_rate,
+            'frameRate': self.frame_rate,
+            'holdTime': self.hold_time,
+            'floor': FLOOR_DB,
+            'running': self.running
+        }
+
+    @property
+    def running(self):
+        """Indique si le thread de mesure est actif"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre le thread de mesure s'il n'est pas actif"""
+        with self._lock:
+            if not self.running:
+                self._stop.clear()
+                # Trame d'une session précédente : la première trame sera toujours envoyée
+                self.last_frame = None
+                self._thread = threading.Thread(target=self._run, name='audio-meter', daemon=True)
+                self._thread.start()
+                logger.info(f"Vumètres démarrés ({self.sample_rate:g} Hz, {self.frame_rate:g} trames/s)")
+
+    def stop(self):
+        """Arrête le thread de mesure"""
+        self._stop.set()
+
+    def build_frame(self, window, now):
+        """
+        Construit une trame à partir des crêtes de la fenêtre écoulée
+
+        Args:
+            window (dict): {canal: [crête gauche, crête droite]} en amplitude linéaire
+            now: Horodatage (time.monotonic) de la trame
+
+        Returns:
+            dict: {'seq', 'channels': {canal: [g, d, crête g, crête d]}}
+        """
+        channels = {}
+        for channel, (left, right) in window.items():
+            values = [to_db(left), to_db(right)]
+            holds = self._holds.setdefault(channel, [[FLOOR_DB, now], [FLOOR_DB, now]])
+            for side, value in enumerate(values):
+                hold, since = holds[side]
+                if value >= hold:
+                    holds[side] = [value, now]
+                elif now - since > self.hold_time:
+                    # Retombée progressive de la crête vers le niveau actuel
+                    holds[side] = [max(value, hold - self.decay / self.frame_rate), since]
+            channels[channel] = values + [int(holds[0][0]), int(holds[1][0])]
+
+        # Oublier les canaux disparus (input supprimé dans vMix)
+        for channel in list(self._holds):
+            if channel not in window:
+                del self._holds[channel]
+
+        self.sequence += 1
+        return {'seq': self.sequence, 'channels': channels}
+
+    def _sample(self, window):
+        """Lit les niveaux et met à jour les crêtes de la fenêtre en cours"""
+        levels = self.vmix_manager.get_levels(max_age=0.5 / self.sample_rate)
+        readings = dict(levels['inputs'])
+        if levels['master'] is not None:
+            readings['master'] = levels['master']
+        for name, value in levels['buses'].items():
+            readings[f"bus{name}"] = value
+
+        for channel, (left, right) in readings.items():
+            peak = window.setdefault(channel, [0.0, 0.0])
+            peak[0] = max(peak[0], left)
+            peak[1] = max(peak[1], right)
+
+    def _run(self):
+        """Boucle de mesure : lecture à sample_rate, envoi à frame_rate"""
+        window = {}
+        next_frame = time.monotonic()
+        next_check = time.monotonic() + 1
+
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._sample(window)
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture des niveaux audio: {e}")
+
+            now = time.monotonic()
+            if now >= next_frame:
+                frame = self.build_frame(window, now)
+                window = {}
+                next_frame = now + 1 / self.frame_rate
+                # Trame identique à la précédente (silence, vMix absent) : rien à envoyer
+                if self.last_frame is None or frame['channels'] != self.last_frame['channels']:
+                    self.last_frame = frame
+                    self.bus.publish('audio_levels', frame, room=METERS_ROOM, transient=True)
+
+            if now >= next_check:
+                next_check = now + 1
+                if not self.listeners():
+                    logger.info("Vumètres arrêtés (aucun navigateur à l'écoute)")
+                    break
+
+            self._stop.wait(max(0.0, 1 / self.sample_rate - (time.monotonic() - started)))
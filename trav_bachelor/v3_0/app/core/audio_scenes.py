@@ -0,0 +1,216 @@
+#fonctionnalités à implémenter :
+# -scènes audio nommées (mute, volume, bus de chaque input) : jeu, temps mort, interview, pause
+# -rappel d'une scène par différence avec l'état actuel de vMix, commandes envoyées en un seul lot
+# -rappel optionnel en fondu
+
+import os
+import logging
+import threading
+from datetime import datetime
+from .persistence import JsonStore
+from .scheduler import scheduler
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('audio_scenes')
+
+# Écart de volume (%) en dessous duquel deux volumes sont considérés identiques
+VOLUME_TOLERANCE = 0.5
+
+
+def parse_buses(value):
+    """Convertit l'attribut audiobusses de vMix ('M,A') en liste triée de bus"""
+    return sorted(bus for bus in (value or '').split(',') if bus)
+
+
+def parse_volume(value):
+    """Volume vMix (chaîne) en nombre, None si l'input n'a pas d'audio"""
+    try:
+        return round(float(value), 1)
+    except (TypeError, ValueError):
+        return None
+
+
+class AudioSceneManager:
+    """
+    Scènes audio.
+
+    Une scène mémorise l'état audio (mute, volume, bus) de tous les inputs
+    audio de vMix, identifiés par leur clé (stable si les inputs sont
+    renumérotés). Le rappel compare la scène à l'instantané actuel de vMix
+    et n'envoie que les réglages différents, en un seul lot de commandes.
+    En fondu, les volumes sont amenés par SetVolumeFade ; un input coupé
+    par la scène descend d'abord à zéro puis n'est coupé (et son volume
+    rétabli) qu'à la fin du fondu.
+    """
+
+    def __init__(self, vmix_manager, scenes_file, scheduler=scheduler, bus=None):
+        """
+        Initialise le gestionnaire
+
+        Args:
+            vmix_manager: Gestionnaire vMix (instantané et commandes groupées)
+            scenes_file: Fichier JSON des scènes
+            scheduler: Planificateur partagé (fin des fondus)
+            bus: Bus d'événements (par défaut le bus partagé)
+        """
+        self.vmix_manager = vmix_manager
+        self.scheduler = scheduler
+        self.bus = bus or event_bus
+        os.makedirs(os.path.dirname(scenes_file), exist_ok=True)
+        self.store = JsonStore.for_file(scenes_file, ensure_ascii=False)
+        self.scenes = self.store.load({}) or {}
+        self.current = None
+        self._lock = threading.Lock()
+
+    def list(self):
+        """Scènes enregistrées (sans le détail des inputs)"""
+        return [{'name': scene['name'], 'createdAt': scene['createdAt'], 'inputs': len(scene['inputs'])}
+                for scene in self.scenes.values()]
+
+    def get(self, name):
+        """Scène enregistrée ou None"""
+        return self.scenes.get(name)
+
+    def _audio_inputs(self, max_age=0):
+        """
+        État audio actuel des inputs de vMix
+
+        Returns:
+            dict: {clé: {'number', 'title', 'muted', 'volume', 'buses'}} ou None si vMix est injoignable
+        """
+        snapshot = self.vmix_manager.get_snapshot(max_age=max_age)
+        if not snapshot['connected']:
+            return None
+        inputs = {}
+        for item in snapshot['inputs']:
+            volume = parse_volume(item.get('volume'))
+            if volume is None:
+                continue
+            inputs[item.get('key') or item['number']] = {
+                'number': item['number'],
+                'title': item['title'],
+                'muted': item['muted'],
+                'volume': volume,
+                'buses': parse_buses(item.get('audiobusses'))
+            }
+        return inputs
+
+    def capture(self, name):
+        """
+        Enregistre l'état audio actuel sous un nom (remplace une scène existante)
+
+        Args:
+            name (str): Nom de la scène
+
+        Returns:
+            dict: Scène enregistrée ou None si vMix est injoignable
+        """
+        inputs = self._audio_inputs()
+        if inputs is None:
+            return None
+        scene = {'name': name, 'createdAt': datetime.now().isoformat(), 'inputs': inputs}
+        with self._lock:
+            self.scenes[name] = scene
+            self.store.save(self.scenes)
+        logger.info(f"Scène audio enregistrée: {name} ({len(inputs)} inputs)")
+        return scene
+
+    def delete(self, name):
+        """
+        Supprime une scène
+
+        Returns:
+            bool: True si la scène existait
+        """
+        with self._lock:
+            if self.scenes.pop(name, None) is None:
+                return False
+            self.store.save(self.scenes)
+        return True
+
+    def diff(self, scene, current, fade=0):
+        """
+        Commandes nécessaires pour passer de l'état actuel à une scène
+
+        Args:
+            scene (dict): Scène à rappeler
+            current (dict): État actuel (voir _audio_inputs)
+            fade (int): Durée du fondu des volumes (millisecondes, 0 : immédiat)
+
+        Returns:
+            tuple: (commandes immédiates, commandes de fin de fondu), listes de (fonction, paramètres)
+        """
+        commands = []
+        deferred = []
+        for key, wanted in scene['inputs'].items():
+            actual = current.get(key)
+            if actual is None:
+                # Input absent de vMix (supprimé depuis l'enregistrement de la scène)
+                continue
+            number = actual['number']
+            volume_changed = abs(actual['volume'] - wanted['volume']) > VOLUME_TOLERANCE
+
+            for bus in sorted(set(wanted['buses']) ^ set(actual['buses'])):
+                function = 'AudioBusOn' if bus in wanted['buses'] else 'AudioBusOff'
+                commands.append((function, {'Input': number, 'Value': bus}))
+
+            if not fade:
+                if volume_changed:
+                    commands.append(('SetVolume', {'Input': number, 'Value': f"{wanted['volume']:g}"}))
+                if wanted['muted'] != actual['muted']:
+                    commands.append(('AudioOff' if wanted['muted'] else 'AudioOn', {'Input': number}))
+            elif wanted['muted'] and not actual['muted']:
+                # Descente à zéro puis coupure, volume de la scène rétabli une fois coupé
+                commands.append(('SetVolumeFade', {'Input': number, 'Value': f"0,{fade}"}))
+                deferred.append(('AudioOff', {'Input': number}))
+                deferred.append(('SetVolume', {'Input': number, 'Value': f"{wanted['volume']:g}"}))
+            elif not wanted['muted'] and actual['muted']:
+                # Rétabli à zéro puis montée jusqu'au volume de la scène
+                commands.append(('SetVolume', {'Input': number, 'Value': 0}))
+                commands.append(('AudioOn', {'Input': number}))
+                commands.append(('SetVolumeFade', {'Input': number, 'Value': f"{wanted['volume']:g},{fade}"}))
+            elif volume_changed and wanted['muted']:
+                # Input coupé : aucun fondu audible
+                commands.append(('SetVolume', {'Input': number, 'Value': f"{wanted['volume']:g}"}))
+            elif volume_changed:
+                commands.append(('SetVolumeFade', {'Input': number, 'Value': f"{wanted['volume']:g},{fade}"}))
+        return commands, deferred
+
+    def recall(self, name, fade=0, dry_run=False):
+        """
+        Rappelle une scène : seuls les réglages différents de l'état actuel sont envoyés
+
+        Args:
+            name (str): Nom de la scène
+            fade (int): Durée du fondu (millisecondes, 0 : immédiat)
+            dry_run (bool): Calculer les commandes sans les envoyer
+
+        Returns:
+            dict: {'scene', 'commands', 'sent', 'fade'} ou None si la scène ou vMix est indisponible
+                  (dry_run : 'commands' est la liste des commandes)
+        """
+        scene = self.scenes.get(name)
+        if scene is None:
+            return None
+        current = self._audio_inputs()
+        if current is None:
+            return None
+
+        fade = max(0, int(fade or 0))
+        commands, deferred = self.diff(scene, current, fade)
+        if dry_run:
+            return {'scene': name, 'fade': fade,
+                    'commands': [{'function': function, 'params': params, 'deferred': index >= len(commands)}
+                                 for index, (function, params) in enumerate(commands + deferred)]}
+
+        self.scheduler.cancel('audio_scene:fade')
+        sent = self.vmix_manager.send_batch(commands)
+        if deferred:
+            self.scheduler.schedule('audio_scene:fade', fade / 1000, self.vmix_manager.send_batch, deferred)
+
+        self.current = name
+        logger.info(f"Scène audio rappelée: {name} ({len(commands) + len(deferred)} commandes)")
+        self.bus.publish('audio_scene', {'scene': name, 'fade': fade})
+        return {'scene': name, 'commands': len(commands) + len(deferred), 'sent': sent, 'fade': fade}
@@ -0,0 +1,202 @@
+#fonctionnalités à implémenter :
+# -diffusion des événements du direct (vMix, tally, overlays, streaming, score, replays) à tous les canaux de push
+# -sérialisation unique de chaque événement, -salon (room) par match
+# -journal borné des derniers événements (reprise des clients SSE via Last-Event-ID)
+
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('event_bus')
+
+# Identifiant du match utilisé tant qu'aucun match n'est configuré
+DEFAULT_MATCH_ID = 'default'
+
+# Nombre d'événements conservés pour la reprise des clients déconnectés
+HISTORY_SIZE = 1000
+
+
+def match_room(match_id):
+    """Nom du salon des abonnés d'un match"""
+    return f"match:{match_id or DEFAULT_MATCH_ID}"
+
+
+class EventBus:
+    """
+    Bus d'événements du direct.
+
+    Chaque événement publié reçoit un identifiant croissant et n'est
+    sérialisé qu'une seule fois ; il est ensuite transmis à tous les canaux
+    abonnés (Socket.IO, etc.). Un événement est soit global (salon None :
+    état de vMix), soit destiné au salon du match en cours (score, replays).
+    Les derniers événements sont conservés dans un journal borné pour que
+    les clients qui se reconnectent ne reçoivent que ce qu'ils ont manqué.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        """
+        Initialise le bus
+
+        Args:
+            history_size: Nombre d'événements conservés dans le journal
+        """
+        self.match_id = DEFAULT_MATCH_ID
+        # Les identifiants repartent de 1 au redémarrage : ils sont préfixés par l'identifiant du processus
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.history = deque(maxlen=history_size)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._last_id = 0
+
+    @property
+    def match_room(self):
+        """Salon du match en cours"""
+        return match_room(self.match_id)
+
+    def set_match(self, match_id):
+        """
+        Change le match en cours
+
+        Args:
+            match_id: Identifiant du match (les événements du match sont publiés dans son salon)
+        """
+        self.match_id = match_id or DEFAULT_MATCH_ID
+
+    def subscribe(self, callback):
+        """
+        Abonne un canal aux événements
+
+        Args:
+            callback: Fonction appelée avec l'événement
+                      {'id', 'name', 'room', 'data', 'json', 'timestamp'}
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Désabonne un canal"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, name, data, room=None, transient=False):
+        """
+        Publie un événement
+
+        Args:
+            name: Nom de l'événement (ex. 'score_updated')
+            data: Données sérialisables en JSON
+            room: Salon destinataire (None pour tous les clients)
+            transient: Événement à haute fréquence (niveaux audio) : transmis aux
+                       canaux abonnés mais ni numéroté ni conservé dans le journal
+
+        Returns:
+            dict: Événement publié
+        """
+        payload = json.dumps(data, ensure_ascii=False)
+
+        if transient:
+            event = {'id': None, 'name': name, 'room': room, 'data': data, 'json': payload, 'timestamp': time.time()}
+            self._notify(list(self._subscribers), event)
+            return event
+
+        with self._lock:
+            self._last_id += 1
+            event = {
+                'id': self._last_id,
+                'name': name,
+                'room': room,
+                'data': data,
+                'json': payload,
+                'timestamp': time.time()
+            }
+            self.history.append(event)
+            subscribers = list(self._subscribers)
+            self._condition.notify_all()
+
+        self._notify(subscribers, event)
+        return event
+
+    def publish_match(self, name, data):
+        """Publie un événement dans le salon du match en cours"""
+        return self.publish(name, data, room=self.match_room)
+
+    def _notify(self, subscribers, event):
+        """Transmet un événement aux canaux abonnés"""
+        for subscriber in subscribers:
+            try:
+                subscriber(event)
+            except Exception as e:
+                logger.error(f"Erreur dans un abonné au bus d'événements ({event['name']}): {e}")
+
+    def event_id(self, event):
+        """Identifiant public d'un événement ('<processus>-<numéro>')"""
+        return f"{self.boot_id}-{event['id']}"
+
+    def last_id(self):
+        """Identifiant public du dernier événement publié"""
+        with self._lock:
+            return f"{self.boot_id}-{self._last_id}"
+
+    def since(self, last_event_id):
+        """
+        Retourne les événements publiés après un identifiant
+
+        Args:
+            last_event_id: Identifiant public du dernier événement reçu par le client
+
+        Returns:
+            tuple: (événements manqués, position interne), ou (None, position)
+                   si le journal ne permet pas la reprise (événements trop anciens,
+                   redémarrage du serveur) : le client doit recharger l'état complet
+        """
+        boot_id, _, number = (last_event_id or '').partition('-')
+        with self._lock:
+            try:
+                position = int(number)
+            except ValueError:
+                position = -1
+
+            if boot_id != self.boot_id or position < 0 or position > self._last_id:
+                return None, self._last_id
+
+            oldest = self.history[0]['id'] if self.history else self._last_id + 1
+            if position + 1 < oldest:
+                return None, self._last_id
+
+            return [event for event in self.history if event['id'] > position], self._last_id
+
+    def wait(self, position, timeout=None):
+        """
+        Attend les événements publiés après une position interne
+
+        Args:
+            position: Numéro du dernier événement déjà transmis
+            timeout: Délai maximal d'attente (secondes)
+
+        Returns:
+            list: Événements publiés après position (vide si le délai est écoulé),
+                  ou None si des événements ont quitté le journal (client trop lent) :
+                  comme pour since(), le client doit recharger l'état complet
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._last_id > position, timeout=timeout)
+            if self._last_id <= position:
+                return []
+            oldest = self.history[0]['id'] if self.history else self._last_id
+            if position + 1 < oldest:
+                # Client trop lent : les événements intermédiaires ont quitté le journal
+                logger.warning(f"Événements perdus pour un client lent ({oldest - position - 1})")
+                return None
+            return [event for event in self.history if event['id'] > position]
+
+
+# Instance partagée par les gestionnaires et les canaux de push
+event_bus = EventBus()
@@ -0,0 +1,184 @@
+#fonctionnalités à implémenter :
+# -sélection d'événements de replay par critères (type, set, joueur, tag, choix manuel)
+# -enchaînement des clips par le planificateur (sans attente de l'opérateur), -retour au direct à la fin
+
+import uuid
+import logging
+import threading
+from .scheduler import scheduler
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('highlight_builder')
+
+# Clé des tâches du planificateur (une seule séquence de résumé à la fois)
+JOB_KEY = 'highlight:next'
+
+# Ordres de lecture possibles
+ORDERS = ('chronological', 'reverse', 'manual')
+
+
+class HighlightBuilder:
+    """
+    Constructeur de résumés (highlights).
+
+    Sélectionne des événements de replay dans le catalogue puis les lit les
+    uns après les autres : chaque clip est lancé par une seule commande
+    ReplayPlayEvent et le clip suivant est programmé dans le planificateur
+    pour l'instant où le précédent se termine (durée / vitesse). La requête
+    qui lance le résumé n'attend donc pas la fin de la lecture.
+    """
+
+    def __init__(self, replay_manager, scheduler=scheduler, bus=None):
+        """
+        Initialise le constructeur
+
+        Args:
+            replay_manager: Gestionnaire de replay (catalogue et lecture)
+            scheduler: Planificateur partagé
+            bus: Bus d'événements (par défaut le bus partagé)
+        """
+        self.replay_manager = replay_manager
+        self.scheduler = scheduler
+        self.bus = bus or event_bus
+        self.reel = None
+        self._lock = threading.Lock()
+
+    def select(self, criteria):
+        """
+        Sélectionne les événements d'un résumé
+
+        Args:
+            criteria (dict): {'ids': [...] (choix manuel), 'type', 'set' (numéro ou 'last'),
+                              'player', 'tag', 'team', 'limit', 'order'}
+
+        Returns:
+            list: Événements sélectionnés, dans l'ordre de lecture
+        """
+        criteria = criteria or {}
+        order = criteria.get('order') or ('manual' if criteria.get('ids') else 'chronological')
+
+        if criteria.get('ids'):
+            events = []
+            for event_id in criteria['ids']:
+                _, event = self.replay_manager.find_event(event_id)
+                if event is not None:
+                    events.append(event)
+        else:
+            set_number = criteria.get('set')
+            if set_number == 'last':
+                # Set du dernier événement marqué (le set qui vient de se terminer)
+                last = self.replay_manager.events[-1] if self.replay_manager.events else {}
+                set_number = last.get('set')
+            result = self.replay_manager.search(
+                event_type=criteria.get('type'),
+                set_number=int(set_number) if set_number not in (None, '') else None,
+                player=criteria.get('player'),
+                tag=criteria.get('tag'),
+                per_page=None
+            )
+            events = result['events']
+            if criteria.get('team'):
+                events = [event for event in events if event.get('team') == criteria['team']]
+
+        # Clips sans correspondance vMix (supprimés dans vMix) : impossibles à lire
+        events = [event for event in events if event.get('vmix')]
+
+        limit = criteria.get('limit')
+        if limit:
+            # Les N derniers événements (ou les N premiers choisis manuellement)
+            events = events[:int(limit)] if order == 'manual' else events[-int(limit):]
+        if order == 'reverse':
+            events = list(reversed(events))
+        return events
+
+    def play(self, criteria, speed=100, gap=0.0, name=None):
+        """
+        Lance un résumé (remplace le résumé en cours)
+
+        Args:
+            criteria (dict): Critères de sélection (voir select)
+            speed (int): Vitesse de lecture des clips (25, 50, 75, 100)
+            gap (float): Pause entre deux clips (secondes)
+            name (str): Nom affiché du résumé
+
+        Returns:
+            dict: État du résumé ou None si aucun événement ne correspond
+        """
+        events = self.select(criteria)
+        if not events:
+            return None
+
+        with self._lock:
+            self.scheduler.cancel(JOB_KEY)
+            self.reel = {
+                'id': uuid.uuid4().hex[:8],
+                'name': name or f"Résumé ({len(events)} clips)",
+                'events': [{'id': event['id'], 'name': event.get('name'), 'duration': event.get('duration', 8)}
+                           for event in events],
+                'position': -1,
+                'speed': speed,
+                'gap': float(gap),
+                'status': 'playing'
+            }
+            reel_id = self.reel['id']
+
+        # Premier clip lancé par le planificateur : la requête rend la main immédiatement
+        self.scheduler.schedule(JOB_KEY, 0, self._play_next, reel_id)
+        self._publish()
+        return self.status()
+
+    def stop(self):
+        """
+        Arrête le résumé en cours
+
+        Returns:
+            bool: True si un résumé était en cours
+        """
+        with self._lock:
+            self.scheduler.cancel(JOB_KEY)
+            if not self.reel or self.reel['status'] != 'playing':
+                return False
+            self.reel['status'] = 'stopped'
+        self.replay_manager.pause_replay()
+        self._publish()
+        return True
+
+    def status(self):
+        """État du résumé en cours ou du dernier résumé"""
+        with self._lock:
+            if not self.reel:
+                return {'status': 'idle'}
+            return dict(self.reel, events=list(self.reel['events']))
+
+    def _play_next(self, reel_id):
+        """Lit le clip suivant et programme le suivant (exécuté par le planificateur)"""
+        with self._lock:
+            reel = self.reel
+            if not reel or reel['id'] != reel_id or reel['status'] != 'playing':
+                return
+            reel['position'] += 1
+            position = reel['position']
+            finished = position >= len(reel['events'])
+            if finished:
+                reel['status'] = 'finished'
+
+        if finished:
+            logger.info(f"Résumé terminé: {reel['name']}")
+            self.replay_manager.return_to_live()
+            self._publish()
+            return
+
+        clip = reel['events'][position]
+        if not self.replay_manager.play_event(clip['id'], reel['speed'], auto_return=False):
+            logger.warning(f"Clip ignoré dans le résumé: {clip['name']}")
+            self.scheduler.schedule(JOB_KEY, 0, self._play_next, reel_id)
+        else:
+            playback_time = float(clip['duration']) * 100 / max(reel['speed'], 1)
+            self.scheduler.schedule(JOB_KEY, playback_time + reel['gap'], self._play_next, reel_id)
+        self._publish()
+
+    def _publish(self):
+        """Publie l'avancement du résumé aux clients de la régie"""
+        self.bus.publish_match('highlight_updated', self.status())
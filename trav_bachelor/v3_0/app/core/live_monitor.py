@@ -0,0 +1,192 @@
+#fonctionnalités à implémenter :
+# -surveillance de l'état de vMix en arrière-plan (connexion, tally program/preview, overlays, inputs, streaming/enregistrement)
+# -publication des changements sur le bus d'événements (push au lieu du polling des clients)
+
+import os
+import time
+import logging
+import threading
+from .vmix_manager import categorize_inputs
+from .event_bus import event_bus
+from .persistence import JsonStore
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('live_monitor')
+
+# Intervalle par défaut entre deux lectures de l'état de vMix (secondes)
+POLL_INTERVAL = 0.5
+
+
+class LiveMonitor:
+    """
+    Surveillance de vMix pour la régie.
+
+    Un seul thread lit l'instantané XML de vMix à intervalle régulier et ne
+    publie sur le bus que les parties de l'état qui ont changé : les clients
+    n'ont plus besoin d'interroger vMix eux-mêmes.
+    """
+
+    def __init__(self, vmix_manager, interval=POLL_INTERVAL, bus=None, sessions_file=None, stream_manager=None):
+        """
+        Initialise la surveillance
+
+        Args:
+            vmix_manager: Gestionnaire vMix (source de l'instantané)
+            interval: Intervalle entre deux lectures (secondes)
+            bus: Bus d'événements (par défaut le bus partagé)
+            sessions_file: Fichier JSON des sessions d'enregistrement (None : en mémoire seulement)
+            stream_manager: Gestionnaire de streaming (heure exacte des enregistrements lancés par l'application)
+        """
+        self.vmix_manager = vmix_manager
+        self.interval = interval
+        self.bus = bus or event_bus
+        self.stream_manager = stream_manager
+
+        self._state = None
+        self._started_at = {'streaming': None}
+
+        # Sessions d'enregistrement [{'start', 'end', 'active'}] (ms, None : heure inconnue),
+        # conservées d'un lancement à l'autre pour les exports d'après-match
+        self.sessions_store = None
+        self.recordings = []
+        if sessions_file:
+            os.makedirs(os.path.dirname(sessions_file), exist_ok=True)
+            self.sessions_store = JsonStore.for_file(sessions_file)
+            self.recordings = self.sessions_store.load([]) or []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread de surveillance s'il n'est pas actif"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='vmix-monitor', daemon=True)
+                self._thread.start()
+                logger.info(f"Surveillance de vMix démarrée (intervalle {self.interval}s)")
+
+    def stop(self):
+        """Arrête le thread de surveillance"""
+        self._stop.set()
+
+    def streaming_status(self, snapshot=None):
+        """
+        État du streaming et de l'enregistrement au format de /vmix/streaming-status
+
+        Args:
+            snapshot (dict): Instantané vMix (par défaut le dernier instantané lu)
+
+        Returns:
+            dict: {'isStreaming', 'isRecording', 'streamingStartTime', 'recordingStartTime'}
+        """
+        snapshot = snapshot or self.vmix_manager.get_snapshot()
+        session = self.recordings[-1] if self.recordings and self.recordings[-1]['active'] else None
+        return {
+            'isStreaming': snapshot['streaming'],
+            'isRecording': snapshot['recording'],
+            'streamingStartTime': self._started_at['streaming'] if snapshot['streaming'] else None,
+            'recordingStartTime': session['start'] if snapshot['recording'] and session else None
+        }
+
+    def _stream_manager_start(self, previous_sessions):
+        """Heure de début (ms) connue du gestionnaire de streaming, None si inconnue ou d'un enregistrement précédent"""
+        if self.stream_manager is None:
+            return None
+        started = self.stream_manager.streaming_state.get('recording_start_time')
+        floor = max((value for session in previous_sessions for value in (session['start'], session['end'])
+                     if value is not None), default=0)
+        if started is None or started * 1000 < floor:
+            return None
+        return int(started * 1000)
+
+    def track_recording(self, previous, snapshot):
+        """
+        Ouvre ou ferme la session d'enregistrement d'après l'instantané
+
+        Une heure n'est retenue que si le changement a été vu par la surveillance
+        (lecture précédente connectée) ou si l'application a lancé l'enregistrement :
+        au premier passage ou après une coupure, l'enregistrement en cours reprend
+        la session ouverte, sinon son début est marqué inconnu.
+
+        Args:
+            previous (dict): Instantané précédent ({} au premier passage)
+            snapshot (dict): Instantané actuel
+
+        Returns:
+            bool: True si les sessions ont changé
+        """
+        if not snapshot['connected']:
+            # vMix injoignable : l'enregistrement peut continuer
+            return False
+
+        now = int(time.time() * 1000)
+        watched = bool(previous.get('connected'))
+        session = self.recordings[-1] if self.recordings and self.recordings[-1]['active'] else None
+
+        if snapshot['recording'] and session is None:
+            start = self._stream_manager_start(self.recordings)
+            if start is None and watched and not previous.get('recording'):
+                start = now
+            self.recordings.append({'start': start, 'end': None, 'active': True})
+            if start is None:
+                logger.warning("Enregistrement déjà en cours : heure de début inconnue")
+        elif snapshot['recording'] and session['start'] is None:
+            # Début inconnu : l'heure exacte peut venir du gestionnaire de streaming
+            session['start'] = self._stream_manager_start(self.recordings[:-1])
+            if session['start'] is None:
+                return False
+        elif not snapshot['recording'] and session is not None:
+            # Arrêt vu en direct, ou survenu pendant une absence de la surveillance (fin inconnue)
+            session.update(active=False, end=now if watched and previous.get('recording') else None)
+        else:
+            return False
+
+        if self.sessions_store is not None:
+            self.sessions_store.save(self.recordings)
+        return True
+
+    def poll(self):
+        """Lit l'état de vMix et publie les changements (appelé par le thread)"""
+        snapshot = self.vmix_manager.get_snapshot(max_age=self.interval / 2)
+        previous = self._state or {}
+        self._state = snapshot
+        if previous.get('version') == snapshot['version']:
+            return
+
+        if previous.get('connected') != snapshot['connected']:
+            logger.info(f"Connexion vMix: {'établie' if snapshot['connected'] else 'perdue'}")
+            self.bus.publish('vmix_status', {
+                'connected': snapshot['connected'],
+                'host': self.vmix_manager.host,
+                'port': self.vmix_manager.port
+            })
+
+        if (previous.get('active'), previous.get('preview')) != (snapshot['active'], snapshot['preview']):
+            self.bus.publish('tally_updated', {'program': snapshot['active'], 'preview': snapshot['preview']})
+
+        if previous.get('overlays') != snapshot['overlays']:
+            self.bus.publish('overlays_updated', {'overlays': snapshot['overlays']})
+
+        if previous.get('inputs') != snapshot['inputs']:
+            self.bus.publish('vmix_inputs_updated', {'inputs': categorize_inputs(snapshot['inputs'])})
+
+        # Sessions suivies à chaque changement (une reconnexion peut révéler un arrêt)
+        recordings_changed = self.track_recording(previous, snapshot)
+
+        status_changed = (previous.get('streaming'), previous.get('recording')) != (snapshot['streaming'], snapshot['recording'])
+        if recordings_changed or status_changed:
+            # Heure de début (ms, comme Date.now() côté navigateur) mémorisée au changement d'état
+            if snapshot['streaming'] and not previous.get('streaming'):
+                self._started_at['streaming'] = int(time.time() * 1000)
+            self.bus.publish('streaming_status', self.streaming_status(snapshot))
+
+    def _run(self):
+        """Boucle de surveillance"""
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Erreur lors de la surveillance de vMix: {e}")
+            self._stop.wait(self.interval)
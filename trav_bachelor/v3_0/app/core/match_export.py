@@ -0,0 +1,308 @@
+#fonctionnalités à implémenter :
+# -export d'après-match : chapitres VOD (début des sets, points clés), liste de coupes ffmpeg, rapport JSON
+# -correspondance heure des événements / position dans l'enregistrement, -génération en un seul passage
+
+import os
+import re
+import json
+import logging
+import threading
+from datetime import datetime
+from .scheduler import scheduler
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('match_export')
+
+# Avance des chapitres : un set commence un peu avant son premier point marqué
+SET_LEAD = 15
+KEY_POINT_LEAD = 8
+
+# Écart minimal entre deux chapitres (exigence YouTube : 10 secondes)
+MIN_CHAPTER_GAP = 10
+
+# Noms des fichiers produits
+CHAPTERS_FILE = 'chapters.txt'
+CUTS_FILE = 'highlights.ffconcat'
+REPORT_FILE = 'report.json'
+EXPORT_FILES = (CHAPTERS_FILE, CUTS_FILE, REPORT_FILE)
+
+
+def to_epoch(timestamp):
+    """Convertit un horodatage ISO (heure locale, comme datetime.now()) en secondes depuis l'epoch"""
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+def format_offset(seconds):
+    """Position dans la vidéo au format des chapitres YouTube (M:SS ou H:MM:SS)"""
+    seconds = int(max(0, seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+class MatchExporter:
+    """
+    Export d'après-match.
+
+    Fusionne l'historique du score (points, sets, fin de match) et les
+    événements de replay du match, les trie par heure puis les parcourt une
+    seule fois pour produire simultanément :
+    - chapters.txt : chapitres VOD (début de chaque set, points clés),
+    - highlights.ffconcat : coupes de l'enregistrement pour
+      `ffmpeg -f concat -safe 0 -i highlights.ffconcat -c copy resume.mp4`,
+    - report.json : rapport du match (sets, scores, événements et positions).
+
+    Les positions sont calculées à partir du début de l'enregistrement vMix
+    (détecté par la surveillance du direct, ou fourni explicitement).
+    L'export est exécuté par le planificateur, hors du thread de la requête.
+    """
+
+    def __init__(self, replay_manager, score_manager, live_monitor, export_dir, scheduler=scheduler):
+        """
+        Initialise l'exporteur
+
+        Args:
+            replay_manager: Gestionnaire de replay (événements du match et archives)
+            score_manager: Gestionnaire de score (historique des points et sets)
+            live_monitor: Surveillance du direct (sessions d'enregistrement)
+            export_dir: Répertoire des exports (un sous-répertoire par match)
+            scheduler: Planificateur partagé
+        """
+        self.replay_manager = replay_manager
+        self.score_manager = score_manager
+        self.live_monitor = live_monitor
+        self.export_dir = export_dir
+        self.scheduler = scheduler
+        self.jobs = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.export_dir, exist_ok=True)
+
+    def match_dir(self, match_id):
+        """Répertoire d'export d'un match"""
+        return os.path.join(self.export_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', str(match_id)))
+
+    def start(self, match_id=None, **options):
+        """
+        Programme l'export d'un match
+
+        Args:
+            match_id: Match à exporter (par défaut le match en cours)
+            **options: Options de export()
+
+        Returns:
+            dict: État de la tâche {'match', 'status', ...}
+        """
+        match_id = match_id or event_bus.match_id
+        with self._lock:
+            job = self.jobs.get(match_id)
+            if job and job['status'] == 'running':
+                return dict(job)
+            self.jobs[match_id] = {'match': match_id, 'status': 'running', 'requestedAt': datetime.now().isoformat()}
+        self.scheduler.schedule(f"export:{match_id}", 0, self._run_job, match_id, options)
+        return self.status(match_id)
+
+    def status(self, match_id=None):
+        """État de la dernière tâche d'export d'un match"""
+        match_id = match_id or event_bus.match_id
+        with self._lock:
+            job = self.jobs.get(match_id)
+            return dict(job) if job else {'match': match_id, 'status': 'idle'}
+
+    def _run_job(self, match_id, options):
+        """Exécute une tâche d'export (planificateur)"""
+        try:
+            report = self.export(match_id, **options)
+            result = {'status': 'done', 'files': list(EXPORT_FILES), 'summary': report['summary']}
+        except ValueError as e:
+            result = {'status': 'error', 'error': str(e)}
+        except Exception as e:
+            logger.error(f"Erreur lors de l'export du match {match_id}: {e}")
+            result = {'status': 'error', 'error': f"Erreur lors de l'export: {e}"}
+        with self._lock:
+            self.jobs[match_id].update(result, finishedAt=datetime.now().isoformat())
+
+    def timeline(self, match_id):
+        """
+        Événements du match triés par heure
+
+        Args:
+            match_id: Match exporté
+
+        Returns:
+            list: [{'time', 'source': 'score'|'replay', 'event'}]
+        """
+        items = []
+        if match_id == event_bus.match_id:
+            for event in list(self.score_manager.history):
+                items.append({'time': to_epoch(event['timestamp']), 'source': 'score', 'event': event})
+
+        result = self.replay_manager.search(match_id=match_id, per_page=None)
+        for event in result['events']:
+            items.append({'time': to_epoch(event['timestamp']), 'source': 'replay', 'event': event})
+
+        items.sort(key=lambda item: item['time'])
+        return items
+
+    def recording_start(self, first_time):
+        """
+        Heure de début (secondes) de l'enregistrement contenant le début du match
+
+        Args:
+            first_time: Heure du premier événement du match
+
+        Returns:
+            float: Début de l'enregistrement ou None si inconnu (aucune session, ou
+                   session dont le début n'a pas été observé)
+        """
+        for session in reversed(self.live_monitor.recordings):
+            if session['end'] is not None and session['end'] / 1000 < first_time:
+                # Sessions plus anciennes : toutes terminées avant le match
+                return None
+            if session['start'] is None:
+                # Début non observé : le match peut en faire partie, aucune heure à supposer
+                return None
+            if session['start'] / 1000 <= first_time:
+                return session['start'] / 1000
+        return None
+
+    def export(self, match_id, recording_start=None, recording_file='recording.mp4', pad_before=2.0, pad_after=3.0):
+        """
+        Produit les chapitres, la liste de coupes et le rapport d'un match
+
+        Args:
+            match_id: Match exporté
+            recording_start: Début de l'enregistrement (ISO ou secondes epoch) ; par défaut
+                             la session d'enregistrement détectée par la surveillance du direct
+            recording_file: Chemin du fichier enregistré par vMix (référencé tel quel dans la liste de coupes)
+            pad_before: Marge avant chaque clip (secondes)
+            pad_after: Marge après chaque clip (secondes)
+
+        Returns:
+            dict: Rapport du match
+
+        Raises:
+            ValueError: Aucun événement, ou début d'enregistrement inconnu
+
+        Les événements antérieurs au début de l'enregistrement sont ignorés.
+        """
+        items = self.timeline(match_id)
+        if not items:
+            raise ValueError("Aucun événement enregistré pour ce match")
+
+        if isinstance(recording_start, str):
+            recording_start = to_epoch(recording_start)
+        start = recording_start or self.recording_start(items[0]['time'])
+        if start is None:
+            raise ValueError("Début de l'enregistrement inconnu : préciser recordingStart")
+
+        chapters = []
+        clips = []
+        sets = {}
+        events = []
+        current_set = None
+        set_floor = 0.0
+        skipped = 0
+
+        def add_chapter(offset, title, major=False):
+            # Chapitres trop proches : le début d'un set l'emporte sur un point clé
+            offset = max(0.0, offset)
+            if chapters and offset - chapters[-1]['offset'] < MIN_CHAPTER_GAP:
+                if not major or chapters[-1]['major']:
+                    return
+                chapters.pop()
+            chapters.append({'offset': round(offset, 1), 'time': format_offset(offset), 'title': title, 'major': major})
+
+        # Passage unique sur l'historique : chapitres, coupes et rapport en même temps
+        for item in items:
+            event, offset = item['event'], item['time'] - start
+            if offset < 0:
+                # Antérieur à l'enregistrement : absent de la vidéo
+                skipped += 1
+                continue
+            set_number = event.get('set')
+
+            if set_number is not None and set_number != current_set and set_number not in sets:
+                current_set = set_number
+                # Un set ne commence pas avant la fin du précédent
+                set_start = max(set_floor, offset - SET_LEAD)
+                sets[set_number] = {'set': set_number, 'start': round(set_start, 1),
+                                    'end': None, 'winner': None, 'score': None}
+                add_chapter(set_start, f"Set {set_number}", major=True)
+
+            if item['source'] == 'score':
+                if event['type'] in ('set', 'match'):
+                    add_chapter(offset - KEY_POINT_LEAD, event['name'])
+                if event['type'] == 'point' and set_number in sets:
+                    # Dernier score connu du set (remis à zéro par la mise à jour qui clôt le set)
+                    sets[set_number]['score'] = {'A': event['score']['teamA']['score'],
+                                                 'B': event['score']['teamB']['score']}
+                if event['type'] == 'set' and set_number in sets:
+                    sets[set_number].update(end=round(offset, 1), winner=event.get('teamName'))
+                    set_floor = offset
+                events.append({'offset': round(offset, 1), 'time': format_offset(offset), 'type': event['type'],
+                               'name': event['name'], 'set': set_number, 'team': event.get('team')})
+            else:
+                # Clip : pré-roll du replay avant le marquage, plus les marges
+                clip_start = max(0.0, offset - float(event.get('duration', 8)) - pad_before)
+                clip_end = offset + pad_after
+                if clips and clip_start <= clips[-1]['outpoint']:
+                    clips[-1]['outpoint'] = round(clip_end, 3)
+                    clips[-1]['events'].append(event['name'])
+                else:
+                    clips.append({'inpoint': round(clip_start, 3), 'outpoint': round(clip_end, 3),
+                                  'events': [event['name']]})
+                if event.get('tags') or event.get('type') == 'custom':
+                    add_chapter(offset - KEY_POINT_LEAD, event['name'])
+                events.append({'offset': round(offset, 1), 'time': format_offset(offset), 'type': 'replay',
+                               'name': event['name'], 'set': set_number, 'id': event.get('id'),
+                               'tags': event.get('tags') or [], 'players': event.get('players') or []})
+
+        # YouTube exige un premier chapitre à 0:00
+        if not chapters or chapters[0]['offset'] > 0:
+            if chapters and chapters[0]['offset'] < MIN_CHAPTER_GAP:
+                chapters[0].update(offset=0.0, time=format_offset(0))
+            else:
+                chapters.insert(0, {'offset': 0.0, 'time': format_offset(0), 'title': "Avant-match", 'major': True})
+
+        report = {
+            'match': match_id,
+            'generatedAt': datetime.now().isoformat(),
+            'recording': {'file': recording_file, 'start': datetime.fromtimestamp(start).isoformat()},
+            'sets': [sets[number] for number in sorted(sets)],
+            'events': events,
+            'chapters': chapters,
+            'clips': clips,
+            'summary': {
+                'sets': len(sets),
+                'events': len(events),
+                'chapters': len(chapters),
+                'clips': len(clips),
+                'outsideRecording': skipped,
+                'highlightsDuration': round(sum(clip['outpoint'] - clip['inpoint'] for clip in clips), 1)
+            }
+        }
+        if match_id == event_bus.match_id:
+            report['finalScore'] = self.score_manager.get_state()
+
+        self._write(match_id, report, recording_file)
+        logger.info(f"Export du match {match_id}: {report['summary']}")
+        return report
+
+    def _write(self, match_id, report, recording_file):
+        """Écrit les trois fichiers de l'export"""
+        directory = self.match_dir(match_id)
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, CHAPTERS_FILE), 'w', encoding='utf-8') as f:
+            f.writelines(f"{chapter['time']} {chapter['title']}\n" for chapter in report['chapters'])
+
+        escaped = recording_file.replace("'", "'\\''")
+        with open(os.path.join(directory, CUTS_FILE), 'w', encoding='utf-8') as f:
+            f.write("ffconcat version 1.0\n")
+            for clip in report['clips']:
+                f.write(f"file '{escaped}'\ninpoint {clip['inpoint']:.3f}\noutpoint {clip['outpoint']:.3f}\n")
+
+        with open(os.path.join(directory, REPORT_FILE), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,278 @@
+#fonctionnalités à implémenter :
+# -stockage des médias uploadés par empreinte du contenu (un seul fichier par contenu, servi en statique)
+# -comptage des références (équipes, miniature du stream), -suppression des fichiers orphelins (GC)
+
+import os
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from .persistence import JsonStore
+from .scheduler import scheduler
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('media_store')
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Délai avant qu'un fichier sans référence puisse être supprimé (upload suivi d'une création d'équipe, etc.)
+GC_GRACE = 3600
+
+
+class MediaStore:
+    """
+    Stockage des médias adressé par contenu.
+
+    Chaque fichier est enregistré une seule fois sous `<aa>/<empreinte><ext>`
+    dans un répertoire servi en statique : ré-uploader le même logo ne crée
+    aucune copie. Chaque propriétaire (ex. 'team:<id>', 'stream:thumbnail')
+    référence au plus un fichier ; les fichiers qui ne sont plus référencés
+    sont supprimés par le ramasse-miettes, avec leurs fichiers dérivés.
+    """
+
+    def __init__(self, root=None, url_prefix='/static/media/store', refs_file=None, grace=GC_GRACE):
+        """
+        Initialise le stockage
+
+        Args:
+            root: Répertoire des fichiers (servi en statique)
+            url_prefix: Préfixe d'URL correspondant à root
+            refs_file: Fichier JSON des références
+            grace: Âge minimal (secondes) d'un fichier orphelin avant suppression
+        """
+        self.root = root or os.path.join(APP_DIR, 'static', 'media', 'store')
+        self.url_prefix = url_prefix.rstrip('/')
+        self.grace = grace
+        self.refs_store = JsonStore.for_file(refs_file or os.path.join(APP_DIR, 'data', 'media_refs.json'))
+        self.derived_dirs = []
+
+        os.makedirs(self.root, exist_ok=True)
+
+        self._lock = threading.RLock()
+        data = self.refs_store.load({}) or {}
+        self._blobs = data.get('blobs', {})
+        self._owners = data.get('owners', {})
+
+    def put(self, upload, filename=None):
+        """
+        Enregistre un fichier uploadé (ou retrouve le fichier identique déjà présent)
+
+        Args:
+            upload: Fichier uploadé (FileStorage) ou flux binaire
+            filename: Nom d'origine (pour l'extension), par défaut upload.filename
+
+        Returns:
+            dict: {'hash', 'path', 'url', 'size'}
+        """
+        filename = filename or getattr(upload, 'filename', '') or ''
+        stream = getattr(upload, 'stream', upload)
+
+        # Copie en flux vers un fichier temporaire tout en calculant l'empreinte
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.upload')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter(lambda: stream.read(64 * 1024), b''):
+                    digest.update(chunk)
+                    f.write(chunk)
+            return self._commit(tmp_path, digest.hexdigest(), self._extension(filename), move=True)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def put_file(self, path):
+        """
+        Importe un fichier déjà présent sur le disque (lien physique si possible)
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            dict: {'hash', 'path', 'url', 'size'}
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        return self._commit(path, digest.hexdigest(), self._extension(path), move=False)
+
+    def get(self, content_hash):
+        """
+        Décrit un fichier du stockage
+
+        Args:
+            content_hash: Empreinte du fichier
+
+        Returns:
+            dict: {'hash', 'path', 'url', 'size'} ou None si absent
+        """
+        with self._lock:
+            blob = self._blobs.get(content_hash)
+            if blob is None:
+                return None
+            return self._describe(content_hash, blob)
+
+    def hash_from_url(self, url):
+        """Retourne l'empreinte d'un fichier du stockage (ou d'un dérivé) d'après son URL"""
+        name = os.path.basename(url or '')
+        candidate = name.split('-', 1)[0].split('.', 1)[0]
+        if len(candidate) == 64 and all(char in '0123456789abcdef' for char in candidate):
+            return candidate
+        return None
+
+    def set_ref(self, owner, content_hash):
+        """
+        Fait pointer un propriétaire vers un fichier (remplace sa référence précédente)
+
+        Args:
+            owner: Propriétaire (ex. 'team:<id>', 'stream:thumbnail')
+            content_hash: Empreinte du fichier, ou None pour supprimer la référence
+        """
+        with self._lock:
+            previous = self._owners.get(owner)
+            if previous == content_hash:
+                return
+            if content_hash:
+                if content_hash not in self._blobs:
+                    logger.warning(f"Référence vers un fichier inconnu ignorée: {owner} -> {content_hash}")
+                    return
+                self._owners[owner] = content_hash
+            else:
+                self._owners.pop(owner, None)
+            self._save()
+
+        if previous:
+            self._schedule_gc()
+
+    def release(self, owner):
+        """Supprime la référence d'un propriétaire (ex. équipe supprimée)"""
+        self.set_ref(owner, None)
+
+    def refcount(self, content_hash):
+        """Retourne le nombre de propriétaires d'un fichier"""
+        with self._lock:
+            return sum(1 for value in self._owners.values() if value == content_hash)
+
+    def register_derived_dir(self, directory):
+        """
+        Déclare un répertoire de fichiers dérivés nommés `<empreinte>-...`
+
+        Ils sont supprimés avec le fichier d'origine lors du ramasse-miettes.
+        """
+        if directory not in self.derived_dirs:
+            self.derived_dirs.append(directory)
+
+    def stats(self):
+        """
+        Statistiques du stockage
+
+        Returns:
+            dict: Nombre de fichiers, taille totale, fichiers orphelins, propriétaires
+        """
+        with self._lock:
+            referenced = set(self._owners.values())
+            return {
+                'blobs': len(self._blobs),
+                'bytes': sum(blob.get('size', 0) for blob in self._blobs.values()),
+                'orphans': len([h for h in self._blobs if h not in referenced]),
+                'owners': len(self._owners)
+            }
+
+    def gc(self, grace=None):
+        """
+        Supprime les fichiers sans référence plus anciens que le délai de grâce
+
+        Args:
+            grace: Âge minimal en secondes (par défaut celui du stockage)
+
+        Returns:
+            dict: {'removed': nombre de fichiers supprimés, 'bytes': taille libérée}
+        """
+        grace = self.grace if grace is None else grace
+        now = time.time()
+        with self._lock:
+            referenced = set(self._owners.values())
+            orphans = [h for h, blob in self._blobs.items()
+                       if h not in referenced and now - blob.get('created', 0) >= grace]
+            removed = [(h, self._blobs.pop(h)) for h in orphans]
+            if removed:
+                self._save()
+
+        freed = 0
+        for content_hash, blob in removed:
+            freed += blob.get('size', 0)
+            self._remove_file(self._path(content_hash, blob))
+            for directory in self.derived_dirs:
+                if not os.path.isdir(directory):
+                    continue
+                for name in os.listdir(directory):
+                    if name.startswith(f"{content_hash}-"):
+                        self._remove_file(os.path.join(directory, name))
+
+        if removed:
+            logger.info(f"Ramasse-miettes des médias: {len(removed)} fichiers supprimés ({freed} octets)")
+        return {'removed': len(removed), 'bytes': freed}
+
+    def _commit(self, source, content_hash, extension, move):
+        """Place le fichier à son emplacement définitif s'il n'y est pas déjà"""
+        with self._lock:
+            blob = self._blobs.get(content_hash)
+            if blob is not None and os.path.exists(self._path(content_hash, blob)):
+                return self._describe(content_hash, blob)
+
+            blob = {'ext': extension, 'size': os.path.getsize(source), 'created': time.time()}
+            target = self._path(content_hash, blob)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if move:
+                os.replace(source, target)
+            else:
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+
+            self._blobs[content_hash] = blob
+            self._save()
+            logger.info(f"Média enregistré: {content_hash}{extension} ({blob['size']} octets)")
+            return self._describe(content_hash, blob)
+
+    def _extension(self, filename):
+        """Extension normalisée d'un nom de fichier"""
+        return os.path.splitext(filename or '')[1].lower()[:10]
+
+    def _path(self, content_hash, blob):
+        """Chemin local d'un fichier du stockage"""
+        return os.path.join(self.root, content_hash[:2], f"{content_hash}{blob.get('ext', '')}")
+
+    def _describe(self, content_hash, blob):
+        """Décrit un fichier du stockage"""
+        return {
+            'hash': content_hash,
+            'path': self._path(content_hash, blob),
+            'url': f"{self.url_prefix}/{content_hash[:2]}/{content_hash}{blob.get('ext', '')}",
+            'size': blob.get('size', 0)
+        }
+
+    def _remove_file(self, path):
+        """Supprime un fichier en ignorant son absence"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Impossible de supprimer {path}: {e}")
+
+    def _save(self):
+        """Persiste les références (écriture différée)"""
+        self.refs_store.save({'blobs': self._blobs, 'owners': self._owners})
+
+    def _schedule_gc(self):
+        """Programme un passage du ramasse-miettes après le délai de grâce"""
+        scheduler.schedule('media:gc', self.grace, self.gc)
+
+
+# Instance partagée par tous les chemins d'upload
+media_store = MediaStore()
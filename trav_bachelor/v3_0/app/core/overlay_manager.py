@@ -4,8 +4,12 @@
 
 import os
 import logging
-import json
-from v3_0.app.core.vmix_manager import Vmix_manager
+from .vmix_manager import VMixManager
+from .scheduler import scheduler
+from .persistence import JsonStore
+from .overlay_state import OverlayChannels
+from .sponsor_rotation import SponsorRotation
+from .player_cards import PlayerCards
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -21,7 +25,7 @@ class OverlayManager:
         Initialise le gestionnaire d'overlays
         
         Args:
-            vmix_manager: Instance de Vmix_manager à utiliser
+            vmix_manager: Instance de VMixManager à utiliser
             data_dir: Répertoire pour les configurations d'overlays
         """
         # Si aucun répertoire n'est spécifié, utiliser le répertoire courant
@@ -36,18 +40,31 @@ class OverlayManager:
             
         # Fichier JSON pour stocker les configurations d'overlays
         self.overlay_config_file = os.path.join(self.data_dir, "overlay_config.json")
+        self.config_store = JsonStore.for_file(self.overlay_config_file, indent=4, ensure_ascii=False)
         
         # Utiliser l'instance vmix_manager fournie ou en créer une nouvelle
-        self.vmix = vmix_manager if vmix_manager else Vmix_manager()
+        self.vmix = vmix_manager if vmix_manager else VMixManager()
+
+        # Planificateur partagé pour les actions différées (masquages, rotations)
+        self.scheduler = scheduler
+
+        # État des canaux d'overlay (aucune commande si vMix est déjà dans l'état demandé)
+        self.channels = OverlayChannels(self.vmix)
+
+        # Rotation des sponsors (créneaux pondérés, temps d'antenne journalisé)
+        self.sponsor_rotation = SponsorRotation(self, os.path.join(self.data_dir, "sponsor_airtime.json"))
+
+        # Fiches joueur en double tampon (écrites hors antenne)
+        self.player_cards = PlayerCards(self)
         
         # Dictionnaire pour stocker les références aux overlays détectés
         self.overlay_inputs = {}
         
         # Charger la configuration des overlays
         self.config = self.load_config()
-        
-        # Détecter les overlays disponibles dans vMix
-        self.detect_overlays()
+
+        # Les overlays sont détectés dans vMix à la première utilisation (voir get_input_id),
+        # et de nouveau tant qu'un input reste inconnu (vMix absent au lancement, titre ajouté)
         
     def load_config(self):
         """
@@ -57,9 +74,11 @@ class OverlayManager:
             dict: Configuration des overlays
         """
         try:
-            if os.path.exists(self.overlay_config_file):
-                with open(self.overlay_config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            if self.config_store.exists():
+                config = self.config_store.load()
+                if config is None:
+                    raise ValueError(f"fichier illisible {self.overlay_config_file}")
+                return config
             else:
                 # Configuration par défaut si le fichier n'existe pas
                 default_config = {
@@ -128,8 +147,8 @@ class OverlayManager:
         """
         try:
             config_to_save = config if config is not None else self.config
-            with open(self.overlay_config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_to_save, f, ensure_ascii=False, indent=4)
+            if not self.config_store.save(config_to_save):
+                return False
             logger.info(f"Configuration des overlays sauvegardée dans {self.overlay_config_file}")
             return True
         except Exception as e:
@@ -144,12 +163,16 @@ class OverlayManager:
             dict: Dictionnaire des overlays détectés
         """
         try:
+            # Récupérer tous les inputs (instantané partagé, sans erreur bruyante si vMix est absent)
+            snapshot = self.vmix.get_snapshot()
+            if not snapshot['connected']:
+                logger.warning("vMix injoignable : détection des overlays reportée")
+                return self.overlay_inputs
+            all_inputs = snapshot['inputs']
+
             # Vider le dictionnaire existant
             self.overlay_inputs = {}
             
-            # Récupérer tous les inputs
-            all_inputs = self.vmix.get_inputs()
-            
             # Catégoriser les overlays en fonction de leur nom
             # Ces motifs de recherche sont basés sur les noms typiques dans vMix
             overlay_patterns = {
@@ -180,19 +203,41 @@ class OverlayManager:
                                 break
             
             # Mettre à jour la configuration avec les overlays détectés
+            changed = False
             for overlay_type, input_id in self.overlay_inputs.items():
-                if overlay_type in self.config.get("overlays", {}):
+                overlay_config = self.config.get("overlays", {}).get(overlay_type)
+                if overlay_config is not None and overlay_config.get("input_id") != input_id:
                     # Mettre à jour l'ID de l'input dans la configuration
-                    self.config["overlays"][overlay_type]["input_id"] = input_id
+                    overlay_config["input_id"] = input_id
+                    changed = True
             
-            # Sauvegarder la configuration mise à jour
-            self.save_config()
+            # Sauvegarder la configuration mise à jour (uniquement si un input a changé)
+            if changed:
+                self.save_config()
             
             return self.overlay_inputs
         except Exception as e:
             logger.error(f"Erreur lors de la détection des overlays: {e}")
             return {}
             
+    def get_input_id(self, overlay_type):
+        """
+        Récupère l'input vMix d'un overlay (configuré ou détecté)
+
+        Args:
+            overlay_type (str): Type d'overlay ('score', 'team_roster', etc.)
+
+        Returns:
+            str: ID de l'input, None si l'overlay n'est pas détecté dans vMix
+        """
+        overlay_config = self.config.get("overlays", {}).get(overlay_type, {})
+        input_id = overlay_config.get("input_id", self.overlay_inputs.get(overlay_type))
+        if input_id is None:
+            # Input inconnu : nouvelle détection (vMix absent au lancement, titre ajouté depuis)
+            self.detect_overlays()
+            input_id = overlay_config.get("input_id", self.overlay_inputs.get(overlay_type))
+        return input_id
+
     def show_overlay(self, overlay_type, enable=True):
         """
         Affiche ou masque un overlay spécifique
@@ -214,25 +259,18 @@ class OverlayManager:
             overlay_config = self.config["overlays"][overlay_type]
             overlay_number = overlay_config.get("overlay_number", 0)
             
-            # Vérifier si l'overlay a un ID
-            if "input_id" not in overlay_config and overlay_type not in self.overlay_inputs:
+            # Récupérer l'ID de l'input (vérifier si l'overlay a un ID)
+            input_id = self.get_input_id(overlay_type)
+            if input_id is None:
                 logger.error(f"Overlay de type '{overlay_type}' non détecté dans vMix")
                 return False
-                
-            # Récupérer l'ID de l'input
-            input_id = overlay_config.get("input_id", self.overlay_inputs.get(overlay_type))
+
+            # Une action manuelle annule la sortie automatique en attente pour cet overlay
+            self.scheduler.cancel(f"overlay:{overlay_type}:auto")
             
-            # Activer ou désactiver l'overlay
-            if enable:
-                # S'assurer que l'overlay est configuré pour l'entrée correcte
-                self.vmix.send_command(f"SetOverlayInput{overlay_number}", Value=input_id)
-                # Activer l'overlay
-                result = self.vmix.send_command(f"OverlayInput{overlay_number}In")
-                action = "affiché"
-            else:
-                # Désactiver l'overlay
-                result = self.vmix.send_command(f"OverlayInput{overlay_number}Out")
-                action = "masqué"
+            # Activer ou désactiver l'overlay (rien n'est envoyé si c'est déjà le cas)
+            result = self.channels.apply({overlay_number: input_id if enable else None})
+            action = "affiché" if enable else "masqué"
                 
             if result:
                 logger.info(f"Overlay '{overlay_type}' {action} avec succès")
@@ -263,9 +301,11 @@ class OverlayManager:
             # Récupérer les informations de l'overlay
             overlay_config = self.config["overlays"][overlay_type]
             overlay_number = overlay_config.get("overlay_number", 0)
-            
-            # Basculer l'état de l'overlay
-            result = self.vmix.send_command(f"OverlayInput{overlay_number}")
+            input_id = self.get_input_id(overlay_type)
+
+            # Basculer selon l'état connu du canal : afficher cet overlay s'il n'est pas à l'antenne
+            self.channels.sync()
+            result = self.show_overlay(overlay_type, not self.channels.is_on_air(overlay_number, input_id))
             
             if result:
                 logger.info(f"État de l'overlay '{overlay_type}' basculé avec succès")
@@ -297,13 +337,11 @@ class OverlayManager:
             # Récupérer les informations de l'overlay
             overlay_config = self.config["overlays"][overlay_type]
             
-            # Vérifier si l'overlay a un ID
-            if "input_id" not in overlay_config and overlay_type not in self.overlay_inputs:
+            # Récupérer l'ID de l'input (vérifier si l'overlay a un ID)
+            input_id = self.get_input_id(overlay_type)
+            if input_id is None:
                 logger.error(f"Overlay de type '{overlay_type}' non détecté dans vMix")
                 return False
-                
-            # Récupérer l'ID de l'input
-            input_id = overlay_config.get("input_id", self.overlay_inputs.get(overlay_type))
             
             # Mettre à jour les champs dans vMix
             result = self.vmix.update_title_multiple(input_id, fields)
@@ -448,8 +486,8 @@ class OverlayManager:
             # Mettre à jour le logo si un chemin est fourni
             if logo_path is not None and result:
                 # Vérifier si l'overlay a un ID
-                if "sponsor" in self.overlay_inputs:
-                    input_id = self.overlay_inputs["sponsor"]
+                input_id = self.get_input_id("sponsor")
+                if input_id is not None:
                     result = self.vmix.set_image(input_id, "SponsorLogo", logo_path)
                     
                     if result:
@@ -498,24 +536,71 @@ class OverlayManager:
             # Afficher l'overlay si la mise à jour a réussi
             if result:
                 result = self.show_overlay("timeout", True)
-                
-                # Programmation de la disparition après la durée spécifiée
-                # Note: Cette partie est conceptuelle - dans une implémentation réelle,
-                # vous utiliseriez un timer ou une tâche planifiée
-                import threading
-                def hide_timeout():
-                    import time
-                    time.sleep(duration)
-                    self.show_overlay("timeout", False)
-                    
-                # Démarrer un thread pour masquer l'overlay après la durée spécifiée
-                threading.Thread(target=hide_timeout, daemon=True).start()
+
+                # Programmer la disparition : un nouveau timeout remplace le masquage en attente
+                if result:
+                    self.scheduler.schedule("overlay:timeout:auto", duration, self.show_overlay, "timeout", False)
                 
             return result
         except Exception as e:
             logger.error(f"Erreur lors de l'affichage du timeout: {e}")
             return False
             
+    def show_lower_third(self, fields, duration=8):
+        """
+        Affiche le lower-third avec sortie automatique après une durée
+
+        Args:
+            fields (dict): Champs du lower-third à mettre à jour {nom_champ: valeur}
+            duration (int, optional): Durée d'affichage en secondes (0 ou None = pas de sortie automatique)
+
+        Returns:
+            bool: True si réussi, False sinon
+        """
+        try:
+            result = self.update_overlay_fields("lower_third", fields) if fields else True
+
+            if result:
+                result = self.show_overlay("lower_third", True)
+
+            if result:
+                if duration:
+                    self.scheduler.schedule("overlay:lower_third:auto", duration, self.show_overlay, "lower_third", False)
+                else:
+                    self.scheduler.cancel("overlay:lower_third:auto")
+
+            return result
+        except Exception as e:
+            logger.error(f"Erreur lors de l'affichage du lower-third: {e}")
+            return False
+
+    def start_sponsor_rotation(self, sponsors, interval=30, inputs=None):
+        """
+        Démarre la rotation automatique des sponsors
+
+        Args:
+            sponsors (list): Liste de sponsors [{"name": "...", "logo": "...", "weight": 1, "minAirtime": 0}, ...]
+            interval (int, optional): Durée d'un créneau en secondes
+            inputs (list, optional): Titres vMix utilisés en tampons A/B (par défaut le titre sponsor)
+
+        Returns:
+            bool: True si la rotation a démarré, False sinon
+        """
+        if not sponsors:
+            logger.error("Aucun sponsor fourni pour la rotation")
+            return False
+
+        return self.sponsor_rotation.start(sponsors, interval, inputs)
+
+    def stop_sponsor_rotation(self):
+        """
+        Arrête la rotation automatique des sponsors
+
+        Returns:
+            bool: True si une rotation était active, False sinon
+        """
+        return self.sponsor_rotation.stop()
+
     def create_overlay_preset(self, name, overlay_types):
         """
         Crée un preset pour activer/désactiver plusieurs overlays en une seule fois
@@ -569,11 +654,27 @@ class OverlayManager:
             # Récupérer les types d'overlays du preset
             overlay_types = self.config["presets"][name]
             
-            # Appliquer l'action sur chaque overlay
+            # État visé des canaux du preset (un canal partagé prend le dernier overlay du preset)
+            self.channels.sync()
+            targets = {}
             success = True
             for overlay_type in overlay_types:
-                if not self.show_overlay(overlay_type, enable):
+                overlay_config = self.config.get("overlays", {}).get(overlay_type, {})
+                input_id = self.get_input_id(overlay_type)
+                overlay_number = overlay_config.get("overlay_number", 0)
+                if input_id is None:
+                    logger.error(f"Overlay de type '{overlay_type}' non détecté dans vMix")
                     success = False
+                    continue
+                self.scheduler.cancel(f"overlay:{overlay_type}:auto")
+                if enable:
+                    targets[overlay_number] = input_id
+                elif self.channels.is_on_air(overlay_number, input_id):
+                    # Masquage : un canal occupé par un overlay hors du preset n'est pas touché
+                    targets[overlay_number] = None
+
+            # Seules les transitions nécessaires sont envoyées, en un seul lot
+            success = self.channels.apply(targets) and success
                     
             if success:
                 action = "affichés" if enable else "masqués"
@@ -0,0 +1,183 @@
+#fonctionnalités à implémenter :
+# -état local des canaux d'overlay vMix (1 à 4) : input, à l'antenne, transition en cours
+# -synchronisation avec l'instantané vMix, -commandes inutiles supprimées
+# -passage d'un état des canaux à un autre par le plus petit lot de commandes
+
+import time
+import logging
+import threading
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('overlay_state')
+
+# Canaux d'overlay de vMix
+CHANNELS = (1, 2, 3, 4)
+
+# Durée (secondes) d'une transition d'overlay : pendant ce délai l'instantané vMix
+# peut encore montrer l'état précédent et n'écrase pas l'état local
+TRANSITION_TIME = 1.0
+
+
+class OverlayChannels:
+    """
+    État des canaux d'overlay de vMix.
+
+    Chaque canal connaît l'input qu'il porte, s'il est à l'antenne et s'il
+    est en transition. L'état est resynchronisé avec l'instantané XML
+    partagé (overlays à l'antenne) avant chaque décision ; un instantané
+    antérieur à la dernière commande d'un canal est ignoré pour ce canal.
+
+    vMix désigne les overlays par le numéro de leur input : un input demandé
+    par son titre ou sa clé est ramené à ce numéro avant toute comparaison.
+
+    Une demande déjà satisfaite (même input déjà à l'antenne, canal déjà
+    éteint) n'envoie aucune commande. Un affichage est une seule commande
+    OverlayInputNIn avec l'input en paramètre : vMix l'affecte au canal et
+    le fait entrer (ou remplace l'input à l'antenne) en une fois.
+    """
+
+    def __init__(self, vmix_manager, transition_time=TRANSITION_TIME):
+        """
+        Initialise l'état des canaux
+
+        Args:
+            vmix_manager: Gestionnaire vMix (instantané et commandes groupées)
+            transition_time: Durée d'une transition d'overlay (secondes)
+        """
+        self.vmix_manager = vmix_manager
+        self.transition_time = transition_time
+        self.channels = {number: {'input': None, 'onAir': False, 'changedAt': 0.0} for number in CHANNELS}
+        # Numéro vMix de chaque input par titre, clé et numéro (dernier instantané)
+        self.numbers = {}
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def sync(self, max_age=None):
+        """
+        Aligne l'état local sur l'instantané vMix
+
+        Args:
+            max_age: Âge maximal de l'instantané réutilisé (par défaut celui de VMixManager)
+
+        Returns:
+            bool: True si vMix est joignable
+        """
+        snapshot = self.vmix_manager.get_snapshot(max_age=max_age)
+        if not snapshot['connected']:
+            return False
+        with self._lock:
+            numbers = {}
+            for field in ('title', 'key', 'number'):
+                # Un numéro l'emporte sur un titre identique
+                numbers.update((str(item[field]), str(item['number']))
+                               for item in snapshot['inputs'] if item.get(field))
+            self.numbers = numbers
+            for number, channel in self.channels.items():
+                if snapshot['fetchedAt'] < channel['changedAt'] + self.transition_time:
+                    # Commande récente : l'instantané ne la reflète pas encore
+                    continue
+                current = snapshot['overlays'].get(str(number))
+                if current:
+                    channel['input'], channel['onAir'] = str(current), True
+                else:
+                    channel['onAir'] = False
+        return True
+
+    def state(self):
+        """
+        État des canaux
+
+        Returns:
+            dict: {canal: {'input', 'onAir', 'transitioning'}}
+        """
+        now = time.time()
+        with self._lock:
+            return {number: {'input': channel['input'], 'onAir': channel['onAir'],
+                             'transitioning': now < channel['changedAt'] + self.transition_time}
+                    for number, channel in self.channels.items()}
+
+    def resolve(self, input_id):
+        """Numéro vMix d'un input désigné par son numéro, sa clé ou son titre (inchangé s'il est inconnu)"""
+        if input_id is None:
+            return None
+        return self.numbers.get(str(input_id), str(input_id))
+
+    def is_on_air(self, number, input_id=None):
+        """Indique si un canal (avec cet input, s'il est précisé) est à l'antenne"""
+        channel = self.channels.get(int(number))
+        if channel is None or not channel['onAir']:
+            return False
+        return input_id is None or channel['input'] == self.resolve(input_id)
+
+    def on_air_anywhere(self, input_id):
+        """Indique si un input est à l'antenne sur l'un des canaux"""
+        return any(self.is_on_air(number, input_id) for number in self.channels)
+
+    def plan(self, targets):
+        """
+        Commandes nécessaires pour atteindre un état des canaux
+
+        Args:
+            targets (dict): {canal: input à afficher, ou None pour éteindre le canal}
+
+        Returns:
+            list: [(fonction, paramètres)] — vide si l'état est déjà atteint
+        """
+        commands = []
+        with self._lock:
+            # Sorties d'abord : un preset qui remplace des overlays libère l'écran avant les entrées
+            for number, input_id in sorted(targets.items()):
+                channel = self.channels[int(number)]
+                if input_id is None and channel['onAir']:
+                    commands.append((f"OverlayInput{number}Out", {}))
+            for number, input_id in sorted(targets.items()):
+                channel = self.channels[int(number)]
+                if input_id is not None and not (channel['onAir'] and channel['input'] == self.resolve(input_id)):
+                    commands.append((f"OverlayInput{number}In", {'Input': input_id}))
+        return commands
+
+    def apply(self, targets):
+        """
+        Amène les canaux à l'état demandé en envoyant uniquement les commandes nécessaires
+
+        Args:
+            targets (dict): {canal: input à afficher, ou None pour éteindre le canal}
+
+        Returns:
+            bool: True si l'état est atteint (y compris sans commande)
+        """
+        invalid = [number for number in targets if int(number) not in self.channels]
+        if invalid:
+            logger.error(f"Canaux d'overlay invalides: {invalid}")
+            return False
+
+        self.sync()
+        commands = self.plan(targets)
+        self.skipped += len(targets) - len(commands)
+        if not commands:
+            logger.debug(f"Overlays déjà dans l'état demandé: {targets}")
+            return True
+
+        if len(commands) == 1:
+            function, params = commands[0]
+            succeeded = int(self.vmix_manager.send_command(function, **params))
+        else:
+            succeeded = self.vmix_manager.send_batch(commands)
+        if succeeded < len(commands):
+            # État incertain : relire vMix à la prochaine demande
+            with self._lock:
+                for number in targets:
+                    self.channels[int(number)]['changedAt'] = 0.0
+            return False
+
+        now = time.time()
+        with self._lock:
+            for number, input_id in targets.items():
+                channel = self.channels[int(number)]
+                if input_id is None:
+                    if channel['onAir']:
+                        channel.update(onAir=False, changedAt=now)
+                elif not (channel['onAir'] and channel['input'] == self.resolve(input_id)):
+                    channel.update(input=self.resolve(input_id), onAir=True, changedAt=now)
+        return True
@@ -0,0 +1,315 @@
+#fonctionnalités à implémenter :
+# -écriture atomique des fichiers JSON (fichier temporaire + renommage)
+# -écriture différée regroupant les sauvegardes rapprochées, -vidage des écritures en attente à l'arrêt
+
+import os
+import json
+import time
+import atexit
+import logging
+import tempfile
+import threading
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('persistence')
+
+# Délai par défaut (secondes) avant l'écriture différée d'un fichier
+DEFAULT_DELAY = 0.5
+
+
+class JsonStore:
+    """
+    Fichier JSON persistant partagé par tous les gestionnaires qui l'utilisent.
+
+    Les sauvegardes sont sérialisées immédiatement (instantané des données)
+    mais écrites sur le disque par un thread unique, au plus tard `delay`
+    secondes après la première sauvegarde en attente : plusieurs sauvegardes
+    rapprochées ne produisent qu'une seule écriture. Chaque écriture passe
+    par un fichier temporaire renommé, le fichier n'est donc jamais tronqué.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    # File des fichiers en attente d'écriture (commune à tous les fichiers)
+    _dirty = {}
+    _condition = threading.Condition()
+    _thread = None
+
+    @classmethod
+    def for_file(cls, path, indent=2, ensure_ascii=True, delay=DEFAULT_DELAY):
+        """
+        Retourne le fichier partagé associé à un chemin
+
+        Les options ne sont prises en compte qu'à la première création.
+
+        Args:
+            path: Chemin du fichier JSON
+            indent: Indentation utilisée à l'écriture
+            ensure_ascii: Échapper les caractères non ASCII
+            delay: Délai maximal (secondes) avant l'écriture différée
+
+        Returns:
+            JsonStore: Instance unique pour ce fichier
+        """
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path, indent, ensure_ascii, delay)
+            return cls._instances[path]
+
+    @classmethod
+    def flush_all(cls):
+        """Écrit immédiatement tous les fichiers en attente (appelé à l'arrêt)"""
+        with cls._instances_lock:
+            stores = list(cls._instances.values())
+        for store in stores:
+            store.flush()
+
+    def __init__(self, path, indent=2, ensure_ascii=True, delay=DEFAULT_DELAY):
+        """
+        Initialise le fichier persistant
+
+        Args:
+            path: Chemin du fichier JSON
+            indent: Indentation utilisée à l'écriture
+            ensure_ascii: Échapper les caractères non ASCII
+            delay: Délai maximal (secondes) avant l'écriture différée
+        """
+        self.path = path
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.delay = delay
+
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._pending = None
+        self._cached = None
+        self._signature = None
+        self._listeners = []
+
+        # Révision du contenu (sauvegardes et modifications externes du fichier)
+        self._revision = 0
+        self._known_signature = self._file_signature()
+
+    @property
+    def pending(self):
+        """Indique si une sauvegarde n'a pas encore été écrite sur le disque"""
+        with self._lock:
+            return self._pending is not None
+
+    def exists(self):
+        """Indique si le fichier existe ou a une sauvegarde en attente"""
+        return self.pending or os.path.exists(self.path)
+
+    def revision(self):
+        """
+        Retourne la révision du contenu, sans lire le fichier
+
+        La révision augmente à chaque sauvegarde et quand le fichier est
+        modifié par un autre processus : deux appels qui retournent la même
+        valeur correspondent au même contenu.
+
+        Returns:
+            int: Révision actuelle
+        """
+        with self._lock:
+            if self._pending is None:
+                signature = self._file_signature()
+                if signature != self._known_signature:
+                    self._known_signature = signature
+                    self._revision += 1
+            return self._revision
+
+    def add_listener(self, callback):
+        """
+        Abonne une fonction aux écritures effectives du fichier
+
+        Args:
+            callback: Fonction appelée avec le chemin après chaque écriture
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def load(self, default=None):
+        """
+        Charge le contenu du fichier
+
+        Une sauvegarde en attente est prioritaire sur le contenu du disque, et
+        le fichier n'est relu que s'il a changé depuis la dernière lecture.
+
+        Args:
+            default: Valeur retournée si le fichier est absent ou illisible
+
+        Returns:
+            Données décodées (nouvelle copie à chaque appel) ou default
+        """
+        with self._lock:
+            if self._pending is not None:
+                return json.loads(self._pending)
+
+            signature = self._file_signature()
+            if signature is None:
+                return default
+
+            if signature != self._signature or self._cached is None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._cached = f.read()
+                    self._signature = signature
+                except OSError as e:
+                    logger.error(f"Erreur lors de la lecture de {self.path}: {e}")
+                    return default
+
+            try:
+                return json.loads(self._cached)
+            except json.JSONDecodeError as e:
+                logger.error(f"Fichier JSON invalide {self.path}: {e}")
+                return default
+
+    def save(self, data):
+        """
+        Programme l'écriture différée des données
+
+        Args:
+            data: Données sérialisables en JSON
+
+        Returns:
+            bool: True si les données ont été sérialisées, False sinon
+        """
+        try:
+            text = self._serialize(data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Données non sérialisables pour {self.path}: {e}")
+            return False
+
+        with self._lock:
+            self._pending = text
+            self._revision += 1
+
+        cls = type(self)
+        with cls._condition:
+            if self.path not in cls._dirty:
+                cls._dirty[self.path] = (time.monotonic() + self.delay, self)
+            cls._ensure_thread()
+            cls._condition.notify()
+        return True
+
+    def save_now(self, data):
+        """
+        Écrit immédiatement les données sur le disque
+
+        Args:
+            data: Données sérialisables en JSON
+
+        Returns:
+            bool: True si l'écriture a réussi, False sinon
+        """
+        try:
+            text = self._serialize(data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Données non sérialisables pour {self.path}: {e}")
+            return False
+
+        with self._lock:
+            self._pending = text
+            self._revision += 1
+        return self.flush()
+
+    def flush(self):
+        """
+        Écrit la sauvegarde en attente, s'il y en a une
+
+        Returns:
+            bool: True si rien n'était en attente ou si l'écriture a réussi
+        """
+        with self._write_lock:
+            with self._lock:
+                text = self._pending
+            if text is None:
+                return True
+
+            try:
+                self._write_atomic(text)
+            except OSError as e:
+                logger.error(f"Erreur lors de l'écriture de {self.path}: {e}")
+                return False
+
+            with self._lock:
+                # Une nouvelle sauvegarde a pu arriver pendant l'écriture
+                if self._pending is text:
+                    self._pending = None
+                self._cached = text
+                self._signature = self._file_signature()
+                self._known_signature = self._signature
+
+        for listener in list(self._listeners):
+            try:
+                listener(self.path)
+            except Exception as e:
+                logger.error(f"Erreur dans un abonné aux écritures de {self.path}: {e}")
+        return True
+
+    def _serialize(self, data):
+        """Sérialise les données selon les options du fichier"""
+        return json.dumps(data, indent=self.indent, ensure_ascii=self.ensure_ascii)
+
+    def _write_atomic(self, text):
+        """Écrit dans un fichier temporaire du même dossier puis le renomme"""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _file_signature(self):
+        """Retourne (mtime, taille) du fichier ou None s'il n'existe pas"""
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    @classmethod
+    def _ensure_thread(cls):
+        """Démarre le thread d'écriture s'il n'est pas actif (le verrou doit être détenu)"""
+        if cls._thread is None or not cls._thread.is_alive():
+            cls._thread = threading.Thread(target=cls._run, name='json-writer', daemon=True)
+            cls._thread.start()
+
+    @classmethod
+    def _run(cls):
+        """Boucle du thread d'écriture différée"""
+        while True:
+            with cls._condition:
+                while not cls._dirty:
+                    cls._condition.wait()
+
+                now = time.monotonic()
+                due = min(entry[0] for entry in cls._dirty.values())
+                if due > now:
+                    cls._condition.wait(due - now)
+                    continue
+
+                ready = [store for path, (when, store) in cls._dirty.items() if when <= now]
+                for store in ready:
+                    del cls._dirty[store.path]
+
+            for store in ready:
+                store.flush()
+
+
+# Écrire les sauvegardes en attente à l'arrêt de l'application
+atexit.register(JsonStore.flush_all)
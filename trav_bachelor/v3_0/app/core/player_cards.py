@@ -0,0 +1,223 @@
+#fonctionnalités à implémenter :
+# -fiches joueur en double tampon (deux titres A/B) : la fiche est écrite hors antenne
+# -préparation des prochaines fiches probables (joueur sélectionné ou survolé par l'opérateur)
+# -affichage par un seul changement d'overlay, jamais de texte à moitié écrit à l'antenne
+
+import logging
+import threading
+from .vmix_manager import player_card_fields
+from .scheduler import scheduler
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('player_cards')
+
+# Clé de la sortie automatique de la fiche dans le planificateur
+AUTO_HIDE_KEY = 'overlay:player_card:auto'
+
+
+def card_key(player, team_name=None):
+    """Identifiant d'une fiche (équipe, numéro et nom du joueur)"""
+    return f"{team_name or ''}|{player.get('numero', '')}|{player.get('prenom', '')} {player.get('nom', '')}"
+
+
+class PlayerCards:
+    """
+    Fiches joueur en double tampon.
+
+    Deux titres vMix identiques servent de tampons : la fiche demandée est
+    écrite dans celui qui n'est pas à l'antenne (un seul lot de SetText,
+    limité aux champs qui changent), puis l'overlay passe sur ce titre en
+    une commande. Une fiche préparée à l'avance (joueur sélectionné ou
+    survolé) s'affiche donc sans aucune écriture. Le titre à l'antenne
+    n'est jamais modifié par une préparation ; avec un seul titre, seul
+    l'affichage d'une nouvelle fiche peut l'écrire à l'antenne.
+    """
+
+    def __init__(self, overlay_manager, scheduler=scheduler):
+        """
+        Initialise les tampons
+
+        Args:
+            overlay_manager: Gestionnaire d'overlays (canaux, configuration 'player_detail')
+            scheduler: Planificateur partagé (sortie automatique)
+        """
+        self.overlay_manager = overlay_manager
+        self.vmix = overlay_manager.vmix
+        self.scheduler = scheduler
+        # Contenu des tampons {input: {'key', 'fields', 'ready'}}
+        self.buffers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        """Configuration de l'overlay de détail de joueur"""
+        return self.overlay_manager.config.get("overlays", {}).get("player_detail", {})
+
+    @property
+    def channel(self):
+        """Canal d'overlay des fiches"""
+        return int(self.config.get("overlay_number", 3))
+
+    @property
+    def inputs(self):
+        """Titres tampons (buffer_inputs, sinon le titre détecté, sinon 'PlayerDetails')"""
+        inputs = self.config.get("buffer_inputs") or [self.overlay_manager.get_input_id("player_detail")
+                                                      or "PlayerDetails"]
+        return [str(value) for value in inputs[:2]]
+
+    def configure(self, inputs, channel=None):
+        """
+        Définit les deux titres tampons
+
+        Args:
+            inputs (list): Inputs vMix des titres A et B (même modèle de titre)
+            channel (int): Canal d'overlay (optionnel)
+
+        Returns:
+            dict: État des fiches, None si les deux titres désignent le même input vMix
+        """
+        channels = self.overlay_manager.channels
+        channels.sync()
+        if len(inputs) > 1 and channels.resolve(inputs[0]) == channels.resolve(inputs[1]):
+            logger.error(f"Titres de fiche joueur identiques dans vMix: {inputs}")
+            return None
+
+        overlay_config = self.overlay_manager.config.setdefault("overlays", {}).setdefault("player_detail", {})
+        with self._lock:
+            overlay_config["buffer_inputs"] = [str(value) for value in inputs][:2]
+            if channel is not None:
+                overlay_config["overlay_number"] = int(channel)
+            self.buffers = {}
+        self.overlay_manager.save_config()
+        return self.status()
+
+    def status(self):
+        """État des tampons et de la fiche à l'antenne"""
+        on_air = self._on_air_input()
+        return {
+            'channel': self.channel,
+            'inputs': self.inputs,
+            'onAir': self.buffers.get(on_air, {}).get('key') if on_air else None,
+            'buffers': {value: {'card': buffer['key'], 'ready': buffer['ready']}
+                        for value, buffer in self.buffers.items()}
+        }
+
+    def _on_air_input(self):
+        """Tampon actuellement à l'antenne (None si aucun)"""
+        for value in self.inputs:
+            if self.overlay_manager.channels.is_on_air(self.channel, value):
+                return value
+        return None
+
+    def _write(self, target, key, fields):
+        """Écrit une fiche dans un tampon (uniquement les champs qui diffèrent)"""
+        buffer = self.buffers.get(target, {'key': None, 'fields': {}, 'ready': False})
+        changes = {name: value for name, value in fields.items() if buffer['fields'].get(name) != value}
+        buffer.update(key=key, ready=False)
+        self.buffers[target] = buffer
+
+        commands = [("SetText", {'Input': target, 'SelectedName': name, 'Value': value})
+                    for name, value in changes.items()]
+        if self.vmix.send_batch(commands) < len(commands):
+            # Contenu incertain : le tampon sera entièrement réécrit
+            buffer.update(key=None, fields={})
+            return False
+        buffer['fields'].update(changes)
+        buffer['ready'] = True
+        return True
+
+    def _prepare_locked(self, player, team_name, allow_on_air=False):
+        """
+        Place une fiche dans un tampon hors antenne
+
+        Args:
+            player (dict): Données du joueur
+            team_name (str): Nom de l'équipe
+            allow_on_air (bool): Écrire dans le titre à l'antenne s'il est le seul tampon (affichage)
+
+        Returns:
+            str: Tampon contenant la fiche, False si la fiche ne peut pas être préparée
+                 sans écrire à l'antenne (un seul titre), None en cas d'échec
+        """
+        key = card_key(player, team_name)
+        fields = dict(player_card_fields(player, team_name))
+        # Un champ absent garderait la valeur de la fiche précédente du tampon
+        fields.setdefault("TeamName", "")
+        fields = {name: str(value) for name, value in fields.items()}
+
+        on_air = self._on_air_input()
+        for value, buffer in self.buffers.items():
+            if buffer['key'] == key and buffer['ready'] and value in self.inputs:
+                return value
+
+        off_air = [value for value in self.inputs if value != on_air]
+        if len(self.inputs) < 2:
+            if on_air is not None and not allow_on_air:
+                logger.info("Un seul titre de fiche joueur, à l'antenne : préparation reportée")
+                return False
+            if on_air is not None:
+                logger.warning("Un seul titre de fiche joueur : fiche écrite à l'antenne")
+            off_air = self.inputs
+        elif not off_air or self.overlay_manager.channels.on_air_anywhere(off_air[0]):
+            # Les deux tampons désignent le même input, ou l'autre tampon est affiché sur un autre canal
+            logger.error(f"Aucun titre de fiche joueur hors antenne: {self.inputs}")
+            return None
+        return off_air[0] if self._write(off_air[0], key, fields) else None
+
+    def prepare(self, player, team_name=None):
+        """
+        Prépare une fiche hors antenne (joueur probable : sélectionné, survolé, au service)
+
+        Args:
+            player (dict): Données du joueur
+            team_name (str): Nom de l'équipe
+
+        Returns:
+            str: Tampon contenant la fiche, False si la préparation est reportée
+                 (seul titre, à l'antenne), None en cas d'échec
+        """
+        with self._lock:
+            self.overlay_manager.channels.sync()
+            return self._prepare_locked(player, team_name)
+
+    def show(self, player, team_name=None, duration=None):
+        """
+        Affiche une fiche par un seul changement d'overlay
+
+        Args:
+            player (dict): Données du joueur
+            team_name (str): Nom de l'équipe
+            duration (int): Sortie automatique après cette durée (secondes, None : pas de sortie)
+
+        Returns:
+            bool: True si la fiche est à l'antenne
+        """
+        with self._lock:
+            self.overlay_manager.channels.sync()
+            target = self._prepare_locked(player, team_name, allow_on_air=True)
+            if not target:
+                logger.error("Échec de la préparation de la fiche joueur")
+                return False
+            result = self.overlay_manager.channels.apply({self.channel: target})
+
+        if result:
+            if duration:
+                self.scheduler.schedule(AUTO_HIDE_KEY, duration, self.hide)
+            else:
+                self.scheduler.cancel(AUTO_HIDE_KEY)
+        return result
+
+    def hide(self):
+        """
+        Retire la fiche de l'antenne
+
+        Returns:
+            bool: True si réussi (y compris si aucune fiche n'était affichée)
+        """
+        self.scheduler.cancel(AUTO_HIDE_KEY)
+        with self._lock:
+            self.overlay_manager.channels.sync()
+            if self._on_air_input() is None:
+                return True
+            return self.overlay_manager.channels.apply({self.channel: None})
@@ -0,0 +1,213 @@
+#fonctionnalités à implémenter :
+# -index des événements de replay (type, set, joueur, tag, plage horaire) pour des recherches rapides
+# -pagination des résultats, -archives des événements par match
+
+import os
+import re
+import bisect
+import logging
+from .persistence import JsonStore
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('replay_catalog')
+
+# Taille de page par défaut et maximale des recherches
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _key(value):
+    """Clé d'index insensible à la casse (joueurs, tags, types)"""
+    return str(value).strip().lower()
+
+
+class ReplayIndex:
+    """
+    Index en mémoire d'une liste d'événements de replay.
+
+    Chaque critère (type, set, joueur, tag) associe sa valeur aux positions
+    des événements ; les horodatages ISO sont triés pour les recherches par
+    plage horaire. Les ajouts sont incrémentaux, une suppression reconstruit
+    l'index.
+    """
+
+    def __init__(self, events=None):
+        """
+        Construit l'index
+
+        Args:
+            events (list): Événements à indexer (la liste est référencée, pas copiée)
+        """
+        self.rebuild(events or [])
+
+    def rebuild(self, events):
+        """Reconstruit l'index pour une liste d'événements"""
+        self.events = events
+        self.by_type = {}
+        self.by_set = {}
+        self.by_player = {}
+        self.by_tag = {}
+        self._times = []
+        self._time_positions = []
+        for position, event in enumerate(events):
+            self.add(event, position)
+
+    def add(self, event, position=None):
+        """
+        Indexe un événement déjà présent dans la liste
+
+        Args:
+            event (dict): Événement
+            position (int): Position dans la liste (par défaut le dernier)
+        """
+        position = len(self.events) - 1 if position is None else position
+        self.by_type.setdefault(_key(event.get('type', '')), []).append(position)
+        if event.get('set') is not None:
+            self.by_set.setdefault(int(event['set']), []).append(position)
+        for player in event.get('players') or []:
+            self.by_player.setdefault(_key(player), []).append(position)
+        for tag in event.get('tags') or []:
+            self.by_tag.setdefault(_key(tag), []).append(position)
+
+        timestamp = event.get('timestamp', '')
+        slot = bisect.bisect_right(self._times, timestamp)
+        self._times.insert(slot, timestamp)
+        self._time_positions.insert(slot, position)
+
+    def query(self, event_type=None, set_number=None, player=None, tag=None, start=None, end=None):
+        """
+        Recherche des événements
+
+        Args:
+            event_type: Type d'événement ('point', 'set', 'match', 'custom'...)
+            set_number (int): Numéro du set
+            player: Nom (ou numéro) d'un joueur impliqué
+            tag: Tag libre
+            start: Horodatage ISO minimal (inclus)
+            end: Horodatage ISO maximal (inclus)
+
+        Returns:
+            list: Positions des événements trouvés, dans l'ordre chronologique
+        """
+        candidates = []
+        if event_type:
+            candidates.append(self.by_type.get(_key(event_type), []))
+        if set_number is not None:
+            candidates.append(self.by_set.get(int(set_number), []))
+        if player:
+            candidates.append(self.by_player.get(_key(player), []))
+        if tag:
+            candidates.append(self.by_tag.get(_key(tag), []))
+
+        # Plage horaire : tranche de l'index trié (pas de parcours de la liste) ;
+        # une borne de fin partielle ('2025-09-19T10:15') inclut toute la minute
+        low = bisect.bisect_left(self._times, start) if start else 0
+        high = bisect.bisect_right(self._times, end + '\uffff') if end else len(self._times)
+        in_range = self._time_positions[low:high]
+
+        if not candidates:
+            return in_range
+
+        # Intersection en partant du critère le plus sélectif
+        candidates.sort(key=len)
+        selected = set(candidates[0])
+        for positions in candidates[1:]:
+            selected.intersection_update(positions)
+            if not selected:
+                return []
+        if start or end:
+            return [position for position in in_range if position in selected]
+        return [position for position in self._time_positions if position in selected]
+
+
+def paginate(items, page=1, per_page=DEFAULT_PAGE_SIZE):
+    """
+    Découpe une liste de résultats en pages
+
+    Args:
+        items (list): Résultats
+        page (int): Numéro de page (à partir de 1)
+        per_page (int): Nombre de résultats par page (borné à MAX_PAGE_SIZE ; None : tous les
+                        résultats, pour les traitements internes)
+
+    Returns:
+        dict: {'events', 'total', 'page', 'perPage', 'pages'}
+    """
+    if per_page is None:
+        page, per_page = 1, max(1, len(items))
+    else:
+        per_page = max(1, min(MAX_PAGE_SIZE, int(per_page)))
+        page = max(1, int(page))
+    total = len(items)
+    start = (page - 1) * per_page
+    return {
+        'events': items[start:start + per_page],
+        'total': total,
+        'page': page,
+        'perPage': per_page,
+        'pages': (total + per_page - 1) // per_page
+    }
+
+
+class ReplayArchive:
+    """
+    Archives des événements de replay par match.
+
+    Les événements d'un match terminé sont déplacés dans
+    data/replay_archive/<match>.json ; l'index d'une archive n'est construit
+    qu'à sa première consultation puis conservé tant que le fichier ne change pas.
+    """
+
+    def __init__(self, archive_dir):
+        """
+        Initialise les archives
+
+        Args:
+            archive_dir: Répertoire des fichiers d'archive
+        """
+        self.archive_dir = archive_dir
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self._indexes = {}
+
+    def _store(self, match_id):
+        """Fichier d'archive d'un match"""
+        filename = re.sub(r'[^A-Za-z0-9_.-]', '_', str(match_id)) + '.json'
+        return JsonStore.for_file(os.path.join(self.archive_dir, filename))
+
+    def matches(self):
+        """Liste des matchs archivés"""
+        return sorted(name[:-len('.json')] for name in os.listdir(self.archive_dir) if name.endswith('.json'))
+
+    def archive(self, match_id, events):
+        """
+        Ajoute des événements à l'archive d'un match
+
+        Args:
+            match_id: Identifiant du match
+            events (list): Événements à archiver
+        """
+        store = self._store(match_id)
+        archived = store.load([]) or []
+        archived.extend(events)
+        store.save_now(archived)
+        self._indexes.pop(match_id, None)
+        logger.info(f"{len(events)} événements de replay archivés pour le match {match_id}")
+
+    def index(self, match_id):
+        """
+        Index des événements archivés d'un match
+
+        Args:
+            match_id: Identifiant du match
+
+        Returns:
+            ReplayIndex: Index (vide si le match n'est pas archivé)
+        """
+        store = self._store(match_id)
+        revision = store.revision()
+        cached = self._indexes.get(match_id)
+        if cached is None or cached[0] != revision:
+            cached = (revision, ReplayIndex(store.load([]) or []))
+            self._indexes[match_id] = cached
+        return cached[1]
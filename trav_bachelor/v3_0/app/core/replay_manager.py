@@ -1,9 +1,15 @@
 import os
-import json
 import time
+import uuid
 import logging
+import threading
 from datetime import datetime
 from .vmix_manager import VMixManager
+from .scheduler import scheduler
+from .persistence import JsonStore
+from .event_bus import event_bus, DEFAULT_MATCH_ID
+from .score_manager import score_manager
+from .replay_catalog import ReplayIndex, ReplayArchive, paginate
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -19,17 +25,38 @@ class ReplayManager:
         """Initialise le gestionnaire de replay."""
         self.vmix = VMixManager()
 
+        # Planificateur partagé (retour automatique au direct après un replay)
+        self.scheduler = scheduler
+
+        # Verrou protégeant la liste des événements (marquage manuel et automatique)
+        self.events_lock = threading.RLock()
+
         # Chemins pour les fichiers de configuration et de données
         self.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.config_file = os.path.join(self.base_path, 'data', 'replay_config.json')
         self.events_file = os.path.join(self.base_path, 'data', 'replay_events.json')
+        self.vmix_events_file = os.path.join(self.base_path, 'data', 'replay_vmix_events.json')
 
         # Créer les répertoires s'ils n'existent pas
         os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
 
+        # Fichiers persistants (écriture atomique et différée)
+        self.config_store = JsonStore.for_file(self.config_file)
+        self.events_store = JsonStore.for_file(self.events_file)
+        self.vmix_events_store = JsonStore.for_file(self.vmix_events_file)
+
+        # Nombre d'événements créés dans chaque liste d'événements de vMix {liste: nombre}.
+        # vMix conserve les événements supprimés localement : le compteur ne diminue jamais.
+        self.vmix_event_counts = self.vmix_events_store.load({}) or {}
+
         # Charger ou initialiser la configuration
         self.load_config()
 
+        # Index des événements du match en cours et archives des matchs précédents
+        self.index = ReplayIndex()
+        self.archive = ReplayArchive(os.path.join(self.base_path, 'data', 'replay_archive'))
+        self._events_revision = None
+
         # Charger ou initialiser les événements
         self.load_events()
 
@@ -41,14 +68,17 @@ class ReplayManager:
     def load_config(self):
         """Charge la configuration des replays depuis le fichier JSON."""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    self.config = json.load(f)
+            if self.config_store.exists():
+                config = self.config_store.load()
+                if config is None:
+                    raise ValueError(f"fichier illisible {self.config_file}")
+                self.config = config
             else:
                 # Configuration par défaut
                 self.config = {
                     'duration': 8,
                     'speed': 50,
+                    'preRoll': 8,
                     'enableAutoReplay': False,
                     'events': {
                         'point': True,
@@ -67,6 +97,7 @@ class ReplayManager:
             self.config = {
                 'duration': 8,
                 'speed': 50,
+                'preRoll': 8,
                 'enableAutoReplay': False,
                 'events': {
                     'point': True,
@@ -79,8 +110,8 @@ class ReplayManager:
     def save_config(self):
         """Sauvegarde la configuration des replays dans le fichier JSON."""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            if not self.config_store.save(self.config):
+                return False
             logger.info("Configuration des replays sauvegardée")
             return True
         except Exception as e:
@@ -90,9 +121,22 @@ class ReplayManager:
     def load_events(self):
         """Charge les événements de replay depuis le fichier JSON."""
         try:
-            if os.path.exists(self.events_file):
-                with open(self.events_file, 'r') as f:
-                    self.events = json.load(f)
+            if self.events_store.exists():
+                with self.events_lock:
+                    # Liste en mémoire à jour : pas de relecture ni de réindexation
+                    if self._events_revision is not None and self._events_revision == self.events_store.revision():
+                        self._rollover_match()
+                        return self.events
+
+                    events = self.events_store.load()
+                    if events is None:
+                        raise ValueError(f"fichier illisible {self.events_file}")
+                    self.events = events
+                    self.index.rebuild(self.events)
+                    if self._assign_event_ids():
+                        self.save_events()
+                    self._events_revision = self.events_store.revision()
+                    self._rollover_match()
             else:
                 self.events = []
                 # Sauvegarder la liste d'événements vide
@@ -108,14 +152,250 @@ class ReplayManager:
     def save_events(self):
         """Sauvegarde les événements de replay dans le fichier JSON."""
         try:
-            with open(self.events_file, 'w') as f:
-                json.dump(self.events, f, indent=2)
+            with self.events_lock:
+                if not self.events_store.save(self.events):
+                    return False
+                self._events_revision = self.events_store.revision()
+                event_bus.publish_match('replay_events_updated', {'events': self.events})
             logger.info(f"Événements de replay sauvegardés: {len(self.events)} événements")
             return True
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde des événements de replay: {str(e)}")
             return False
 
+    def _assign_event_ids(self):
+        """
+        Complète les événements enregistrés avant la réconciliation avec vMix
+
+        Chaque événement reçoit un identifiant stable, le match en cours et, à
+        défaut de mieux, la correspondance vMix supposée par l'ancienne version
+        (liste 1, numéro égal à son index local).
+
+        Returns:
+            bool: True si des événements ont été complétés
+        """
+        changed = False
+        for position, event in enumerate(self.events):
+            if not event.get('id'):
+                event['id'] = uuid.uuid4().hex[:12]
+                changed = True
+            if 'vmix' not in event:
+                event['vmix'] = {'list': 1, 'number': event.get('index', position)}
+                changed = True
+            if 'match' not in event:
+                # Événements déjà présents : rattachés au match en cours
+                event['match'] = event_bus.match_id
+                changed = True
+        if changed:
+            counts = self.vmix_event_counts
+            for event in self.events:
+                mapping = event['vmix']
+                key = str(mapping['list'])
+                counts[key] = max(counts.get(key, 0), mapping['number'] + 1)
+            self.vmix_events_store.save(counts)
+        return changed
+
+    def reconcile(self, max_age=None):
+        """
+        Lit l'état réel du replay dans vMix (instantané XML partagé)
+
+        Met à jour l'état d'enregistrement local à partir de vMix : une
+        commande passée directement dans vMix est ainsi prise en compte.
+
+        Args:
+            max_age: Âge maximal (secondes) de l'instantané réutilisé
+
+        Returns:
+            dict: {'connected', 'input', 'recording', 'live', 'eventsList', 'counts'}
+                  ou None si vMix est injoignable
+        """
+        snapshot = self.vmix.get_snapshot(max_age=max_age)
+        if not snapshot['connected']:
+            return None
+
+        replay = snapshot.get('replay') or {'input': None, 'recording': False, 'live': True, 'eventsList': 1}
+        if replay['input'] is not None and replay['recording'] != self.is_recording:
+            self.is_recording = replay['recording']
+            self.recording_start_time = datetime.now() if replay['recording'] else None
+
+        return dict(replay, connected=True, counts=dict(self.vmix_event_counts))
+
+    def resync_vmix_events(self, events_list, count):
+        """
+        Recale le compteur d'une liste d'événements de vMix (liste vidée ou modifiée dans vMix)
+
+        Les événements locaux qui pointaient au-delà du nouveau nombre
+        d'événements de cette liste perdent leur correspondance vMix.
+
+        Args:
+            events_list (int): Liste d'événements de vMix (1-20)
+            count (int): Nombre d'événements présents dans cette liste
+
+        Returns:
+            dict: Compteurs par liste
+        """
+        with self.events_lock:
+            self.vmix_event_counts[str(events_list)] = count
+            self.vmix_events_store.save(self.vmix_event_counts)
+            for event in self.events:
+                mapping = event.get('vmix')
+                if mapping and mapping['list'] == events_list and mapping['number'] >= count:
+                    event['vmix'] = None
+            self.save_events()
+        return dict(self.vmix_event_counts)
+
+    def _rollover_match(self):
+        """
+        Archive les événements des matchs précédents (appelé sous events_lock)
+
+        Quand un nouveau match est configuré, les événements de l'ancien match
+        sont déplacés dans son archive : la liste courante ne contient que le
+        match en cours.
+        """
+        match_id = event_bus.match_id
+        if not self.events or (self.events[0].get('match') == match_id and self.events[-1].get('match') == match_id):
+            return
+
+        previous = {}
+        for event in self.events:
+            if event.get('match') != match_id:
+                previous.setdefault(event.get('match') or DEFAULT_MATCH_ID, []).append(event)
+        for archived_match, events in previous.items():
+            self.archive.archive(archived_match, events)
+
+        self.events = [event for event in self.events if event.get('match') == match_id]
+        for i, event in enumerate(self.events):
+            event['index'] = i
+        self.index.rebuild(self.events)
+        self.save_events()
+
+    def _match_context(self, match_event=None):
+        """
+        Contexte de match enregistré avec un événement de replay
+
+        Args:
+            match_event (dict): Événement de match à l'origine du replay (replay automatique)
+
+        Returns:
+            dict: {'match', 'set', 'score', 'sets'} (+ 'team' pour un événement de match)
+        """
+        if match_event:
+            state = match_event.get('score') or score_manager.get_state()
+            set_number = match_event.get('set')
+        else:
+            state = score_manager.get_state()
+            set_number = score_manager.current_set()
+
+        context = {
+            'match': event_bus.match_id,
+            'set': set_number,
+            'score': {'A': state['teamA']['score'], 'B': state['teamB']['score']},
+            'sets': {'A': state['teamA']['sets'], 'B': state['teamB']['sets']}
+        }
+        if match_event and match_event.get('team'):
+            context['team'] = match_event['team']
+        return context
+
+    def _add_event(self, event):
+        """Ajoute un événement à la liste du match en cours et à l'index (appelé sous events_lock)"""
+        self._rollover_match()
+        event['index'] = len(self.events)
+        self.events.append(event)
+        self.index.add(event)
+        self.save_events()
+
+    def search(self, match_id=None, event_type=None, set_number=None, player=None, tag=None,
+               start=None, end=None, page=1, per_page=50):
+        """
+        Recherche des événements de replay par critères
+
+        Args:
+            match_id: Match recherché (par défaut le match en cours, sinon son archive)
+            event_type: Type d'événement
+            set_number (int): Numéro du set
+            player: Joueur impliqué
+            tag: Tag libre
+            start: Horodatage ISO minimal
+            end: Horodatage ISO maximal
+            page (int): Numéro de page
+            per_page (int): Résultats par page (None : tous les résultats)
+
+        Returns:
+            dict: {'match', 'events', 'total', 'page', 'perPage', 'pages'}
+        """
+        with self.events_lock:
+            self._rollover_match()
+            if match_id is None or match_id == event_bus.match_id:
+                match_id, index = event_bus.match_id, self.index
+            else:
+                index = self.archive.index(match_id)
+            positions = index.query(event_type, set_number, player, tag, start, end)
+            result = paginate(positions, page, per_page)
+            result['events'] = [index.events[position] for position in result['events']]
+        return dict(result, match=match_id)
+
+    def update_event_metadata(self, event_ref, tags=None, players=None):
+        """
+        Modifie les tags libres et les joueurs impliqués d'un événement du match en cours
+
+        Args:
+            event_ref: Identifiant stable de l'événement ou position dans la liste
+            tags (list): Nouveaux tags (None : inchangés)
+            players (list): Nouveaux joueurs (None : inchangés)
+
+        Returns:
+            dict: Événement modifié ou None s'il est introuvable
+        """
+        with self.events_lock:
+            _, event = self.find_event(event_ref)
+            if event is None:
+                return None
+            if tags is not None:
+                event['tags'] = [str(tag).strip() for tag in tags if str(tag).strip()]
+            if players is not None:
+                event['players'] = [str(player).strip() for player in players if str(player).strip()]
+            self.index.rebuild(self.events)
+            self.save_events()
+            return event
+
+    def _allocate_vmix_event(self, events_list):
+        """
+        Réserve le numéro vMix du prochain événement marqué (appelé sous events_lock)
+
+        vMix numérote les événements d'une liste dans l'ordre de création.
+
+        Args:
+            events_list (int): Liste d'événements sélectionnée dans vMix
+
+        Returns:
+            dict: {'list', 'number'}
+        """
+        key = str(events_list)
+        number = self.vmix_event_counts.get(key, 0)
+        self.vmix_event_counts[key] = number + 1
+        self.vmix_events_store.save(self.vmix_event_counts)
+        return {'list': events_list, 'number': number}
+
+    def find_event(self, event_ref):
+        """
+        Retrouve un événement par identifiant stable ou par position dans la liste
+
+        Args:
+            event_ref: Identifiant ('id') ou position (int)
+
+        Returns:
+            tuple: (position, événement) ou (None, None)
+        """
+        with self.events_lock:
+            if isinstance(event_ref, int):
+                if 0 <= event_ref < len(self.events):
+                    return event_ref, self.events[event_ref]
+                return None, None
+            for position, event in enumerate(self.events):
+                if event.get('id') == event_ref:
+                    return position, event
+            return None, None
+
     def set_duration(self, duration):
         """
         Définit la durée du buffer de replay.
@@ -243,6 +523,7 @@ class ReplayManager:
 
             if result:
                 self.is_playing = True
+                self._schedule_auto_return(self.config.get('duration', 8), speed)
                 logger.info(f"Lecture du dernier replay à {speed}% réussie")
                 return True
             else:
@@ -271,6 +552,7 @@ class ReplayManager:
 
             if result:
                 self.is_playing = False
+                self.scheduler.cancel("replay:auto-return")
                 logger.info("Replay mis en pause")
                 return True
             else:
@@ -280,64 +562,77 @@ class ReplayManager:
             logger.error(f"Erreur lors de la mise en pause du replay: {str(e)}")
             return False
 
-    def mark_event(self, name, event_type="point"):
+    def mark_event(self, name, event_type="point", players=None, tags=None):
         """
         Marque un événement de replay.
 
         Args:
             name (str): Nom de l'événement
             event_type (str): Type d'événement ('point', 'set', 'match', etc.)
+            players (list, optional): Joueurs impliqués
+            tags (list, optional): Tags libres
 
         Returns:
             tuple: (success, events_list)
         """
         try:
-            # Vérifier la connexion à vMix
-            if not self.vmix.check_connection():
+            # Vérifier la connexion à vMix et lire la liste d'événements sélectionnée
+            replay = self.reconcile()
+            if replay is None:
                 logger.error("Impossible de se connecter à vMix")
                 return False, None
 
-            # Générer un index d'événement unique pour vMix
-            event_index = len(self.events)
-
-            # Marquer le début de l'événement dans vMix avec ReplayMarkIn
-            # On utilise la méthode send_command correctement avec les paramètres séparés
-            result = self.vmix.send_command("ReplayMarkIn", Value=event_index)
-
-            if not result:
-                logger.error("Échec du marquage du début de l'événement (ReplayMarkIn)")
-                return False, None
-
-            # Récupérer la durée configurée pour l'événement
-            replay_duration = self.config.get('duration', 8)  # Durée par défaut 8 secondes
-
-            # Nettoyer le nom de l'événement
-            event_name = name
-            if isinstance(name, dict) or not isinstance(name, str):
-                # Si c'est un objet ou non une chaîne, utiliser un nom par défaut
-                event_name = f"Événement {len(self.events) + 1}"
-
-            # Marquer la fin de l'événement dans vMix avec ReplayMarkOut
-            # On utilise la méthode send_command correctement avec les paramètres séparés
-            result = self.vmix.send_command("ReplayMarkOut", Value=event_index)
-
-            if not result:
-                logger.warning("Échec du marquage de la fin de l'événement (ReplayMarkOut)")
-                # On continue car ReplayMarkIn a fonctionné et c'est le plus important
-
-            # Définir le nom de l'événement dans vMix
-            result = self.vmix.send_command("ReplayChangeEventName", Value=event_index, Name=event_name)
-
-            # Créer et enregistrer l'événement
-            event = {
-                'name': event_name,
-                'type': event_type,
-                'timestamp': datetime.now().isoformat(),
-                'index': event_index,
-                'duration': replay_duration
-            }
-            self.events.append(event)
-            self.save_events()
+            with self.events_lock:
+                self._rollover_match()
+                event_index = len(self.events)
+                # Numéro de l'événement dans vMix (stable, indépendant des suppressions locales)
+                vmix_event = self._allocate_vmix_event(replay['eventsList'])
+
+                # Marquer le début de l'événement dans vMix avec ReplayMarkIn
+                # On utilise la méthode send_command correctement avec les paramètres séparés
+                result = self.vmix.send_command("ReplayMarkIn", Value=vmix_event['number'])
+
+                if not result:
+                    # Aucun événement créé dans vMix : libérer le numéro réservé
+                    self.vmix_event_counts[str(vmix_event['list'])] = vmix_event['number']
+                    self.vmix_events_store.save(self.vmix_event_counts)
+                    logger.error("Échec du marquage du début de l'événement (ReplayMarkIn)")
+                    return False, None
+
+                # Récupérer la durée configurée pour l'événement
+                replay_duration = self.config.get('duration', 8)  # Durée par défaut 8 secondes
+
+                # Nettoyer le nom de l'événement
+                event_name = name
+                if isinstance(name, dict) or not isinstance(name, str):
+                    # Si c'est un objet ou non une chaîne, utiliser un nom par défaut
+                    event_name = f"Événement {len(self.events) + 1}"
+
+                # Marquer la fin de l'événement dans vMix avec ReplayMarkOut
+                # On utilise la méthode send_command correctement avec les paramètres séparés
+                result = self.vmix.send_command("ReplayMarkOut", Value=vmix_event['number'])
+
+                if not result:
+                    logger.warning("Échec du marquage de la fin de l'événement (ReplayMarkOut)")
+                    # On continue car ReplayMarkIn a fonctionné et c'est le plus important
+
+                # Définir le nom de l'événement dans vMix
+                result = self.vmix.send_command("ReplayChangeEventName", Value=vmix_event['number'], Name=event_name)
+
+                # Créer et enregistrer l'événement
+                event = {
+                    'id': uuid.uuid4().hex[:12],
+                    'name': event_name,
+                    'type': event_type,
+                    'timestamp': datetime.now().isoformat(),
+                    'index': event_index,
+                    'duration': replay_duration,
+                    'vmix': vmix_event,
+                    'players': [str(player) for player in players or []],
+                    'tags': [str(tag) for tag in tags or []]
+                }
+                event.update(self._match_context())
+                self._add_event(event)
 
             logger.info(f"Événement marqué: {event['name']} (durée: {replay_duration}s, index: {event_index})")
             return True, self.events
@@ -345,25 +640,128 @@ class ReplayManager:
             logger.error(f"Erreur lors du marquage de l'événement: {str(e)}")
             return False, None
 
-    def play_event(self, event_index, speed=100):
+    def on_match_event(self, event):
+        """
+        Abonné aux événements de match : marque automatiquement un replay.
+
+        Appelé depuis le thread de diffusion du gestionnaire de score, donc
+        jamais depuis le thread de la requête qui met à jour le score.
+
+        Args:
+            event (dict): Événement de match ('type', 'name', ...)
+        """
+        if not self.config.get('enableAutoReplay', False):
+            return
+
+        event_type = event.get('type')
+        if not self.config.get('events', {}).get(event_type, False):
+            return
+
+        self.mark_auto_event(event.get('name', ''), event_type, event)
+
+    def mark_auto_event(self, name, event_type, match_event=None):
+        """
+        Marque un événement de replay couvrant les dernières secondes (pré-roll).
+
+        Utilise la paire mark-in/out de vMix en une commande : l'événement
+        commence 'preRoll' secondes avant l'instant présent et s'arrête maintenant.
+
+        Args:
+            name (str): Nom de l'événement
+            event_type (str): Type d'événement ('point', 'set', 'match')
+            match_event (dict, optional): Événement de match (set, score, équipe)
+
+        Returns:
+            dict: Événement créé ou None en cas d'échec
+        """
+        try:
+            pre_roll = self.config.get('preRoll', self.config.get('duration', 8))
+
+            replay = self.reconcile()
+            events_list = replay['eventsList'] if replay else 1
+
+            with self.events_lock:
+                self._rollover_match()
+                event_index = len(self.events)
+
+                if not self.vmix.send_command("ReplayMarkInOut", Value=pre_roll):
+                    logger.error(f"Échec du marquage automatique de l'événement '{name}'")
+                    return None
+
+                vmix_event = self._allocate_vmix_event(events_list)
+                self.vmix.send_command("ReplayChangeEventName", Value=vmix_event['number'], Name=name)
+
+                event = {
+                    'id': uuid.uuid4().hex[:12],
+                    'name': name,
+                    'type': event_type,
+                    'timestamp': datetime.now().isoformat(),
+                    'index': event_index,
+                    'duration': pre_roll,
+                    'auto': True,
+                    'vmix': vmix_event,
+                    'players': [],
+                    'tags': []
+                }
+                event.update(self._match_context(match_event))
+                self._add_event(event)
+
+            logger.info(f"Événement marqué automatiquement: {name} (pré-roll: {pre_roll}s, index: {event_index})")
+            return event
+        except Exception as e:
+            logger.error(f"Erreur lors du marquage automatique de l'événement: {str(e)}")
+            return None
+
+    def update_auto_replay_config(self, enabled=None, events=None, pre_roll=None):
+        """
+        Met à jour les réglages du replay automatique.
+
+        Args:
+            enabled (bool, optional): Active ou désactive le replay automatique
+            events (dict, optional): Interrupteurs par type {'point': bool, 'set': bool, 'match': bool}
+            pre_roll (int, optional): Pré-roll en secondes (1-60)
+
+        Returns:
+            bool: True si la configuration a été enregistrée, False sinon
+        """
+        if pre_roll is not None and (not isinstance(pre_roll, (int, float)) or pre_roll < 1 or pre_roll > 60):
+            logger.error(f"Pré-roll invalide: {pre_roll}")
+            return False
+
+        if enabled is not None:
+            self.config['enableAutoReplay'] = bool(enabled)
+        if events:
+            switches = self.config.setdefault('events', {})
+            for event_type in ('point', 'set', 'match'):
+                if event_type in events:
+                    switches[event_type] = bool(events[event_type])
+        if pre_roll is not None:
+            self.config['preRoll'] = pre_roll
+
+        return self.save_config()
+
+    def play_event(self, event_ref, speed=100, auto_return=True):
         """
         Lit un événement de replay spécifique.
 
-        Selon la documentation vMix, la commande ReplayPlayEvent prend:
-        - Value: l'index de l'événement (0-based)
-        - Speed: la vitesse de lecture (25, 50, 75, 100)
+        Le numéro vMix de l'événement est celui réservé au marquage (stable
+        malgré les suppressions locales) : la lecture est une seule commande
+        ReplayPlayEvent, précédée d'un changement de liste d'événements
+        uniquement si vMix affiche une autre liste que celle de l'événement.
 
         Args:
-            event_index (int): Index de l'événement à lire
+            event_ref: Identifiant stable de l'événement ou position dans la liste
             speed (int): Vitesse de lecture en pourcentage (25, 50, 75, 100)
+            auto_return (bool): Programmer le retour au direct à la fin du clip
+                                (désactivé quand les clips s'enchaînent dans un résumé)
 
         Returns:
             bool: True si la lecture a démarré avec succès, False sinon
         """
         try:
-            # Vérifier que l'index est valide
-            if event_index < 0 or event_index >= len(self.events):
-                logger.error(f"Index d'événement invalide: {event_index}")
+            position, event = self.find_event(event_ref)
+            if event is None:
+                logger.error(f"Événement de replay introuvable: {event_ref}")
                 return False
 
             # Vérifier que la vitesse est valide
@@ -371,71 +769,75 @@ class ReplayManager:
                 logger.error(f"Vitesse de replay invalide: {speed}")
                 return False
 
-            # Vérifier la connexion à vMix
-            if not self.vmix.check_connection():
+            vmix_event = event.get('vmix')
+            if not vmix_event:
+                logger.error(f"L'événement '{event.get('name')}' n'existe plus dans vMix")
+                return False
+
+            # État du replay dans vMix (instantané partagé, pas de requête si récent)
+            replay = self.reconcile()
+            if replay is None:
                 logger.error("Impossible de se connecter à vMix")
                 return False
 
-            # D'après la documentation vMix, l'index dans le buffer vMix peut être différent
-            # de notre index local. Nous utilisons donc directement l'événement le plus récent.
-            # Pour vMix, les événements sont numérotés de 0 (le plus récent) à N
-            try:
-                # D'abord, on essaie de lire avec notre index, au cas où vMix utilise le même ordre
-                command = "ReplayPlayEvent"
-                params = {
-                    "Value": event_index,
-                    "Speed": speed
-                }
+            if replay['eventsList'] != vmix_event['list']:
+                if not self.vmix.send_command(f"ReplaySelectEvents{vmix_event['list']}"):
+                    logger.error(f"Échec de la sélection de la liste d'événements {vmix_event['list']}")
+                    return False
 
-                logger.info(f"Tentative de lecture de l'événement {event_index} à {speed}%")
-                result = self.vmix.send_command(command, **params)
-
-                if result:
-                    self.is_playing = True
-                    logger.info(f"Lecture de l'événement {event_index} à {speed}% réussie")
-                    return True
-
-                # Si ça échoue, on peut essayer de convertir notre index
-                # en index vMix (plus récent = plus petit index)
-                vmix_index = len(self.events) - 1 - event_index
-                if vmix_index >= 0:
-                    command = "ReplayPlayEvent"
-                    params = {
-                        "Value": vmix_index,
-                        "Speed": speed
-                    }
+            logger.info(f"Lecture de l'événement {event.get('name')} (vMix {vmix_event['list']}/{vmix_event['number']}) à {speed}%")
+            if not self.vmix.send_command("ReplayPlayEvent", Value=vmix_event['number'], Speed=speed):
+                logger.error(f"Échec de la lecture de l'événement {position}")
+                return False
 
-                    logger.info(f"Tentative alternative: lecture de l'événement vMix {vmix_index} à {speed}%")
-                    result = self.vmix.send_command(command, **params)
+            self.is_playing = True
+            if auto_return:
+                self._schedule_auto_return(event.get('duration', 8), speed)
+            else:
+                self.scheduler.cancel("replay:auto-return")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture de l'événement: {str(e)}")
+            return False
 
-                    if result:
-                        self.is_playing = True
-                        logger.info(f"Lecture de l'événement {vmix_index} (converti) à {speed}% réussie")
-                        return True
+    def _schedule_auto_return(self, duration, speed):
+        """
+        Programme le retour automatique au direct à la fin du replay.
 
-                # Si les deux approches échouent, on tente de lire le dernier événement
-                command = "ReplayPlay"
-                params = {"Speed": speed}
-                logger.info(f"Tentative de lecture du dernier événement à {speed}%")
-                result = self.vmix.send_command(command, **params)
+        Le retour n'est programmé que si l'entrée de retour ('autoReturnInput')
+        est définie dans la configuration. Une nouvelle lecture remplace le
+        retour en attente.
 
-                if result:
-                    self.is_playing = True
-                    logger.info(f"Lecture du dernier événement à {speed}% réussie (fallback)")
-                    return True
+        Args:
+            duration (float): Durée de l'événement en secondes
+            speed (int): Vitesse de lecture en pourcentage
+        """
+        if not self.config.get('autoReturnInput'):
+            return
 
-                logger.error(f"Échec de toutes les tentatives de lecture de l'événement")
-                return False
+        playback_time = float(duration) * 100 / max(speed, 1)
+        self.scheduler.schedule("replay:auto-return", playback_time, self.return_to_live)
 
-            except Exception as e:
-                logger.error(f"Erreur lors de la lecture de l'événement: {str(e)}")
-                return False
+    def return_to_live(self):
+        """
+        Repasse le programme sur l'entrée du direct configurée.
 
-        except Exception as e:
-            logger.error(f"Erreur lors de la lecture de l'événement: {str(e)}")
+        Returns:
+            bool: True si la transition a réussi, False sinon
+        """
+        return_input = self.config.get('autoReturnInput')
+        if not return_input:
             return False
 
-    def delete_event(self, event_index):
+        result = self.vmix.send_command("Fade", Input=return_input, Duration=500)
+        if result:
+            self.is_playing = False
+            logger.info(f"Retour automatique au direct sur l'entrée {return_input}")
+        else:
+            logger.error("Échec du retour automatique au direct")
+        return result
+
+    def delete_event(self, event_ref):
         """
         Supprime un événement de replay de la liste locale.
 
@@ -447,27 +849,33 @@ class ReplayManager:
         1. Recréer tous les événements restants dans vMix (pas idéal)
         2. Avertir l'utilisateur de cette limitation
 
+        La correspondance vMix des autres événements ne change pas : leur
+        numéro vMix reste valide après la suppression.
+
         Args:
-            event_index (int): Index de l'événement à supprimer
+            event_ref: Identifiant stable de l'événement ou position dans la liste
 
         Returns:
             tuple: (bool, list, str) - (Succès, Liste des événements mise à jour, Message d'avertissement)
         """
         try:
-            # Vérifier que l'index est valide
-            if event_index < 0 or event_index >= len(self.events):
-                logger.error(f"Index d'événement invalide: {event_index}")
-                return False, self.events, "Index d'événement invalide"
-
-            # Supprimer l'événement de la liste locale
-            deleted_event = self.events.pop(event_index)
-
-            # Mettre à jour les indices des événements restants
-            for i, event in enumerate(self.events):
-                event['index'] = i
-
-            # Sauvegarder la liste mise à jour
-            self.save_events()
+            with self.events_lock:
+                # Vérifier que l'événement existe
+                event_index, _ = self.find_event(event_ref)
+                if event_index is None:
+                    logger.error(f"Événement introuvable: {event_ref}")
+                    return False, self.events, "Index d'événement invalide"
+
+                # Supprimer l'événement de la liste locale
+                deleted_event = self.events.pop(event_index)
+
+                # Mettre à jour les indices des événements restants
+                for i, event in enumerate(self.events):
+                    event['index'] = i
+                self.index.rebuild(self.events)
+
+                # Sauvegarder la liste mise à jour
+                self.save_events()
 
             logger.info(f"Événement supprimé de la liste locale: {deleted_event.get('name', f'Événement {event_index + 1}')}")
 
@@ -0,0 +1,358 @@
+#fonctionnalités à implémenter :
+# -import en flux (ligne par ligne) des fichiers CSV de joueurs, une ou plusieurs équipes par fichier
+# -correspondance des colonnes (alias, mapping personnalisé, colonnes supplémentaires)
+# -validation par lots avec rapport d'erreurs par ligne, -enregistrement en une seule transaction
+
+import io
+import re
+import csv
+import time
+import uuid
+import logging
+import unicodedata
+from datetime import date
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('roster_importer')
+
+# Ordre des colonnes utilisé pour les fichiers sans en-tête
+DEFAULT_COLUMNS = ('numero', 'nom', 'prenom', 'position', 'taille', 'date_naissance')
+
+# Noms de colonnes reconnus (après normalisation) pour chaque champ
+COLUMN_ALIASES = {
+    'team': ('equipe', 'team', 'club', 'team_name', 'nom_equipe'),
+    'numero': ('numero', 'number', 'num', 'no', 'n', '#', 'maillot'),
+    'nom': ('nom', 'last_name', 'lastname', 'surname'),
+    'prenom': ('prenom', 'first_name', 'firstname'),
+    'position': ('position', 'poste'),
+    'taille': ('taille', 'height'),
+    'date_naissance': ('date_naissance', 'date_de_naissance', 'naissance', 'birthdate', 'birth_date', 'dob')
+}
+
+# Formats de date acceptés pour la date de naissance (AAAA-MM-JJ ou JJ/MM/AAAA, JJ.MM.AAAA, JJ-MM-AAAA)
+ISO_DATE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+LOCAL_DATE = re.compile(r'^(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})$')
+
+
+class RosterImportError(Exception):
+    """Erreur bloquante lors de l'import (fichier illisible, colonne d'équipe absente...)"""
+
+
+def normalize_header(name):
+    """
+    Normalise un nom de colonne (minuscules, sans accents ni espaces superflus)
+
+    Args:
+        name: Nom de colonne tel qu'il apparaît dans le fichier
+
+    Returns:
+        str: Nom normalisé
+    """
+    name = unicodedata.normalize('NFKD', (name or '').strip().lower())
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return '_'.join(name.replace('-', ' ').split())
+
+
+class RosterImporter:
+    """
+    Import en flux de fichiers CSV de joueurs.
+
+    Le fichier est lu ligne par ligne (jamais chargé entier en mémoire), les
+    lignes sont regroupées par équipe grâce à une colonne d'équipe, validées
+    par lots, puis toutes les équipes sont enregistrées en une seule
+    transaction du dépôt.
+    """
+
+    def __init__(self, repository=None, column_map=None, default_team=None,
+                 batch_size=1000, max_errors=200, encoding='utf-8-sig'):
+        """
+        Initialise l'importateur
+
+        Args:
+            repository: Dépôt des équipes (TeamRepository ou SqliteTeamRepository)
+            column_map (dict): Correspondance {colonne du fichier: champ} prioritaire sur les alias
+            default_team: Nom d'équipe utilisé si le fichier n'a pas de colonne d'équipe
+            batch_size: Nombre de lignes validées par lot
+            max_errors: Nombre maximal d'erreurs détaillées dans le rapport
+            encoding: Encodage du fichier
+        """
+        self.repository = repository
+        self.column_map = {normalize_header(key): value for key, value in (column_map or {}).items()}
+        self.default_team = default_team
+        self.batch_size = max(1, int(batch_size))
+        self.max_errors = max_errors
+        self.encoding = encoding
+
+    def import_file(self, csv_file, mode='replace', skip_invalid=True, dry_run=False):
+        """
+        Importe un fichier CSV contenant les joueurs d'une ou plusieurs équipes
+
+        Args:
+            csv_file: Fichier uploadé (FileStorage), flux binaire ou texte
+            mode: 'replace' remplace l'effectif des équipes existantes,
+                  'merge' met à jour les joueurs par numéro et ajoute les nouveaux
+            skip_invalid: Ignorer les lignes invalides (sinon rien n'est enregistré en cas d'erreur)
+            dry_run: Valider le fichier sans rien enregistrer
+
+        Returns:
+            dict: Rapport d'import (équipes créées/mises à jour, joueurs, erreurs par ligne)
+        """
+        if mode not in ('replace', 'merge'):
+            raise RosterImportError(f"Mode d'import inconnu: {mode}")
+
+        start = time.perf_counter()
+        report = {
+            'rows': 0,
+            'valid': 0,
+            'players': 0,
+            'teamsCreated': 0,
+            'teamsUpdated': 0,
+            'errorCount': 0,
+            'errors': [],
+            'committed': False,
+            'dryRun': bool(dry_run)
+        }
+
+        grouped = {}
+        for batch in self._batches(csv_file):
+            self._validate_batch(batch, grouped, report)
+
+        teams = self._build_teams(grouped, mode, report)
+
+        if dry_run or (report['errorCount'] and not skip_invalid):
+            logger.info(f"Import non enregistré: {report['valid']} lignes valides, {report['errorCount']} erreurs")
+        elif teams:
+            if self.repository is None or not self.repository.upsert_many(teams):
+                raise RosterImportError("Erreur lors de l'enregistrement des équipes importées")
+            report['committed'] = True
+
+        report['duration'] = round(time.perf_counter() - start, 3)
+        logger.info(f"Import terminé: {report['rows']} lignes, {len(teams)} équipes, "
+                    f"{report['errorCount']} erreurs en {report['duration']}s")
+        return report
+
+    def read_players(self, csv_file):
+        """
+        Lit les joueurs d'une seule équipe (sans colonne d'équipe obligatoire)
+
+        Import historique de la page d'équipe : les valeurs sont conservées telles
+        quelles (taille '1m90', date '12/05/1997'...), seules les lignes sans
+        numéro, nom ni prénom sont ignorées.
+
+        Args:
+            csv_file: Fichier uploadé (FileStorage), flux binaire ou texte
+
+        Returns:
+            list: Liste des joueurs, dans l'ordre du fichier
+        """
+        players = []
+        for batch in self._batches(csv_file, require_team=False):
+            for line, row in batch:
+                player = {key: value for key, value in row.items() if value != '' and key != 'team'}
+                if player.get('numero') or player.get('nom') or player.get('prenom'):
+                    players.append(player)
+        return players
+
+    def _open_text(self, csv_file):
+        """Retourne un flux texte lu au fil de l'eau à partir du fichier fourni"""
+        stream = getattr(csv_file, 'stream', csv_file)
+        if isinstance(stream, io.TextIOBase):
+            return stream
+        if not hasattr(stream, 'readable'):
+            stream = io.BytesIO(stream.read())
+        return io.TextIOWrapper(stream, encoding=self.encoding, newline='')
+
+    def _batches(self, csv_file, require_team=True):
+        """Génère des lots [(numéro de ligne, {champ: valeur})] en lisant le fichier en flux"""
+        text = self._open_text(csv_file)
+        try:
+            first_line = text.readline()
+            if not first_line:
+                return
+
+            try:
+                dialect = csv.Sniffer().sniff(first_line, delimiters=',;\t|')
+            except csv.Error:
+                dialect = csv.excel
+
+            header = next(csv.reader([first_line], dialect))
+            fields = self._map_columns(header)
+
+            rows = csv.reader(text, dialect)
+            line = 1
+            if fields is None:
+                # Fichier sans en-tête : ordre des colonnes par défaut, la première ligne est un joueur
+                fields = list(DEFAULT_COLUMNS)
+                rows = self._chain([header], rows)
+                line = 0
+
+            if require_team and 'team' not in fields and not self.default_team:
+                raise RosterImportError("Colonne d'équipe introuvable (utilisez column_map ou default_team)")
+
+            batch = []
+            for values in rows:
+                line += 1
+                if not any(value.strip() for value in values):
+                    continue
+                row = {}
+                for field, value in zip(fields, values):
+                    if field:
+                        row[field] = value.strip()
+                batch.append((line, row))
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        except UnicodeDecodeError as e:
+            raise RosterImportError(f"Encodage du fichier invalide: {e}")
+        finally:
+            if isinstance(text, io.TextIOWrapper):
+                # Ne pas fermer le flux de l'upload avec le wrapper
+                text.detach()
+
+    def _chain(self, first_rows, rows):
+        """Enchaîne des lignes déjà lues avec le reste du lecteur CSV"""
+        yield from first_rows
+        yield from rows
+
+    def _map_columns(self, header):
+        """
+        Associe chaque colonne de l'en-tête à un champ
+
+        Returns:
+            list: Champ de chaque colonne (colonnes supplémentaires conservées sous leur nom),
+                  ou None si l'en-tête ne contient aucune colonne connue
+        """
+        aliases = {alias: field for field, names in COLUMN_ALIASES.items() for alias in names}
+        fields = []
+        known = 0
+        for name in header:
+            key = normalize_header(name)
+            if key in self.column_map:
+                # Une correspondance vide ignore la colonne
+                field = self.column_map[key] or None
+            elif key in aliases:
+                field = aliases[key]
+            else:
+                field = key or None
+                fields.append(field)
+                continue
+            known += 1
+            fields.append(field)
+        return fields if known else None
+
+    def _validate_batch(self, batch, grouped, report):
+        """Valide un lot de lignes et les range par équipe"""
+        for line, row in batch:
+            report['rows'] += 1
+            team_name = row.pop('team', '') or self.default_team or ''
+            player, errors = self._validate_player(row)
+
+            if not team_name:
+                errors.append("nom d'équipe manquant")
+
+            if not errors:
+                team = grouped.setdefault(team_name, {'players': [], 'numbers': {}})
+                numero = player.get('numero')
+                if numero is not None and numero in team['numbers']:
+                    errors.append(f"numéro {numero} déjà utilisé ligne {team['numbers'][numero]}")
+                else:
+                    if numero is not None:
+                        team['numbers'][numero] = line
+                    team['players'].append(player)
+                    report['valid'] += 1
+                    continue
+
+            report['errorCount'] += 1
+            if len(report['errors']) < self.max_errors:
+                report['errors'].append({'line': line, 'team': team_name, 'errors': errors})
+
+    def _validate_player(self, row):
+        """
+        Valide et normalise les champs d'un joueur
+
+        Returns:
+            tuple: (joueur, liste des erreurs)
+        """
+        player = {key: value for key, value in row.items() if value != '' and key != 'team'}
+        errors = []
+
+        if not player.get('nom') and not player.get('prenom'):
+            errors.append('nom ou prénom requis')
+
+        if 'numero' in player:
+            try:
+                numero = int(player['numero'])
+                if not 0 <= numero <= 99:
+                    raise ValueError
+                player['numero'] = str(numero)
+            except ValueError:
+                errors.append(f"numéro invalide: {player['numero']}")
+
+        if 'taille' in player:
+            try:
+                float(player['taille'].replace(',', '.'))
+            except ValueError:
+                errors.append(f"taille invalide: {player['taille']}")
+
+        # Date vérifiée mais conservée dans son format d'origine (comme dans teams.json)
+        if 'date_naissance' in player:
+            if not self._parse_date(player['date_naissance']):
+                errors.append(f"date de naissance invalide: {player['date_naissance']}")
+
+        return player, errors
+
+    def _parse_date(self, value):
+        """Convertit une date (AAAA-MM-JJ ou JJ/MM/AAAA) au format AAAA-MM-JJ (None si invalide)"""
+        match = ISO_DATE.match(value)
+        if match:
+            year, month, day = match.groups()
+        else:
+            match = LOCAL_DATE.match(value)
+            if not match:
+                return None
+            day, month, year = match.groups()
+
+        try:
+            return date(int(year), int(month), int(day)).isoformat()
+        except ValueError:
+            return None
+
+    def _build_teams(self, grouped, mode, report):
+        """Construit les équipes à enregistrer en réutilisant les équipes existantes (même nom)"""
+        existing = {}
+        if self.repository is not None:
+            for team in self.repository.all():
+                existing.setdefault(normalize_header(team.get('name')), team)
+
+        teams = []
+        for name, data in grouped.items():
+            current = existing.get(normalize_header(name))
+            if current is None:
+                team = {'id': str(uuid.uuid4()), 'name': name, 'logo': None, 'players': data['players']}
+                report['teamsCreated'] += 1
+            else:
+                team = dict(current)
+                if mode == 'merge':
+                    team['players'] = self._merge_players(current.get('players', []), data['players'])
+                else:
+                    team['players'] = data['players']
+                report['teamsUpdated'] += 1
+
+            report['players'] += len(data['players'])
+            teams.append(team)
+        return teams
+
+    def _merge_players(self, current, imported):
+        """Met à jour les joueurs existants par numéro et ajoute les nouveaux"""
+        players = [dict(player) for player in current]
+        by_number = {str(player.get('numero')): player for player in players if player.get('numero') not in (None, '')}
+        for player in imported:
+            target = by_number.get(player.get('numero'))
+            if target is not None:
+                target.update(player)
+            else:
+                players.append(player)
+        return players
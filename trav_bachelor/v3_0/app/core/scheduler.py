@@ -0,0 +1,192 @@
+#fonctionnalités à implémenter :
+# -planification centralisée des actions graphiques différées (timeout, sponsors, lower-thirds, replays)
+# -annulation, reprogrammation et inspection des tâches en attente
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('scheduler')
+
+
+class Scheduler:
+    """
+    Planificateur unique pour toutes les actions différées de l'application.
+
+    Les tâches sont rangées dans un tas (heap) trié par échéance et exécutées
+    par un seul thread. Chaque tâche est identifiée par une clé : programmer
+    une clé déjà existante remplace la tâche précédente, ce qui évite qu'un
+    masquage obsolète s'exécute après un nouvel affichage.
+    """
+
+    def __init__(self):
+        """Initialise le planificateur (le thread est démarré à la première tâche)"""
+        self._heap = []
+        self._jobs = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, key, delay, callback, *args, **kwargs):
+        """
+        Programme une action après un délai
+
+        Args:
+            key (str): Identifiant de la tâche (remplace une tâche existante de même clé)
+            delay (float): Délai en secondes avant l'exécution
+            callback: Fonction à appeler
+            *args, **kwargs: Arguments passés à la fonction
+
+        Returns:
+            str: Clé de la tâche programmée
+        """
+        with self._condition:
+            self._cancel_locked(key)
+            job = {
+                'key': key,
+                'due': time.monotonic() + max(0.0, float(delay)),
+                'delay': float(delay),
+                'scheduled_at': time.time(),
+                'callback': callback,
+                'args': args,
+                'kwargs': kwargs,
+                'cancelled': False
+            }
+            self._jobs[key] = job
+            heapq.heappush(self._heap, (job['due'], next(self._sequence), job))
+            self._ensure_thread()
+            self._condition.notify()
+
+        logger.info(f"Tâche '{key}' programmée dans {delay}s")
+        return key
+
+    def cancel(self, key):
+        """
+        Annule une tâche programmée
+
+        Args:
+            key (str): Identifiant de la tâche
+
+        Returns:
+            bool: True si une tâche a été annulée, False si elle n'existait pas
+        """
+        with self._condition:
+            cancelled = self._cancel_locked(key)
+            self._condition.notify()
+
+        if cancelled:
+            logger.info(f"Tâche '{key}' annulée")
+        return cancelled
+
+    def cancel_prefix(self, prefix):
+        """
+        Annule toutes les tâches dont la clé commence par un préfixe
+
+        Args:
+            prefix (str): Préfixe des clés à annuler
+
+        Returns:
+            int: Nombre de tâches annulées
+        """
+        with self._condition:
+            keys = [key for key in self._jobs if key.startswith(prefix)]
+            for key in keys:
+                self._cancel_locked(key)
+            self._condition.notify()
+        return len(keys)
+
+    def reschedule(self, key, delay):
+        """
+        Reprogramme une tâche existante avec un nouveau délai
+
+        Args:
+            key (str): Identifiant de la tâche
+            delay (float): Nouveau délai en secondes à partir de maintenant
+
+        Returns:
+            bool: True si la tâche a été reprogrammée, False si elle n'existait pas
+        """
+        with self._condition:
+            job = self._jobs.get(key)
+            if job is None:
+                return False
+            callback, args, kwargs = job['callback'], job['args'], job['kwargs']
+
+        self.schedule(key, delay, callback, *args, **kwargs)
+        return True
+
+    def is_scheduled(self, key):
+        """Indique si une tâche est en attente pour cette clé"""
+        with self._condition:
+            return key in self._jobs
+
+    def list_jobs(self):
+        """
+        Liste les tâches en attente, de la plus proche à la plus lointaine
+
+        Returns:
+            list: Liste de dictionnaires décrivant chaque tâche
+        """
+        now = time.monotonic()
+        with self._condition:
+            jobs = sorted(self._jobs.values(), key=lambda job: job['due'])
+            return [{
+                'key': job['key'],
+                'delay': job['delay'],
+                'remaining': round(max(0.0, job['due'] - now), 3),
+                'scheduledAt': job['scheduled_at'],
+                'action': getattr(job['callback'], '__qualname__', repr(job['callback']))
+            } for job in jobs]
+
+    def _cancel_locked(self, key):
+        """Marque une tâche comme annulée (le verrou doit être détenu)"""
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return False
+        # Suppression paresseuse : l'entrée reste dans le tas mais sera ignorée
+        job['cancelled'] = True
+        return True
+
+    def _ensure_thread(self):
+        """Démarre le thread d'exécution s'il n'est pas actif (le verrou doit être détenu)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+            self._thread.start()
+
+    def _next_due_job(self):
+        """Attend et retire la prochaine tâche arrivée à échéance"""
+        with self._condition:
+            while True:
+                while self._heap and self._heap[0][2]['cancelled']:
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                due = self._heap[0][0]
+                now = time.monotonic()
+                if due <= now:
+                    job = heapq.heappop(self._heap)[2]
+                    if self._jobs.get(job['key']) is job:
+                        del self._jobs[job['key']]
+                    return job
+
+                self._condition.wait(due - now)
+
+    def _run(self):
+        """Boucle du thread unique d'exécution des tâches"""
+        while True:
+            job = self._next_due_job()
+            try:
+                job['callback'](*job['args'], **job['kwargs'])
+            except Exception as e:
+                logger.error(f"Erreur lors de l'exécution de la tâche '{job['key']}': {e}")
+
+
+# Instance partagée par tous les gestionnaires
+scheduler = Scheduler()
@@ -0,0 +1,209 @@
+#fonctionnalités à implémenter :
+# -suivi du score du match côté serveur, -détection des événements de match (point, set, match)
+# -diffusion des événements aux abonnés (replays automatiques, etc.) hors du thread de requête
+
+import queue
+import logging
+import threading
+from datetime import datetime
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('score_manager')
+
+
+class ScoreManager:
+    """
+    Gestionnaire du score du match.
+
+    Compare chaque nouveau score au précédent pour en déduire les événements
+    de match (point, set, match), puis les transmet aux abonnés depuis un
+    thread dédié afin de ne jamais retarder la mise à jour du score dans vMix.
+    """
+
+    def __init__(self, sets_to_win=3):
+        """
+        Initialise le gestionnaire de score
+
+        Args:
+            sets_to_win: Nombre de sets nécessaires pour gagner le match
+        """
+        self.sets_to_win = sets_to_win
+
+        # État actuel du score
+        self.state = {
+            'teamA': {'name': 'Équipe A', 'score': 0, 'sets': 0},
+            'teamB': {'name': 'Équipe B', 'score': 0, 'sets': 0}
+        }
+
+        # Historique des événements de match détectés
+        self.history = []
+
+        # Version de l'état, incrémentée à chaque changement du score
+        self.version = 0
+
+        # Abonnés et file de diffusion des événements
+        self._listeners = []
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add_listener(self, callback):
+        """
+        Abonne une fonction aux événements de match
+
+        Args:
+            callback: Fonction appelée avec le dictionnaire de l'événement
+        """
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Désabonne une fonction des événements de match"""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def get_state(self):
+        """
+        Récupère l'état actuel du score
+
+        Returns:
+            dict: Copie de l'état du score
+        """
+        with self._lock:
+            return {team: dict(data) for team, data in self.state.items()}
+
+    def current_set(self):
+        """Retourne le numéro du set en cours"""
+        with self._lock:
+            return self.state['teamA']['sets'] + self.state['teamB']['sets'] + 1
+
+    def update(self, team_a, team_b):
+        """
+        Met à jour le score et détecte les événements de match
+
+        Args:
+            team_a (dict): {"name": ..., "score": ..., "sets": ...} pour l'équipe A
+            team_b (dict): {"name": ..., "score": ..., "sets": ...} pour l'équipe B
+
+        Returns:
+            list: Événements détectés (déjà mis en file pour les abonnés)
+        """
+        current = {
+            'teamA': self._normalize(team_a, 'Équipe A'),
+            'teamB': self._normalize(team_b, 'Équipe B')
+        }
+
+        with self._lock:
+            previous = self.state
+            self.state = current
+            changed = current != previous
+            if changed:
+                self.version += 1
+            events = self._detect_events(previous, current)
+            self.history.extend(events)
+
+        if changed:
+            event_bus.publish_match('score_updated', self.get_state())
+
+        for event in events:
+            logger.info(f"Événement de match détecté: {event['name']}")
+            self._queue.put(event)
+            if event['type'] != 'point':
+                event_bus.publish_match('event_notification', {'message': event['name'], 'type': 'info'})
+
+        if events:
+            self._ensure_thread()
+
+        return events
+
+    def reset(self):
+        """Réinitialise le score et l'historique pour un nouveau match"""
+        with self._lock:
+            for data in self.state.values():
+                data['score'] = 0
+                data['sets'] = 0
+            self.history = []
+            self.version += 1
+        event_bus.publish_match('score_updated', self.get_state())
+
+    def _normalize(self, team, default_name):
+        """Convertit les données d'équipe reçues en valeurs entières"""
+        def to_int(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return 0
+
+        return {
+            'name': team.get('name') or default_name,
+            'score': to_int(team.get('score', 0)),
+            'sets': to_int(team.get('sets', 0))
+        }
+
+    def _detect_events(self, previous, current):
+        """
+        Déduit les événements de match à partir de deux états successifs.
+
+        Seules les progressions d'une unité sont considérées comme des
+        événements : une correction ou une remise à zéro n'en produit pas.
+        """
+        events = []
+        timestamp = datetime.now().isoformat()
+        sets_played = previous['teamA']['sets'] + previous['teamB']['sets']
+
+        for key, team in (('teamA', 'A'), ('teamB', 'B')):
+            before, after = previous[key], current[key]
+
+            if after['sets'] == before['sets'] + 1:
+                score = f"{current['teamA']['sets']}-{current['teamB']['sets']}"
+                events.append(self._make_event('set', team, after['name'], sets_played + 1, current, timestamp,
+                                               f"Set {after['name']} ({score})"))
+                if after['sets'] >= self.sets_to_win:
+                    events.append(self._make_event('match', team, after['name'], sets_played + 1, current, timestamp,
+                                                   f"Victoire {after['name']} ({score})"))
+            elif after['sets'] == before['sets'] and after['score'] == before['score'] + 1:
+                score = f"{current['teamA']['score']}-{current['teamB']['score']}"
+                events.append(self._make_event('point', team, after['name'], sets_played + 1, current, timestamp,
+                                               f"Point {after['name']} {score}"))
+
+        return events
+
+    def _make_event(self, event_type, team, team_name, set_number, state, timestamp, name):
+        """Construit le dictionnaire d'un événement de match"""
+        return {
+            'type': event_type,
+            'name': name,
+            'team': team,
+            'teamName': team_name,
+            'set': set_number,
+            'score': {key: dict(data) for key, data in state.items()},
+            'timestamp': timestamp
+        }
+
+    def _ensure_thread(self):
+        """Démarre le thread de diffusion s'il n'est pas actif"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._dispatch, name='score-events', daemon=True)
+                self._thread.start()
+
+    def _dispatch(self):
+        """Boucle de diffusion des événements aux abonnés"""
+        while True:
+            event = self._queue.get()
+            with self._lock:
+                listeners = list(self._listeners)
+
+            for listener in listeners:
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.error(f"Erreur dans un abonné aux événements de match: {e}")
+
+
+# Instance partagée par les API de score et de replay
+score_manager = ScoreManager()
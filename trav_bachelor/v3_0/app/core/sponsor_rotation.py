@@ -0,0 +1,373 @@
+#fonctionnalités à implémenter :
+# -rotation des sponsors par créneaux pondérés, temps d'antenne minimal garanti par sponsor
+# -interruption pendant les échanges et les replays, -logos préparés dans deux titres (A/B)
+# -journal du temps d'antenne par sponsor et par match, -rapport exportable (JSON, CSV)
+
+import io
+import csv
+import time
+import logging
+import threading
+from datetime import datetime
+from .persistence import JsonStore
+from .scheduler import scheduler
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('sponsor_rotation')
+
+# Clé de la tâche périodique du planificateur
+TICK_KEY = 'overlay:sponsor:tick'
+
+# Motifs d'interruption de la rotation
+BLACKOUTS = ('rally', 'replay', 'manual')
+
+
+class SponsorRotation:
+    """
+    Rotation des sponsors.
+
+    Un sponsor occupe un créneau de `interval` secondes. Le suivant est choisi
+    d'abord parmi les sponsors qui n'ont pas encore atteint leur temps
+    d'antenne minimal (le plus en retard en proportion), sinon celui dont le
+    temps d'antenne rapporté à son poids est le plus faible.
+
+    Deux titres vMix servent de tampons : pendant qu'un sponsor est à
+    l'antenne dans l'un, le suivant est écrit dans l'autre, hors antenne.
+    Un changement de sponsor est donc un seul changement d'overlay.
+
+    La rotation est interrompue (overlay retiré, temps d'antenne arrêté)
+    pendant un échange (signalé par l'opérateur, terminé par le point
+    suivant), quand l'input Replay est au program, ou manuellement ; le
+    sponsor interrompu reprend ensuite la fin de son créneau. Chaque
+    passage à l'antenne est journalisé par match.
+    """
+
+    def __init__(self, overlay_manager, log_file, scheduler=scheduler, tick=1.0, bus=None):
+        """
+        Initialise la rotation
+
+        Args:
+            overlay_manager: Gestionnaire d'overlays (canaux, titres vMix)
+            log_file: Fichier JSON du journal du temps d'antenne
+            scheduler: Planificateur partagé
+            tick: Période de contrôle de la rotation (secondes)
+            bus: Bus d'événements (par défaut le bus partagé)
+        """
+        self.overlay_manager = overlay_manager
+        self.vmix = overlay_manager.vmix
+        self.scheduler = scheduler
+        self.tick = tick
+        self.bus = bus or event_bus
+        self.store = JsonStore.for_file(log_file, ensure_ascii=False)
+        self.log = self.store.load({}) or {}
+
+        self.sponsors = []
+        self.interval = 30
+        self.inputs = []
+        self.channel = None
+        self.active = False
+        self.blackouts = set()
+
+        # Contenu des titres tampons {input: nom du sponsor}
+        self.buffers = {}
+        # Sponsor à l'antenne {'name', 'input', 'slotStart', 'segmentStart'} et sponsor préparé
+        self.on_air = None
+        self.next_sponsor = None
+        self.resume = None
+        self._last_tick = None
+        self._lock = threading.RLock()
+
+    def start(self, sponsors, interval=30, inputs=None):
+        """
+        Démarre (ou reconfigure) la rotation
+
+        Args:
+            sponsors (list): [{'name', 'logo', 'weight' (1 par défaut), 'minAirtime' (secondes par match)}]
+            interval (int): Durée d'un créneau (secondes)
+            inputs (list): Titres vMix servant de tampons A/B (par défaut le titre sponsor détecté)
+
+        Returns:
+            bool: True si la rotation a démarré
+        """
+        config = self.overlay_manager.config.get("overlays", {}).get("sponsor", {})
+        inputs = [str(value) for value in (inputs or [self.overlay_manager.get_input_id("sponsor")]) if value]
+        sponsors = [{'name': str(sponsor['name']), 'logo': sponsor.get('logo'),
+                     'weight': max(0.01, float(sponsor.get('weight', 1))),
+                     'minAirtime': max(0.0, float(sponsor.get('minAirtime', 0)))}
+                    for sponsor in sponsors or [] if sponsor.get('name')]
+        if not sponsors or not inputs:
+            logger.error("Rotation des sponsors impossible: aucun sponsor ou aucun titre sponsor")
+            return False
+        if len(inputs) < 2:
+            logger.warning("Un seul titre sponsor : les logos seront changés à l'antenne")
+
+        with self._lock:
+            self.sponsors = sponsors
+            self.interval = max(1.0, float(interval))
+            if inputs != self.inputs:
+                self.buffers = {}
+            self.inputs = inputs[:2]
+            self.channel = int(config.get("overlay_number", 4))
+            self.next_sponsor = None
+            self.active = True
+            self._last_tick = time.monotonic()
+
+        logger.info(f"Rotation des sponsors: {len(sponsors)} sponsors, créneaux de {self.interval:g}s")
+        self.scheduler.schedule(TICK_KEY, 0, self._tick)
+        return True
+
+    def stop(self):
+        """
+        Arrête la rotation et retire le sponsor de l'antenne
+
+        Returns:
+            bool: True si une rotation était active
+        """
+        with self._lock:
+            was_active = self.active
+            self.active = False
+            self.scheduler.cancel(TICK_KEY)
+            self._take_off(time.monotonic())
+            self.resume = None
+        self._publish()
+        return was_active
+
+    def set_blackout(self, reason, active=True):
+        """
+        Active ou lève un motif d'interruption
+
+        Args:
+            reason (str): 'rally', 'replay' ou 'manual'
+            active (bool): True pour interrompre
+        """
+        if reason not in BLACKOUTS:
+            raise ValueError(f"Motif d'interruption inconnu: {reason}")
+        with self._lock:
+            if active:
+                self.blackouts.add(reason)
+            else:
+                self.blackouts.discard(reason)
+        if self.active:
+            # Appliqué immédiatement, sans attendre le prochain contrôle
+            self.scheduler.schedule(TICK_KEY, 0, self._tick)
+
+    def on_match_event(self, event):
+        """Abonné aux événements de score : un point termine l'échange en cours"""
+        if event.get('type') in ('point', 'set', 'match') and 'rally' in self.blackouts:
+            self.set_blackout('rally', False)
+
+    def choose_next(self, exclude=None):
+        """
+        Choisit le sponsor du prochain créneau
+
+        Args:
+            exclude: Sponsor à éviter (celui à l'antenne), sauf s'il est le seul
+
+        Returns:
+            dict: Sponsor choisi
+        """
+        airtime = self._match_log()['airtime']
+        candidates = [sponsor for sponsor in self.sponsors if sponsor['name'] != exclude] or self.sponsors
+
+        # Sponsors en dessous de leur minimum contractuel : le plus en retard en proportion
+        behind = [sponsor for sponsor in candidates
+                  if sponsor['minAirtime'] and airtime.get(sponsor['name'], 0) < sponsor['minAirtime']]
+        if behind:
+            return max(behind, key=lambda sponsor: 1 - airtime.get(sponsor['name'], 0) / sponsor['minAirtime'])
+
+        # Sinon partage pondéré : le temps d'antenne par unité de poids le plus faible
+        return min(candidates, key=lambda sponsor: airtime.get(sponsor['name'], 0) / sponsor['weight'])
+
+    def status(self):
+        """État de la rotation"""
+        with self._lock:
+            on_air = dict(self.on_air) if self.on_air else None
+            if on_air:
+                on_air['remaining'] = round(max(0.0, self.interval - (time.monotonic() - on_air.pop('slotStart'))), 1)
+                on_air.pop('segmentStart', None)
+            return {
+                'active': self.active,
+                'interval': self.interval,
+                'inputs': list(self.inputs),
+                'channel': self.channel,
+                'blackouts': sorted(self.blackouts),
+                'onAir': on_air,
+                'next': self.next_sponsor,
+                'buffers': dict(self.buffers),
+                'sponsors': list(self.sponsors)
+            }
+
+    def report(self, match_id=None):
+        """
+        Rapport du temps d'antenne d'un match
+
+        Args:
+            match_id: Match (par défaut le match en cours)
+
+        Returns:
+            dict: {'match', 'total', 'sponsors': [...], 'segments': [...]}
+        """
+        match_id = match_id or event_bus.match_id
+        with self._lock:
+            entry = self.log.get(match_id, {'airtime': {}, 'slots': {}, 'segments': []})
+            total = sum(entry['airtime'].values())
+            configured = {sponsor['name']: sponsor for sponsor in self.sponsors}
+            rows = []
+            for name in sorted(set(configured) | set(entry['airtime'])):
+                sponsor = configured.get(name, {})
+                airtime = round(entry['airtime'].get(name, 0.0), 1)
+                minimum = sponsor.get('minAirtime', 0.0)
+                rows.append({
+                    'sponsor': name,
+                    'weight': sponsor.get('weight'),
+                    'airtime': airtime,
+                    'minAirtime': minimum,
+                    'fulfilled': airtime >= minimum,
+                    'share': round(100 * airtime / total, 1) if total else 0.0,
+                    'slots': entry['slots'].get(name, 0)
+                })
+            return {'match': match_id, 'total': round(total, 1), 'sponsors': rows,
+                    'segments': list(entry['segments'])}
+
+    def report_csv(self, match_id=None):
+        """Rapport du temps d'antenne au format CSV (une ligne par sponsor)"""
+        report = self.report(match_id)
+        output = io.StringIO()
+        writer = csv.writer(output, delimiter=';')
+        writer.writerow(['match', 'sponsor', 'poids', 'temps_antenne_s', 'minimum_s', 'minimum_atteint',
+                         'part_pct', 'creneaux'])
+        for row in report['sponsors']:
+            writer.writerow([report['match'], row['sponsor'], row['weight'] or '', row['airtime'], row['minAirtime'],
+                             'oui' if row['fulfilled'] else 'non', row['share'], row['slots']])
+        return output.getvalue()
+
+    def _match_log(self):
+        """Journal du match en cours"""
+        return self.log.setdefault(event_bus.match_id, {'airtime': {}, 'slots': {}, 'segments': []})
+
+    def _replay_on_program(self):
+        """Indique si l'input Replay est au program (lecture de l'instantané partagé)"""
+        snapshot = self.vmix.get_snapshot(max_age=self.tick)
+        replay = snapshot.get('replay')
+        return bool(snapshot['connected'] and replay and snapshot['active'] == replay['input'])
+
+    def _stage(self, sponsor, avoid=None):
+        """
+        Écrit un sponsor dans un titre tampon hors antenne
+
+        Args:
+            sponsor (dict): Sponsor à préparer
+            avoid: Input à ne pas modifier (à l'antenne)
+
+        Returns:
+            str: Input contenant le sponsor, None en cas d'échec
+        """
+        for value, name in self.buffers.items():
+            if name == sponsor['name']:
+                return value
+        free = [value for value in self.inputs if value != avoid] or self.inputs
+        target = free[0]
+        result = self.vmix.update_title_multiple(target, {"SponsorName": sponsor['name']})
+        if result and sponsor.get('logo'):
+            result = self.vmix.set_image(target, "SponsorLogo", sponsor['logo'])
+        if not result:
+            self.buffers.pop(target, None)
+            return None
+        self.buffers[target] = sponsor['name']
+        return target
+
+    def _put_on_air(self, sponsor, now, slot_start=None):
+        """Affiche un sponsor (un seul changement d'overlay s'il était préparé)"""
+        current = self.on_air['input'] if self.on_air else None
+        target = self._stage(sponsor, avoid=current)
+        if target is None or not self.overlay_manager.channels.apply({self.channel: target}):
+            logger.error(f"Échec de l'affichage du sponsor {sponsor['name']}")
+            return False
+
+        if self.on_air:
+            self._close_segment(now)
+        self.on_air = {'name': sponsor['name'], 'input': target,
+                       'slotStart': now if slot_start is None else slot_start, 'segmentStart': datetime.now().isoformat()}
+        if slot_start is None:
+            log = self._match_log()
+            log['slots'][sponsor['name']] = log['slots'].get(sponsor['name'], 0) + 1
+
+        # Préparation immédiate du sponsor suivant dans l'autre tampon
+        following = self.choose_next(exclude=sponsor['name'])
+        self.next_sponsor = following['name']
+        if len(self.inputs) > 1:
+            self._stage(following, avoid=target)
+        return True
+
+    def _take_off(self, now):
+        """Retire le sponsor de l'antenne et clôt son passage"""
+        if not self.on_air:
+            return
+        self.overlay_manager.channels.apply({self.channel: None})
+        self._close_segment(now)
+        self.on_air = None
+
+    def _close_segment(self, now):
+        """Journalise le passage à l'antenne en cours"""
+        log = self._match_log()
+        log['segments'].append({'sponsor': self.on_air['name'], 'start': self.on_air['segmentStart'],
+                                'end': datetime.now().isoformat()})
+        self.store.save(self.log)
+
+    def _tick(self):
+        """Contrôle périodique : temps d'antenne, interruptions, changement de créneau"""
+        with self._lock:
+            if not self.active:
+                return
+            now = time.monotonic()
+            elapsed = min(now - (self._last_tick or now), self.tick * 2)
+            self._last_tick = now
+            changed = False
+
+            if self.on_air:
+                log = self._match_log()
+                log['airtime'][self.on_air['name']] = log['airtime'].get(self.on_air['name'], 0.0) + elapsed
+
+            try:
+                replay = self._replay_on_program()
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture de l'état du replay: {e}")
+                replay = False
+            if replay:
+                self.blackouts.add('replay')
+            else:
+                self.blackouts.discard('replay')
+
+            if self.blackouts:
+                if self.on_air:
+                    # Reprise après l'interruption : même sponsor, fin de son créneau
+                    self.resume = {'name': self.on_air['name'], 'remaining': self.interval - (now - self.on_air['slotStart'])}
+                    self._take_off(now)
+                    changed = True
+            elif not self.on_air:
+                sponsors = {sponsor['name']: sponsor for sponsor in self.sponsors}
+                resume, self.resume = self.resume, None
+                if resume and resume['name'] in sponsors and resume['remaining'] > 1:
+                    changed = self._put_on_air(sponsors[resume['name']], now,
+                                               slot_start=now - (self.interval - resume['remaining']))
+                else:
+                    nxt = sponsors.get(self.next_sponsor) or self.choose_next()
+                    changed = self._put_on_air(nxt, now)
+            elif now - self.on_air['slotStart'] >= self.interval:
+                sponsors = {sponsor['name']: sponsor for sponsor in self.sponsors}
+                nxt = sponsors.get(self.next_sponsor) or self.choose_next(exclude=self.on_air['name'])
+                if nxt['name'] == self.on_air['name']:
+                    # Sponsor unique : créneau prolongé, aucune commande
+                    self.on_air['slotStart'] = now
+                else:
+                    changed = self._put_on_air(nxt, now)
+
+            self.scheduler.schedule(TICK_KEY, self.tick, self._tick)
+        if changed:
+            self._publish()
+
+    def _publish(self):
+        """Publie l'état de la rotation aux clients de la régie"""
+        self.bus.publish('sponsor_rotation', self.status())
@@ -0,0 +1,387 @@
+#fonctionnalités à implémenter :
+# -stockage SQLite (WAL) des équipes, joueurs et du match actuel
+# -même interface que TeamRepository, -import des fichiers teams.json et current_match.json
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('sqlite_team_repository')
+
+# Champs des joueurs stockés dans des colonnes dédiées (les autres vont dans 'extra')
+PLAYER_COLUMNS = ('numero', 'nom', 'prenom', 'position', 'taille', 'date_naissance')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    logo TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_teams_name ON teams(name);
+
+CREATE TABLE IF NOT EXISTS players (
+    team_id TEXT NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    numero TEXT,
+    nom TEXT,
+    prenom TEXT,
+    position TEXT,
+    taille TEXT,
+    date_naissance TEXT,
+    extra TEXT,
+    PRIMARY KEY (team_id, rank)
+);
+CREATE INDEX IF NOT EXISTS idx_players_team_numero ON players(team_id, numero);
+
+CREATE TABLE IF NOT EXISTS current_match (
+    slot TEXT PRIMARY KEY,
+    team_id TEXT
+);
+"""
+
+
+class SqliteTeamRepository:
+    """
+    Dépôt des équipes stocké dans une base SQLite en mode WAL.
+
+    Expose la même interface que TeamRepository : une création, mise à jour
+    ou suppression ne réécrit que les lignes de l'équipe concernée au lieu
+    du fichier JSON complet.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_file(cls, db_file):
+        """
+        Retourne le dépôt partagé associé à une base de données
+
+        Args:
+            db_file: Chemin du fichier SQLite
+
+        Returns:
+            SqliteTeamRepository: Instance unique pour cette base
+        """
+        path = os.path.abspath(db_file)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def __init__(self, db_file):
+        """
+        Initialise le dépôt et crée le schéma si nécessaire
+
+        Args:
+            db_file: Chemin du fichier SQLite
+        """
+        self.db_file = db_file
+        self._lock = threading.RLock()
+
+        # Une seule connexion partagée, protégée par le verrou
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        # Version incrémentée à chaque écriture
+        self.version = 0
+
+    def all(self):
+        """
+        Récupère toutes les équipes
+
+        Returns:
+            list: Liste des équipes
+        """
+        with self._lock:
+            teams = [self._team_from_row(row) for row in self._conn.execute("SELECT * FROM teams ORDER BY rowid")]
+            players_by_team = {}
+            for row in self._conn.execute("SELECT * FROM players ORDER BY team_id, rank"):
+                players_by_team.setdefault(row['team_id'], []).append(self._player_from_row(row))
+
+        for team in teams:
+            team['players'] = players_by_team.get(team['id'], [])
+        return teams
+
+    def get(self, team_id):
+        """
+        Récupère une équipe par son ID
+
+        Args:
+            team_id: ID de l'équipe
+
+        Returns:
+            dict: Données de l'équipe ou None si non trouvée
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM teams WHERE id = ?", (team_id,)).fetchone()
+            if row is None:
+                return None
+            team = self._team_from_row(row)
+            team['players'] = self._load_players(team_id)
+            return team
+
+    def get_by_name(self, name):
+        """
+        Récupère une équipe par son nom
+
+        Args:
+            name: Nom de l'équipe
+
+        Returns:
+            dict: Données de l'équipe ou None si non trouvée
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM teams WHERE name = ?", (name,)).fetchone()
+        return self.get(row['id']) if row else None
+
+    def get_players(self, team_id):
+        """
+        Récupère les joueurs d'une équipe
+
+        Args:
+            team_id: ID de l'équipe
+
+        Returns:
+            list: Liste des joueurs ou None si équipe non trouvée
+        """
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM teams WHERE id = ?", (team_id,)).fetchone() is None:
+                return None
+            return self._load_players(team_id)
+
+    def get_player(self, team_id, numero):
+        """
+        Récupère un joueur par son numéro de maillot
+
+        Args:
+            team_id: ID de l'équipe
+            numero: Numéro de maillot
+
+        Returns:
+            dict: Données du joueur ou None si non trouvé
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM players WHERE team_id = ? AND numero = ? ORDER BY rank LIMIT 1",
+                (team_id, str(numero))
+            ).fetchone()
+        return self._player_from_row(row) if row else None
+
+    def add(self, team):
+        """
+        Ajoute une équipe et ses joueurs
+
+        Args:
+            team (dict): Données de l'équipe (doit contenir 'id')
+
+        Returns:
+            bool: True si l'enregistrement a réussi, False sinon
+        """
+        try:
+            with self._lock, self._conn:
+                self._write_team(team)
+            self.version += 1
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'enregistrement de l'équipe: {e}")
+            return False
+
+    def update(self, team_id, changes):
+        """
+        Met à jour les champs d'une équipe
+
+        Args:
+            team_id: ID de l'équipe
+            changes (dict): Champs à modifier
+
+        Returns:
+            dict: Équipe mise à jour ou None si non trouvée / erreur d'écriture
+        """
+        try:
+            with self._lock, self._conn:
+                team = self.get(team_id)
+                if team is None:
+                    return None
+                team.update(changes)
+                self._write_team(team, replace_players='players' in changes)
+            self.version += 1
+            return team
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de la mise à jour de l'équipe: {e}")
+            return None
+
+    def upsert_many(self, teams):
+        """
+        Ajoute ou remplace plusieurs équipes en une seule transaction
+
+        Args:
+            teams (list): Équipes complètes (doivent contenir 'id')
+
+        Returns:
+            bool: True si l'enregistrement a réussi, False sinon
+        """
+        try:
+            with self._lock, self._conn:
+                for team in teams:
+                    self._write_team(team)
+            self.version += 1
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'enregistrement des équipes: {e}")
+            return False
+
+    def remove(self, team_id):
+        """
+        Supprime une équipe et ses joueurs
+
+        Args:
+            team_id: ID de l'équipe
+
+        Returns:
+            dict: Équipe supprimée ou None si non trouvée / erreur d'écriture
+        """
+        try:
+            with self._lock, self._conn:
+                team = self.get(team_id)
+                if team is None:
+                    return None
+                self._conn.execute("DELETE FROM teams WHERE id = ?", (team_id,))
+            self.version += 1
+            return team
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de la suppression de l'équipe: {e}")
+            return None
+
+    def get_match(self):
+        """
+        Récupère la configuration du match actuel
+
+        Returns:
+            dict: {'team_a': ..., 'team_b': ...}
+        """
+        with self._lock:
+            slots = {row['slot']: row['team_id'] for row in self._conn.execute("SELECT slot, team_id FROM current_match")}
+            return {
+                'team_a': self.get(slots['team_a']) if slots.get('team_a') else None,
+                'team_b': self.get(slots['team_b']) if slots.get('team_b') else None
+            }
+
+    def set_match(self, match):
+        """
+        Enregistre la configuration du match actuel
+
+        Args:
+            match (dict): {'team_a': ..., 'team_b': ...}
+
+        Returns:
+            bool: True si l'enregistrement a réussi, False sinon
+        """
+        try:
+            with self._lock, self._conn:
+                for slot in ('team_a', 'team_b'):
+                    team = match.get(slot)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO current_match (slot, team_id) VALUES (?, ?)",
+                        (slot, team.get('id') if team else None)
+                    )
+            self.version += 1
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'enregistrement de la configuration du match: {e}")
+            return False
+
+    def import_json(self, teams_file, match_file=None):
+        """
+        Importe les fichiers JSON existants dans la base (une seule transaction)
+
+        Les équipes déjà présentes (même ID) sont remplacées.
+
+        Args:
+            teams_file: Chemin du fichier teams.json
+            match_file: Chemin du fichier current_match.json (optionnel)
+
+        Returns:
+            dict: {'teams': nombre d'équipes, 'players': nombre de joueurs, 'match': bool}
+        """
+        with open(teams_file, 'r') as f:
+            teams = json.load(f)
+
+        match = None
+        if match_file and os.path.exists(match_file):
+            with open(match_file, 'r') as f:
+                match = json.load(f)
+
+        with self._lock, self._conn:
+            for team in teams:
+                self._write_team(team)
+            if match:
+                for slot in ('team_a', 'team_b'):
+                    team = match.get(slot)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO current_match (slot, team_id) VALUES (?, ?)",
+                        (slot, team.get('id') if team else None)
+                    )
+        self.version += 1
+
+        summary = {
+            'teams': len(teams),
+            'players': sum(len(team.get('players', [])) for team in teams),
+            'match': bool(match)
+        }
+        logger.info(f"Import JSON terminé: {summary['teams']} équipes, {summary['players']} joueurs")
+        return summary
+
+    def _write_team(self, team, replace_players=True):
+        """Écrit une équipe (et ses joueurs) dans la transaction en cours"""
+        extra = {key: value for key, value in team.items() if key not in ('id', 'name', 'logo', 'players')}
+        self._conn.execute(
+            "INSERT INTO teams (id, name, logo, extra) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, logo = excluded.logo, extra = excluded.extra",
+            (team['id'], team.get('name', ''), team.get('logo'), json.dumps(extra) if extra else None)
+        )
+
+        if not replace_players:
+            return
+
+        self._conn.execute("DELETE FROM players WHERE team_id = ?", (team['id'],))
+        self._conn.executemany(
+            "INSERT INTO players (team_id, rank, numero, nom, prenom, position, taille, date_naissance, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [self._player_row(team['id'], rank, player) for rank, player in enumerate(team.get('players', []))]
+        )
+
+    def _player_row(self, team_id, rank, player):
+        """Convertit un joueur en tuple de colonnes"""
+        extra = {key: value for key, value in player.items() if key not in PLAYER_COLUMNS}
+        values = tuple(None if player.get(column) is None else str(player.get(column)) for column in PLAYER_COLUMNS)
+        return (team_id, rank) + values + (json.dumps(extra) if extra else None,)
+
+    def _load_players(self, team_id):
+        """Charge les joueurs d'une équipe dans l'ordre d'origine"""
+        rows = self._conn.execute("SELECT * FROM players WHERE team_id = ? ORDER BY rank", (team_id,))
+        return [self._player_from_row(row) for row in rows]
+
+    def _team_from_row(self, row):
+        """Convertit une ligne de la table teams en dictionnaire"""
+        team = {'id': row['id'], 'name': row['name'], 'logo': row['logo']}
+        if row['extra']:
+            team.update(json.loads(row['extra']))
+        return team
+
+    def _player_from_row(self, row):
+        """Convertit une ligne de la table players en dictionnaire"""
+        player = {column: row[column] for column in PLAYER_COLUMNS if row[column] is not None}
+        if row['extra']:
+            player.update(json.loads(row['extra']))
+        return player
@@ -0,0 +1,212 @@
+#fonctionnalités à implémenter :
+# -construction des ressources statiques avec empreinte dans le nom (style.<empreinte>.css)
+# -précompression gzip/brotli, -manifeste utilisé par les templates (asset_url)
+
+import os
+import gzip
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli optionnel : seules les versions gzip sont générées
+    brotli = None
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('static_assets')
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Extensions prises en charge et extensions précompressées
+FINGERPRINTED = ('.js', '.css', '.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.woff', '.woff2')
+COMPRESSIBLE = ('.js', '.css', '.svg', '.json')
+
+# Sous-dossiers de static ignorés (médias uploadés, déjà nommés par empreinte)
+EXCLUDED_DIRS = ('media', 'dist')
+
+# Durée de cache des fichiers à empreinte (un an)
+IMMUTABLE_MAX_AGE = 31536000
+
+
+class AssetManifest:
+    """
+    Manifeste des ressources statiques à empreinte.
+
+    La construction copie chaque fichier de `static` dans `static/dist` sous
+    un nom contenant l'empreinte de son contenu, avec ses versions .gz (et .br
+    si le module brotli est installé). Une URL à empreinte ne change jamais de
+    contenu : elle peut être mise en cache par le navigateur sans
+    revalidation. La construction est refaite automatiquement quand un
+    fichier source change (vérification limitée à une fois par intervalle).
+    """
+
+    def __init__(self, static_dir=None, output_dir=None, url_prefix='/assets', check_interval=2.0):
+        """
+        Initialise le manifeste
+
+        Args:
+            static_dir: Répertoire des fichiers sources
+            output_dir: Répertoire des fichiers construits
+            url_prefix: Préfixe d'URL des fichiers construits
+            check_interval: Intervalle minimal (secondes) entre deux vérifications des sources
+        """
+        self.static_dir = static_dir or os.path.join(APP_DIR, 'static')
+        self.output_dir = output_dir or os.path.join(self.static_dir, 'dist')
+        self.url_prefix = url_prefix.rstrip('/')
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._signature = None
+        self._last_check = 0.0
+
+    def url(self, path):
+        """
+        Retourne l'URL à empreinte d'une ressource
+
+        Args:
+            path: Chemin relatif au dossier static (ex. 'css/style.css')
+
+        Returns:
+            str: URL à empreinte, ou None si la ressource n'est pas gérée
+        """
+        manifest = self.manifest()
+        built = manifest.get(path.lstrip('/'))
+        return f"{self.url_prefix}/{built}" if built else None
+
+    def manifest(self):
+        """Retourne le manifeste {chemin source: chemin construit}, reconstruit si nécessaire"""
+        now = time.monotonic()
+        if self._manifest is not None and now - self._last_check < self.check_interval:
+            return self._manifest
+
+        with self._lock:
+            self._last_check = now
+            signature = self._sources_signature()
+            if self._manifest is None or signature != self._signature:
+                self._manifest = self.build()
+                self._signature = signature
+        return self._manifest
+
+    def resolve(self, filename, accept_encoding=''):
+        """
+        Choisit le fichier à envoyer pour une URL à empreinte
+
+        Args:
+            filename: Chemin construit (relatif au dossier de sortie)
+            accept_encoding: En-tête Accept-Encoding de la requête
+
+        Returns:
+            tuple: (chemin du fichier, Content-Encoding ou None), ou (None, None) si absent
+        """
+        path = os.path.normpath(os.path.join(self.output_dir, filename))
+        if not path.startswith(os.path.abspath(self.output_dir)) or not os.path.isfile(path):
+            return None, None
+
+        accepted = {value.split(';')[0].strip() for value in (accept_encoding or '').split(',')}
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return path + suffix, encoding
+        return path, None
+
+    def build(self):
+        """
+        Construit les fichiers à empreinte et leurs versions compressées
+
+        Returns:
+            dict: Manifeste {chemin source: chemin construit}
+        """
+        start = time.perf_counter()
+        manifest = {}
+        expected = set()
+
+        for source, relative in self._sources():
+            with open(source, 'rb') as f:
+                content = f.read()
+
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            stem, extension = os.path.splitext(relative)
+            built = f"{stem}.{digest}{extension}".replace(os.sep, '/')
+            target = os.path.join(self.output_dir, built)
+            manifest[relative.replace(os.sep, '/')] = built
+            expected.add(os.path.normpath(target))
+
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                self._write(target, content)
+
+            if extension.lower() in COMPRESSIBLE:
+                for suffix, compress in self._compressors():
+                    compressed_target = target + suffix
+                    expected.add(os.path.normpath(compressed_target))
+                    if not os.path.exists(compressed_target):
+                        compressed = compress(content)
+                        if len(compressed) < len(content):
+                            self._write(compressed_target, compressed)
+
+        self._cleanup(expected)
+        self._write(os.path.join(self.output_dir, 'manifest.json'),
+                    json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+        logger.info(f"Ressources statiques construites: {len(manifest)} fichiers en {time.perf_counter() - start:.2f}s")
+        return manifest
+
+    def _sources(self):
+        """Liste les fichiers sources (chemin absolu, chemin relatif au dossier static)"""
+        for root, dirs, files in os.walk(self.static_dir):
+            if os.path.normpath(root) == os.path.normpath(self.static_dir):
+                dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+            for name in sorted(files):
+                if name.lower().endswith(FINGERPRINTED):
+                    source = os.path.join(root, name)
+                    yield source, os.path.relpath(source, self.static_dir)
+
+    def _sources_signature(self):
+        """Résumé (chemin, mtime, taille) des fichiers sources"""
+        entries = []
+        for source, relative in self._sources():
+            try:
+                stat = os.stat(source)
+                entries.append((relative, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+        return tuple(entries)
+
+    def _compressors(self):
+        """Compressions générées (brotli si disponible, puis gzip)"""
+        compressors = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            compressors.insert(0, ('.br', lambda data: brotli.compress(data, quality=11)))
+        return compressors
+
+    def _write(self, path, content):
+        """Écrit un fichier de façon atomique"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _cleanup(self, expected):
+        """Supprime les anciennes versions construites qui ne sont plus référencées"""
+        if not os.path.isdir(self.output_dir):
+            return
+        for root, dirs, files in os.walk(self.output_dir, topdown=False):
+            for name in files:
+                path = os.path.normpath(os.path.join(root, name))
+                if name != 'manifest.json' and path not in expected:
+                    os.remove(path)
+            if root != self.output_dir and not os.listdir(root):
+                shutil.rmtree(root, ignore_errors=True)
+
+
+# Instance partagée (templates et route /assets)
+asset_manifest = AssetManifest()
+
+
+if __name__ == '__main__':
+    # Construction explicite (ex. avant un déploiement) : python -m app.core.static_assets
+    asset_manifest.build()
@@ -3,10 +3,10 @@
 # -surveillance de l'état du streaming
 
 import os
-import json
 import time
 import logging
-from v3_0.app.core.vmix_manager import VMixManager
+from .vmix_manager import VMixManager
+from .persistence import JsonStore
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -37,15 +37,16 @@ class StreamManager:
 
         # Fichier JSON pour stocker les configurations de streaming
         self.config_file = os.path.join(self.data_dir, "stream_config.json")
+        self.config_store = JsonStore.for_file(self.config_file)
 
         # Utiliser l'instance vmix_manager fournie ou en créer une nouvelle
         self.vmix = vmix_manager if vmix_manager else VMixManager()
 
         # Initialiser la configuration par défaut si elle n'existe pas
-        if not os.path.exists(self.config_file):
+        if not self.config_store.exists():
             self._create_default_config()
         
-        # État actuel du streaming
+        # État actuel du streaming (lu dans vMix à la première demande, pas au lancement)
         self.streaming_state = {
             'is_streaming': False,
             'is_recording': False,
@@ -55,9 +56,6 @@ class StreamManager:
         
         # Charger la configuration
         self.config = self.load_config()
-        
-        # Vérifier l'état initial du streaming
-        self._update_streaming_state()
 
     def _create_default_config(self):
         """Crée une configuration de streaming par défaut"""
@@ -73,23 +71,22 @@ class StreamManager:
             'thumbnailUrl': None
         }
         
-        with open(self.config_file, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        self.config_store.save_now(default_config)
+        return default_config
     
     def load_config(self):
         """Charge la configuration du streaming depuis le fichier"""
-        try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement de la configuration: {str(e)}")
+        config = self.config_store.load()
+        if config is None:
+            logger.error("Erreur lors du chargement de la configuration")
             return self._create_default_config()
+        return config
     
     def save_config(self, config):
         """Sauvegarde la configuration du streaming"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            if not self.config_store.save(config):
+                return False
             self.config = config
             return True
         except Exception as e:
@@ -112,8 +109,10 @@ class StreamManager:
             
             # Mettre à jour l'état de l'enregistrement
             if recording_status and not self.streaming_state['is_recording']:
+                # Enregistrement démarré hors de l'application : heure de début inconnue
+                # (seul start_recording() connaît l'heure exacte)
                 self.streaming_state['is_recording'] = True
-                self.streaming_state['recording_start_time'] = time.time()
+                self.streaming_state['recording_start_time'] = None
             elif not recording_status:
                 self.streaming_state['is_recording'] = False
                 self.streaming_state['recording_start_time'] = None
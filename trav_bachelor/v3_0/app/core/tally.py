@@ -0,0 +1,236 @@
+#fonctionnalités à implémenter :
+# -tally par input (program, preview, overlay) pour les cadreurs
+# -mises à jour poussées par vMix (API TCP, SUBSCRIBE TALLY/ACTS), -repli sur la lecture de l'instantané XML
+# -état d'un input codé sur un seul caractère
+
+import socket
+import logging
+import threading
+from .event_bus import event_bus
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('tally')
+
+# Port de l'API TCP de vMix
+TCP_PORT = 8099
+
+# Bits de l'état d'un input : l'état est transmis comme un seul caractère '0' à '7'
+PROGRAM = 1
+PREVIEW = 2
+OVERLAY = 4
+OFF = '0'
+
+
+def tally_room(input_number):
+    """Nom du salon des abonnés au tally d'un input"""
+    return f"tally:{input_number}"
+
+
+class TallyService:
+    """
+    Service de tally.
+
+    Un thread reste abonné à l'API TCP de vMix (SUBSCRIBE TALLY pour le
+    program/preview, SUBSCRIBE ACTS pour les overlays) : vMix pousse chaque
+    changement, sans polling. Si l'API TCP est injoignable, le service lit
+    l'instantané XML partagé à intervalle régulier et retente la connexion
+    TCP périodiquement.
+
+    L'état d'un input est un caractère : '0' (hors antenne) ou la somme de
+    1 (program), 2 (preview) et 4 (overlay). Seuls les inputs dont le
+    caractère change sont notifiés.
+    """
+
+    def __init__(self, vmix_manager, tcp_port=TCP_PORT, poll_interval=1.0, retry_interval=10.0, bus=None):
+        """
+        Initialise le service
+
+        Args:
+            vmix_manager: Gestionnaire vMix (hôte et instantané XML)
+            tcp_port: Port de l'API TCP de vMix
+            poll_interval: Intervalle de lecture de l'instantané en mode dégradé (secondes)
+            retry_interval: Délai avant une nouvelle tentative de connexion TCP (secondes)
+            bus: Bus d'événements (par défaut le bus partagé)
+        """
+        self.vmix_manager = vmix_manager
+        self.tcp_port = tcp_port
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.bus = bus or event_bus
+
+        # 'tcp' (poussé par vMix) ou 'polling' (lecture de l'instantané)
+        self.source = None
+        self._program = None
+        self._preview = None
+        self._overlays = {}
+        self._states = {}
+
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread de tally s'il n'est pas actif"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='vmix-tally', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Arrête le thread de tally"""
+        self._stop.set()
+
+    def state(self, input_number):
+        """
+        État d'un input
+
+        Args:
+            input_number: Numéro de l'input vMix
+
+        Returns:
+            str: Caractère '0' à '7'
+        """
+        return self._states.get(str(input_number), OFF)
+
+    def states(self):
+        """États des inputs à l'antenne ou en preview {numéro: caractère}"""
+        return dict(self._states)
+
+    def wait(self, input_number, known, timeout=None):
+        """
+        Attend que l'état d'un input diffère de l'état connu du client
+
+        Args:
+            input_number: Numéro de l'input vMix
+            known: Dernier état reçu par le client
+            timeout: Délai maximal d'attente (secondes)
+
+        Returns:
+            str: État actuel (égal à known si le délai est écoulé)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.state(input_number) != known, timeout=timeout)
+            return self.state(input_number)
+
+    def update(self, program=None, preview=None, overlays=None):
+        """
+        Applique un changement de program, preview ou overlays et notifie les inputs concernés
+
+        Args:
+            program: Numéro de l'input au program (None : inchangé)
+            preview: Numéro de l'input en preview (None : inchangé)
+            overlays (dict): {numéro d'overlay: numéro d'input} (None : inchangés)
+        """
+        with self._lock:
+            if program is not None:
+                self._program = str(program)
+            if preview is not None:
+                self._preview = str(preview)
+            if overlays is not None:
+                self._overlays = {str(number): str(value) for number, value in overlays.items() if value}
+
+            states = {}
+            for value, bit in ((self._program, PROGRAM), (self._preview, PREVIEW)):
+                if value:
+                    states[value] = states.get(value, 0) | bit
+            for value in self._overlays.values():
+                states[value] = states.get(value, 0) | OVERLAY
+            states = {number: str(bits) for number, bits in states.items()}
+
+            changed = {number: states.get(number, OFF)
+                       for number in set(states) | set(self._states)
+                       if states.get(number, OFF) != self._states.get(number, OFF)}
+            if not changed:
+                return
+            self._states = states
+            self._condition.notify_all()
+
+        for number, value in changed.items():
+            self.bus.publish('tally', value, room=tally_room(number), transient=True)
+
+    def parse_line(self, line):
+        """
+        Traite une ligne reçue de l'API TCP de vMix
+
+        Args:
+            line (str): Ex. 'TALLY OK 0121' ou 'ACTS OK Overlay1 3 1'
+        """
+        parts = line.split()
+        if len(parts) >= 3 and parts[0] == 'TALLY' and parts[1] == 'OK':
+            # Un caractère par input (dans l'ordre) : 0 hors antenne, 1 program, 2 preview
+            program = preview = ''
+            for index, value in enumerate(parts[2]):
+                if value == '1':
+                    program = str(index + 1)
+                elif value == '2':
+                    preview = str(index + 1)
+            self.update(program=program, preview=preview)
+        elif len(parts) == 5 and parts[:2] == ['ACTS', 'OK'] and parts[2].startswith('Overlay'):
+            overlay, input_number, active = parts[2][len('Overlay'):], parts[3], parts[4]
+            overlays = dict(self._overlays)
+            if active == '1':
+                overlays[overlay] = input_number
+            elif overlays.get(overlay) == input_number:
+                del overlays[overlay]
+            self.update(overlays=overlays)
+
+    def _sync_snapshot(self, max_age):
+        """Applique l'état de l'instantané XML partagé"""
+        snapshot = self.vmix_manager.get_snapshot(max_age=max_age)
+        if snapshot['connected']:
+            self.update(program=snapshot['active'] or '', preview=snapshot['preview'] or '',
+                        overlays=snapshot['overlays'])
+        else:
+            self.update(program='', preview='', overlays={})
+
+    def _listen_tcp(self):
+        """Reste abonné à l'API TCP de vMix jusqu'à la perte de connexion ou l'arrêt"""
+        with socket.create_connection((self.vmix_manager.host, self.tcp_port), timeout=2) as connection:
+            connection.settimeout(self.retry_interval)
+            connection.sendall(b"SUBSCRIBE TALLY\r\nSUBSCRIBE ACTS\r\nTALLY\r\n")
+            if self.source != 'tcp':
+                logger.info(f"Tally poussé par vMix (TCP {self.vmix_manager.host}:{self.tcp_port})")
+            self.source = 'tcp'
+            # État initial des overlays (les ACTS ne sont envoyés qu'aux changements)
+            self._sync_snapshot(max_age=0)
+
+            buffer = b''
+            while not self._stop.is_set():
+                try:
+                    data = connection.recv(4096)
+                except socket.timeout:
+                    # Aucun changement : vérifier que la connexion est toujours active
+                    connection.sendall(b"TALLY\r\n")
+                    continue
+                if not data:
+                    raise ConnectionError("connexion fermée par vMix")
+                buffer += data
+                *lines, buffer = buffer.split(b'\r\n')
+                for line in lines:
+                    self.parse_line(line.decode('utf-8', errors='replace'))
+
+    def _poll(self, duration):
+        """Lit l'instantané XML pendant `duration` secondes (mode dégradé)"""
+        if self.source != 'polling':
+            logger.info(f"API TCP de vMix indisponible : tally par lecture de l'état toutes les {self.poll_interval}s")
+        self.source = 'polling'
+        remaining = duration
+        while remaining > 0 and not self._stop.is_set():
+            try:
+                self._sync_snapshot(max_age=self.poll_interval / 2)
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture du tally: {e}")
+            self._stop.wait(self.poll_interval)
+            remaining -= self.poll_interval
+
+    def _run(self):
+        """Boucle du tally : API TCP, sinon lecture périodique avant une nouvelle tentative"""
+        while not self._stop.is_set():
+            try:
+                self._listen_tcp()
+            except OSError as e:
+                logger.debug(f"API TCP de vMix: {e}")
+            self._poll(self.retry_interval)
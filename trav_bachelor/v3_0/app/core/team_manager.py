@@ -2,41 +2,63 @@
 # -structurer les données des équipes, -opérations cRUD ?
 # -persistance des équipes
 
-import json
 import os
-import csv
 import uuid
 import logging
 from werkzeug.utils import secure_filename
+from .team_repository import TeamRepository
+from .sqlite_team_repository import SqliteTeamRepository
+from .roster_importer import RosterImporter
+from .asset_pipeline import LogoPipeline
+from .media_store import media_store
+from .event_bus import event_bus
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('team_manager')
 
 class TeamManager:
-    def __init__(self, vmix_manager=None, data_dir=None):
+
+    def __init__(self, vmix_manager=None, data_dir=None, storage=None):
         """
         Initialise le gestionnaire d'équipes
 
         Args:
             vmix_manager: Instance de VMixManager à utiliser
             data_dir: Répertoire pour les données persistantes
+            storage: Stockage des équipes, 'json' (défaut) ou 'sqlite'.
+                     Si None, utilise la variable d'environnement VOLLEYBACH_STORAGE.
         """
         # Configuration des chemins
         self.base_dir = os.path.abspath(os.path.dirname(__file__))
         self.data_dir = data_dir or os.path.join(self.base_dir, '..', 'data')
         self.teams_file = os.path.join(self.data_dir, 'teams.json')
+        self.teams_db = os.path.join(self.data_dir, 'teams.db')
         self.logos_dir = os.path.join(self.data_dir, 'team_logos')
         self.vmix_manager = vmix_manager
+        self.storage = (storage or os.environ.get('VOLLEYBACH_STORAGE', 'json')).lower()
 
         # Créer les répertoires s'ils n'existent pas
         os.makedirs(self.data_dir, exist_ok=True)
         os.makedirs(self.logos_dir, exist_ok=True)
 
-        # Initialiser le fichier des équipes s'il n'existe pas
-        if not os.path.exists(self.teams_file):
-            with open(self.teams_file, 'w') as f:
-                json.dump([], f)
+        # Stockage des médias par empreinte (références 'team:<id>') et déclinaisons des logos
+        self.media_store = media_store
+        self.logo_pipeline = LogoPipeline(
+            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'media', 'team_logos', 'renditions'),
+            '/static/media/team_logos/renditions'
+        )
+
+        if self.storage == 'sqlite':
+            # Base SQLite partagée (voir migrate_teams_to_sqlite.py pour importer teams.json)
+            self.repository = SqliteTeamRepository.for_file(self.teams_db)
+        else:
+            # Dépôt en mémoire partagé (index par ID et par numéro de maillot)
+            self.repository = TeamRepository.for_file(self.teams_file)
+
+            # Initialiser le fichier des équipes s'il n'existe pas
+            if not self.repository.teams_store.exists():
+                self.repository.teams_store.save_now([])
 
         # Configuration de match actuelle
         self.current_match = {
@@ -44,6 +66,9 @@ class TeamManager:
             'team_b': None
         }
 
+        # Salon des événements du match enregistré (score, replays)
+        event_bus.set_match(self.match_id(self.repository.get_match()))
+
     def get_all_teams(self):
         """
         Récupère toutes les équipes enregistrées
@@ -51,12 +76,7 @@ class TeamManager:
         Returns:
             list: Liste des équipes
         """
-        try:
-            with open(self.teams_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            logger.error("Erreur lors de la lecture du fichier teams.json")
-            return []
+        return self.repository.all()
 
     def get_team(self, team_id):
         """
@@ -68,11 +88,7 @@ class TeamManager:
         Returns:
             dict: Données de l'équipe ou None si non trouvée
         """
-        teams = self.get_all_teams()
-        for team in teams:
-            if team['id'] == team_id:
-                return team
-        return None
+        return self.repository.get(team_id)
 
     def create_team(self, name, logo=None, players=None):
         """
@@ -86,7 +102,6 @@ class TeamManager:
         Returns:
             str: ID de l'équipe créée
         """
-        teams = self.get_all_teams()
         team_id = str(uuid.uuid4())
 
         new_team = {
@@ -96,16 +111,13 @@ class TeamManager:
             'players': players or []
         }
 
-        teams.append(new_team)
-
-        try:
-            with open(self.teams_file, 'w') as f:
-                json.dump(teams, f, indent=4)
+        if self.repository.add(new_team):
+            self.media_store.set_ref(f"team:{team_id}", self.media_store.hash_from_url(logo))
             logger.info(f"Équipe '{name}' créée avec succès (ID: {team_id})")
             return team_id
-        except Exception as e:
-            logger.error(f"Erreur lors de la création de l'équipe '{name}': {e}")
-            return None
+
+        logger.error(f"Erreur lors de la création de l'équipe '{name}'")
+        return None
 
     def update_team(self, team_id, name=None, logo=None, players=None):
         """
@@ -120,27 +132,28 @@ class TeamManager:
         Returns:
             bool: True si mise à jour réussie, False sinon
         """
-        teams = self.get_all_teams()
-        for i, team in enumerate(teams):
-            if team['id'] == team_id:
-                if name:
-                    team['name'] = name
-                if logo:
-                    team['logo'] = logo
-                if players:
-                    team['players'] = players
-
-                try:
-                    with open(self.teams_file, 'w') as f:
-                        json.dump(teams, f, indent=2)
-                    logger.info(f"Équipe mise à jour avec succès: {team['name']}")
-                    return True
-                except Exception as e:
-                    logger.error(f"Erreur lors de la mise à jour de l'équipe: {str(e)}")
-                    return False
-
-        logger.warning(f"Équipe non trouvée pour mise à jour: {team_id}")
-        return False
+        if self.repository.get(team_id) is None:
+            logger.warning(f"Équipe non trouvée pour mise à jour: {team_id}")
+            return False
+
+        changes = {}
+        if name:
+            changes['name'] = name
+        if logo:
+            changes['logo'] = logo
+        if players:
+            changes['players'] = players
+
+        team = self.repository.update(team_id, changes)
+        if team is None:
+            logger.error(f"Erreur lors de la mise à jour de l'équipe: {team_id}")
+            return False
+
+        if logo:
+            self.media_store.set_ref(f"team:{team_id}", self.media_store.hash_from_url(logo))
+
+        logger.info(f"Équipe mise à jour avec succès: {team['name']}")
+        return True
 
     def delete_team(self, team_id):
         """
@@ -152,34 +165,20 @@ class TeamManager:
         Returns:
             bool: True si suppression réussie, False sinon
         """
-        teams = self.get_all_teams()
-        team_found = False
-
-        for i, team in enumerate(teams):
-            if team['id'] == team_id:
-                # Supprimer le logo si nécessaire
-                if team.get('logo') and os.path.exists(team['logo']):
-                    try:
-                        os.remove(team['logo'])
-                    except Exception as e:
-                        logger.warning(f"Impossible de supprimer le logo: {str(e)}")
-
-                teams.pop(i)
-                team_found = True
-                break
-
-        if team_found:
-            try:
-                with open(self.teams_file, 'w') as f:
-                    json.dump(teams, f, indent=2)
-                logger.info(f"Équipe supprimée avec succès: {team_id}")
-                return True
-            except Exception as e:
-                logger.error(f"Erreur lors de la suppression de l'équipe: {str(e)}")
-                return False
-
-        logger.warning(f"Équipe non trouvée pour suppression: {team_id}")
-        return False
+        team = self.repository.get(team_id)
+        if team is None:
+            logger.warning(f"Équipe non trouvée pour suppression: {team_id}")
+            return False
+
+        if self.repository.remove(team_id) is None:
+            logger.error(f"Erreur lors de la suppression de l'équipe: {team_id}")
+            return False
+
+        # Libérer le logo (supprimé par le ramasse-miettes s'il n'est plus utilisé)
+        self.media_store.release(f"team:{team_id}")
+
+        logger.info(f"Équipe supprimée avec succès: {team_id}")
+        return True
 
     def get_team_players(self, team_id):
         """
@@ -191,10 +190,20 @@ class TeamManager:
         Returns:
             list: Liste des joueurs de l'équipe ou None si équipe non trouvée
         """
-        team = self.get_team(team_id)
-        if team:
-            return team.get('players', [])
-        return None
+        return self.repository.get_players(team_id)
+
+    def get_player(self, team_id, numero):
+        """
+        Récupère un joueur d'une équipe par son numéro de maillot
+
+        Args:
+            team_id: ID de l'équipe
+            numero: Numéro de maillot
+
+        Returns:
+            dict: Données du joueur ou None si non trouvé
+        """
+        return self.repository.get_player(team_id, numero)
 
     def save_team_logo(self, logo_file):
         """
@@ -204,38 +213,65 @@ class TeamManager:
             logo_file: Fichier logo uploadé
 
         Returns:
-            str: Chemin vers le fichier sauvegardé
+            str: URL de la vignette web du logo (None en cas d'erreur)
         """
         if not logo_file:
             return None
 
-        # Sécuriser le nom de fichier
-        filename = secure_filename(logo_file.filename)
-        # Ajouter un identifiant unique pour éviter les collisions
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        # Chemin complet
-        filepath = os.path.join(self.logos_dir, unique_filename)
-
-        # Enregistrer le fichier
         try:
-            logo_file.save(filepath)
-            logger.info(f"Logo enregistré avec succès: {filepath}")
+            # Fichier d'origine et déclinaisons nommés d'après l'empreinte du contenu
+            asset = self.logo_pipeline.process(logo_file, secure_filename(logo_file.filename))
+            logger.info(f"Logo enregistré avec succès: {asset['original']}")
 
-            # Créer un lien symbolique vers le dossier static si nécessaire
-            static_logos_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'media', 'team_logos')
-            os.makedirs(static_logos_dir, exist_ok=True)
-
-            # Copier le fichier dans le dossier static
-            import shutil
-            static_filepath = os.path.join(static_logos_dir, unique_filename)
-            shutil.copy2(filepath, static_filepath)
-
-            # Retourner le chemin relatif pour l'URL
-            return f"/static/media/team_logos/{unique_filename}"
+            # Retourner l'URL de la vignette web (les autres déclinaisons s'en déduisent)
+            return asset['renditions']['web']['url']
         except Exception as e:
             logger.error(f"Erreur lors de l'enregistrement du logo: {str(e)}")
             return None
 
+    def get_logo_path(self, team, rendition='scoreboard'):
+        """
+        Récupère le chemin local du logo d'une équipe pour vMix
+
+        Args:
+            team (dict): Données de l'équipe
+            rendition: Déclinaison souhaitée ('scoreboard', 'roster' ou 'web')
+
+        Returns:
+            str: Chemin absolu de la déclinaison ou None si l'équipe n'a pas de logo
+        """
+        if not team:
+            return None
+        team = self.import_legacy_logo(team)
+        return self.logo_pipeline.path_for(team.get('logo'), rendition)
+
+    def import_legacy_logo(self, team):
+        """
+        Importe le logo historique d'une équipe dans le stockage des médias
+
+        Le logo est référencé par l'équipe ('team:<id>') pour ne pas être
+        supprimé par le ramasse-miettes, et l'équipe pointe désormais vers
+        la vignette web du logo importé.
+
+        Args:
+            team (dict): Données de l'équipe
+
+        Returns:
+            dict: Équipe à jour (inchangée si le logo n'est pas un logo historique)
+        """
+        logo = team.get('logo')
+        if not logo or self.media_store.hash_from_url(logo) or not self.repository.get(team.get('id')):
+            return team
+        asset = self.logo_pipeline.import_legacy(logo)
+        if asset is None:
+            return team
+
+        self.media_store.set_ref(f"team:{team['id']}", asset['hash'])
+        logo = asset['renditions']['web']['url']
+        updated = self.repository.update(team['id'], {'logo': logo})
+        logger.info(f"Logo historique de l'équipe {team.get('name')} importé: {logo}")
+        return updated or dict(team, logo=logo)
+
     def parse_players_csv(self, csv_file):
         """
         Parse un fichier CSV pour obtenir la liste des joueurs
@@ -249,69 +285,34 @@ class TeamManager:
         if not csv_file:
             return []
 
-        players = []
         try:
-            # Lire le contenu du fichier
-            content = csv_file.read().decode('utf-8')
-
-            # Créer un lecteur CSV
-            csv_reader = csv.reader(content.splitlines(), delimiter=',')
-
-            # Parser les lignes
-            header = next(csv_reader, None)
-            if header:
-                # Déterminer les indices des colonnes
-                indices = {
-                    'numero': header.index('numero') if 'numero' in header else None,
-                    'nom': header.index('nom') if 'nom' in header else None,
-                    'prenom': header.index('prenom') if 'prenom' in header else None,
-                    'position': header.index('position') if 'position' in header else None,
-                    'taille': header.index('taille') if 'taille' in header else None,
-                    'date_naissance': header.index('date_naissance') if 'date_naissance' in header else None
-                }
-
-                # Si aucun en-tête n'est trouvé, utiliser l'ordre par défaut
-                if all(idx is None for idx in indices.values()):
-                    indices = {
-                        'numero': 0,
-                        'nom': 1,
-                        'prenom': 2,
-                        'position': 3,
-                        'taille': 4,
-                        'date_naissance': 5
-                    }
-            else:
-                # Si aucun en-tête n'est trouvé, utiliser l'ordre par défaut
-                indices = {
-                    'numero': 0,
-                    'nom': 1,
-                    'prenom': 2,
-                    'position': 3,
-                    'taille': 4,
-                    'date_naissance': 5
-                }
-                # Réinitialiser le fichier pour le relire
-                csv_file.seek(0)
-                content = csv_file.read().decode('utf-8')
-                csv_reader = csv.reader(content.splitlines(), delimiter=',')
-
-            # Parser les joueurs
-            for row in csv_reader:
-                if len(row) >= 3:  # Au moins numéro, nom, prénom
-                    player = {}
-
-                    for field, idx in indices.items():
-                        if idx is not None and idx < len(row):
-                            player[field] = row[idx]
-
-                    players.append(player)
-
+            # Lecture en flux ; les fichiers sans en-tête utilisent l'ordre numero, nom, prenom...
+            players = RosterImporter().read_players(csv_file)
             logger.info(f"Fichier CSV parsé avec succès: {len(players)} joueurs trouvés")
             return players
         except Exception as e:
             logger.error(f"Erreur lors du parsing du fichier CSV: {str(e)}")
             return []
 
+    def import_roster(self, csv_file, column_map=None, default_team=None, mode='replace',
+                      skip_invalid=True, dry_run=False):
+        """
+        Importe un fichier CSV contenant les joueurs de plusieurs équipes (export de ligue)
+
+        Args:
+            csv_file: Fichier CSV uploadé
+            column_map (dict): Correspondance {colonne du fichier: champ} (optionnel)
+            default_team: Nom d'équipe si le fichier n'a pas de colonne d'équipe (optionnel)
+            mode: 'replace' (remplace les effectifs) ou 'merge' (fusion par numéro)
+            skip_invalid: Ignorer les lignes invalides au lieu d'annuler l'import
+            dry_run: Valider sans enregistrer
+
+        Returns:
+            dict: Rapport d'import
+        """
+        importer = RosterImporter(self.repository, column_map=column_map, default_team=default_team)
+        return importer.import_file(csv_file, mode=mode, skip_invalid=skip_invalid, dry_run=dry_run)
+
     def set_match_teams(self, team_a_id, team_b_id):
         """
         Configure les équipes pour le match actuel
@@ -335,16 +336,32 @@ class TeamManager:
             'team_b': team_b
         }
 
-        # Enregistrer la configuration dans un fichier
-        match_config_file = os.path.join(self.data_dir, 'current_match.json')
-        try:
-            with open(match_config_file, 'w') as f:
-                json.dump(self.current_match, f, indent=2)
+        # Enregistrer la configuration via le dépôt partagé
+        if self.repository.set_match(self.current_match):
             logger.info(f"Configuration du match enregistrée: {team_a['name']} vs {team_b['name']}")
+            match_id = self.match_id(self.current_match)
+            event_bus.set_match(match_id)
+            event_bus.publish('match_updated', {'matchId': match_id, 'team_a': team_a, 'team_b': team_b})
             return True
-        except Exception as e:
-            logger.error(f"Erreur lors de l'enregistrement de la configuration du match: {str(e)}")
-            return False
+
+        logger.error("Erreur lors de l'enregistrement de la configuration du match")
+        return False
+
+    def match_id(self, match):
+        """
+        Identifiant d'un match (utilisé pour le salon de ses événements)
+
+        Args:
+            match (dict): {'team_a': ..., 'team_b': ...}
+
+        Returns:
+            str: '<id équipe A>-<id équipe B>', ou None si le match n'est pas configuré
+        """
+        team_a = (match or {}).get('team_a') or {}
+        team_b = (match or {}).get('team_b') or {}
+        if not team_a.get('id') or not team_b.get('id'):
+            return None
+        return f"{team_a['id']}-{team_b['id']}"
 
     def get_current_match(self):
         """
@@ -353,14 +370,14 @@ class TeamManager:
         Returns:
             dict: Configuration du match actuel
         """
-        # Essayer de charger depuis le fichier si nécessaire
-        if not self.current_match['team_a'] or not self.current_match['team_b']:
-            match_config_file = os.path.join(self.data_dir, 'current_match.json')
-            if os.path.exists(match_config_file):
-                try:
-                    with open(match_config_file, 'r') as f:
-                        self.current_match = json.load(f)
-                except Exception as e:
-                    logger.error(f"Erreur lors du chargement de la configuration du match: {str(e)}")
-
-        return self.current_match
+        # Configuration partagée entre toutes les instances (rechargée si le fichier change)
+        self.current_match = self.repository.get_match()
+
+        # Résoudre les équipes via le dépôt pour refléter les dernières modifications
+        match = dict(self.current_match)
+        for key in ('team_a', 'team_b'):
+            team = match.get(key)
+            if team and team.get('id'):
+                match[key] = self.import_legacy_logo(self.repository.get(team['id']) or team)
+
+        return match
@@ -0,0 +1,329 @@
+#fonctionnalités à implémenter :
+# -stockage en mémoire des équipes avec index par ID et par numéro de maillot
+# -rechargement uniquement lorsque le fichier teams.json change (mtime/taille)
+# -écriture atomique et différée via JsonStore
+
+import os
+import copy
+import time
+import logging
+import threading
+from .persistence import JsonStore
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('team_repository')
+
+
+class TeamRepository:
+    """
+    Dépôt en mémoire des équipes, partagé par tous les gestionnaires
+    qui utilisent le même fichier.
+
+    Les lectures se font en O(1) via les index. Le fichier n'est relu que si
+    sa date de modification ou sa taille a changé (vérifiée au plus une fois
+    par intervalle), et toutes les écritures passent par le dépôt.
+
+    Les équipes retournées et reçues sont des copies : modifier une équipe
+    lue ne change le dépôt qu'en passant par update() ou upsert_many().
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_file(cls, teams_file):
+        """
+        Retourne le dépôt partagé associé à un fichier d'équipes
+
+        Args:
+            teams_file: Chemin du fichier teams.json
+
+        Returns:
+            TeamRepository: Instance unique pour ce fichier
+        """
+        path = os.path.abspath(teams_file)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def __init__(self, teams_file, check_interval=1.0):
+        """
+        Initialise le dépôt
+
+        Args:
+            teams_file: Chemin du fichier teams.json
+            check_interval: Intervalle minimal (secondes) entre deux vérifications du fichier
+        """
+        self.teams_file = teams_file
+        self.match_file = os.path.join(os.path.dirname(teams_file), 'current_match.json')
+        self.check_interval = check_interval
+
+        # Fichiers persistants (écriture atomique et différée)
+        self.teams_store = JsonStore.for_file(teams_file, indent=4)
+        self.match_store = JsonStore.for_file(self.match_file)
+        self.teams_store.add_listener(self._on_teams_written)
+        self.match_store.add_listener(self._on_match_written)
+
+        self._lock = threading.RLock()
+        self._teams = []
+        self._by_id = {}
+        self._by_number = {}
+        self._signature = None
+        self._last_check = 0.0
+        self._match = {'team_a': None, 'team_b': None}
+        self._match_signature = None
+        self._match_last_check = 0.0
+
+        # Version incrémentée à chaque changement du contenu
+        self.version = 0
+
+    def all(self):
+        """
+        Récupère toutes les équipes
+
+        Returns:
+            list: Liste des équipes
+        """
+        with self._lock:
+            self._refresh()
+            return copy.deepcopy(self._teams)
+
+    def get(self, team_id):
+        """
+        Récupère une équipe par son ID
+
+        Args:
+            team_id: ID de l'équipe
+
+        Returns:
+            dict: Données de l'équipe ou None si non trouvée
+        """
+        with self._lock:
+            self._refresh()
+            return copy.deepcopy(self._by_id.get(team_id))
+
+    def get_players(self, team_id):
+        """
+        Récupère les joueurs d'une équipe
+
+        Args:
+            team_id: ID de l'équipe
+
+        Returns:
+            list: Liste des joueurs ou None si équipe non trouvée
+        """
+        team = self.get(team_id)
+        if team is None:
+            return None
+        return team.get('players', [])
+
+    def get_player(self, team_id, numero):
+        """
+        Récupère un joueur par son numéro de maillot
+
+        Args:
+            team_id: ID de l'équipe
+            numero: Numéro de maillot
+
+        Returns:
+            dict: Données du joueur ou None si non trouvé
+        """
+        with self._lock:
+            self._refresh()
+            return copy.deepcopy(self._by_number.get(team_id, {}).get(str(numero)))
+
+    def add(self, team):
+        """
+        Ajoute une équipe et persiste le fichier
+
+        Args:
+            team (dict): Données de l'équipe (doit contenir 'id')
+
+        Returns:
+            bool: True si l'enregistrement a réussi, False sinon
+        """
+        with self._lock:
+            self._refresh(force=True)
+            team = copy.deepcopy(team)
+            self._teams.append(team)
+            self._index_team(team)
+            return self._save()
+
+    def update(self, team_id, changes):
+        """
+        Met à jour les champs d'une équipe et persiste le fichier
+
+        Args:
+            team_id: ID de l'équipe
+            changes (dict): Champs à modifier
+
+        Returns:
+            dict: Équipe mise à jour ou None si non trouvée / erreur d'écriture
+        """
+        with self._lock:
+            self._refresh(force=True)
+            team = self._by_id.get(team_id)
+            if team is None:
+                return None
+
+            team.update(copy.deepcopy(changes))
+            self._index_team(team)
+            return copy.deepcopy(team) if self._save() else None
+
+    def upsert_many(self, teams):
+        """
+        Ajoute ou remplace plusieurs équipes en une seule écriture
+
+        Args:
+            teams (list): Équipes complètes (doivent contenir 'id')
+
+        Returns:
+            bool: True si l'enregistrement a réussi, False sinon
+        """
+        with self._lock:
+            self._refresh(force=True)
+            for team in copy.deepcopy(teams):
+                current = self._by_id.get(team['id'])
+                if current is None:
+                    self._teams.append(team)
+                else:
+                    current.clear()
+                    current.update(team)
+                    team = current
+                self._index_team(team)
+            return self._save()
+
+    def remove(self, team_id):
+        """
+        Supprime une équipe et persiste le fichier
+
+        Args:
+            team_id: ID de l'équipe
+
+        Returns:
+            dict: Équipe supprimée ou None si non trouvée / erreur d'écriture
+        """
+        with self._lock:
+            self._refresh(force=True)
+            team = self._by_id.pop(team_id, None)
+            if team is None:
+                return None
+
+            self._by_number.pop(team_id, None)
+            self._teams = [t for t in self._teams if t.get('id') != team_id]
+            return team if self._save() else None
+
+    def get_match(self):
+        """
+        Récupère la configuration du match actuel
+
+        Returns:
+            dict: {'team_a': ..., 'team_b': ...}
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._match_last_check < self.check_interval:
+                return dict(self._match)
+            self._match_last_check = now
+
+            signature = self._file_signature(self.match_file)
+            if signature is not None and signature != self._match_signature and not self.match_store.pending:
+                match = self.match_store.load()
+                if match is not None:
+                    self._match = match
+                    self._match_signature = signature
+                    self.version += 1
+                else:
+                    logger.error("Erreur lors du chargement de la configuration du match")
+            return dict(self._match)
+
+    def set_match(self, match):
+        """
+        Enregistre la configuration du match actuel
+
+        Args:
+            match (dict): {'team_a': ..., 'team_b': ...}
+
+        Returns:
+            bool: True si l'enregistrement a réussi, False sinon
+        """
+        with self._lock:
+            if not self.match_store.save(match):
+                logger.error("Erreur lors de l'enregistrement de la configuration du match")
+                return False
+            self._match = dict(match)
+            self.version += 1
+            return True
+
+    def _file_signature(self, path=None):
+        """Retourne (mtime, taille) du fichier ou None s'il n'existe pas"""
+        try:
+            stat = os.stat(path or self.teams_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _refresh(self, force=False):
+        """Recharge le fichier s'il a changé depuis le dernier chargement"""
+        now = time.monotonic()
+        if not force and self._signature is not None and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        # Les données en mémoire sont plus récentes qu'une écriture en attente
+        if self.teams_store.pending:
+            return
+
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+
+        teams = self.teams_store.load()
+        if teams is None:
+            logger.error("Erreur lors de la lecture du fichier teams.json")
+            teams = []
+
+        self._teams = teams
+        self._rebuild_indexes()
+        self._signature = signature
+        logger.info(f"Équipes chargées en mémoire: {len(teams)} équipes")
+
+    def _rebuild_indexes(self):
+        """Reconstruit les index par ID et par numéro de maillot"""
+        self._by_id = {}
+        self._by_number = {}
+        for team in self._teams:
+            self._index_team(team)
+        self.version += 1
+
+    def _index_team(self, team):
+        """Indexe une équipe et ses joueurs"""
+        team_id = team.get('id')
+        self._by_id[team_id] = team
+        self._by_number[team_id] = {
+            str(player.get('numero')): player
+            for player in team.get('players', [])
+            if player.get('numero') not in (None, '')
+        }
+        self.version += 1
+
+    def _save(self):
+        """Programme l'écriture des équipes (la signature est mise à jour après l'écriture)"""
+        if not self.teams_store.save(self._teams):
+            logger.error("Erreur lors de l'enregistrement des équipes")
+            return False
+        return True
+
+    def _on_teams_written(self, path):
+        """Mémorise la signature du fichier écrit par le dépôt lui-même"""
+        with self._lock:
+            if not self.teams_store.pending:
+                self._signature = self._file_signature()
+
+    def _on_match_written(self, path):
+        """Mémorise la signature du fichier de match écrit par le dépôt lui-même"""
+        with self._lock:
+            if not self.match_store.pending:
+                self._match_signature = self._file_signature(self.match_file)
@@ -0,0 +1,208 @@
+#fonctionnalités à implémenter :
+# -génération côté serveur de la miniature du match (logos, noms, compétition, date, score)
+# -cache par empreinte des paramètres : nouveau rendu uniquement si les données changent
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from .persistence import JsonStore
+from .media_store import media_store as default_media_store
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Pillow absent : la génération de miniature est désactivée
+    Image = None
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('thumbnail_renderer')
+
+# Version du gabarit : à incrémenter à chaque changement de mise en page pour invalider le cache
+TEMPLATE_VERSION = 1
+
+# Taille des miniatures (format recommandé par les plateformes de streaming)
+THUMBNAIL_SIZE = (1280, 720)
+
+# Polices essayées dans l'ordre (Windows pour vMix, puis Linux / macOS)
+FONT_CANDIDATES = (
+    'C:\\Windows\\Fonts\\segoeuib.ttf',
+    'C:\\Windows\\Fonts\\arialbd.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/Library/Fonts/Arial Bold.ttf',
+    'DejaVuSans-Bold.ttf'
+)
+
+BACKGROUND_TOP = (12, 27, 64)
+BACKGROUND_BOTTOM = (3, 8, 24)
+ACCENT = (255, 196, 0)
+TEXT = (255, 255, 255)
+MUTED = (190, 200, 220)
+
+
+class ThumbnailUnavailable(Exception):
+    """Génération impossible (Pillow absent)"""
+
+
+class MatchThumbnailRenderer:
+    """
+    Générateur de la miniature du match.
+
+    Les paramètres du rendu (équipes, empreintes des logos, compétition, date,
+    score, version du gabarit) sont résumés par une empreinte : tant qu'ils ne
+    changent pas, la miniature déjà générée est réutilisée. L'image produite
+    est enregistrée dans le stockage des médias (JPEG 1280x720, < 2 Mo).
+    """
+
+    def __init__(self, logo_pipeline, media_store=None, cache_file=None):
+        """
+        Initialise le générateur
+
+        Args:
+            logo_pipeline: Chaîne de traitement des logos (pour les déclinaisons 'roster')
+            media_store: Stockage des médias (par défaut le stockage partagé)
+            cache_file: Fichier JSON associant empreinte des paramètres et fichier généré
+        """
+        self.logo_pipeline = logo_pipeline
+        self.media_store = media_store or default_media_store
+        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.cache_store = JsonStore.for_file(cache_file or os.path.join(app_dir, 'data', 'thumbnail_cache.json'))
+        self._cache = self.cache_store.load({}) or {}
+        self._fonts = {}
+
+    def render(self, team_a, team_b, competition='', date=None, score=None):
+        """
+        Génère (ou récupère du cache) la miniature du match
+
+        Args:
+            team_a (dict): Équipe A ({'name', 'logo'})
+            team_b (dict): Équipe B ({'name', 'logo'})
+            competition: Nom de la compétition
+            date: Date affichée (par défaut aujourd'hui, JJ.MM.AAAA)
+            score (dict): {'teamA': {'score', 'sets'}, 'teamB': {...}} pour afficher le score (optionnel)
+
+        Returns:
+            dict: {'hash', 'path', 'url', 'size', 'cached', 'inputHash'}
+        """
+        if Image is None:
+            raise ThumbnailUnavailable("Pillow n'est pas installé")
+
+        inputs = self._inputs(team_a, team_b, competition, date, score)
+        input_hash = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+        cached = self._cache.get(input_hash)
+        if cached:
+            blob = self.media_store.get(cached)
+            if blob and os.path.exists(blob['path']):
+                return dict(blob, cached=True, inputHash=input_hash)
+
+        image = self._draw(team_a, team_b, inputs)
+
+        fd, tmp_path = tempfile.mkstemp(suffix='.jpg')
+        os.close(fd)
+        try:
+            image.save(tmp_path, 'JPEG', quality=90, optimize=True, progressive=True)
+            blob = self.media_store.put_file(tmp_path)
+        finally:
+            os.remove(tmp_path)
+
+        # Oublier les rendus dont le fichier a été supprimé par le ramasse-miettes
+        self._cache = {key: value for key, value in self._cache.items() if self.media_store.get(value)}
+        self._cache[input_hash] = blob['hash']
+        self.cache_store.save(self._cache)
+        logger.info(f"Miniature du match générée: {team_a.get('name')} - {team_b.get('name')}")
+        return dict(blob, cached=False, inputHash=input_hash)
+
+    def _inputs(self, team_a, team_b, competition, date, score):
+        """Paramètres qui déterminent le rendu (servent à calculer l'empreinte)"""
+        inputs = {
+            'version': TEMPLATE_VERSION,
+            'size': THUMBNAIL_SIZE,
+            'teams': [
+                {'name': team.get('name', ''), 'logo': self.logo_pipeline.hash_from_url(team.get('logo')) or team.get('logo')}
+                for team in (team_a, team_b)
+            ],
+            'competition': competition or '',
+            'date': date or datetime.now().strftime('%d.%m.%Y'),
+            'score': None
+        }
+        if score:
+            inputs['score'] = [
+                {'score': score[key].get('score', 0), 'sets': score[key].get('sets', 0)}
+                for key in ('teamA', 'teamB')
+            ]
+        return inputs
+
+    def _draw(self, team_a, team_b, inputs):
+        """Dessine la miniature"""
+        width, height = THUMBNAIL_SIZE
+        image = Image.new('RGB', THUMBNAIL_SIZE, BACKGROUND_BOTTOM)
+        draw = ImageDraw.Draw(image)
+
+        # Dégradé vertical
+        for y in range(height):
+            ratio = y / (height - 1)
+            color = tuple(int(top + (bottom - top) * ratio) for top, bottom in zip(BACKGROUND_TOP, BACKGROUND_BOTTOM))
+            draw.line([(0, y), (width, y)], fill=color)
+
+        # Bandeau de la compétition
+        draw.rectangle([0, 0, width, 8], fill=ACCENT)
+        if inputs['competition']:
+            self._text(draw, (width // 2, 70), inputs['competition'].upper(), 44, MUTED)
+
+        # Logos et noms des équipes
+        centers = (width // 4, width * 3 // 4)
+        for team, center in zip((team_a, team_b), centers):
+            self._paste_logo(image, team.get('logo'), (center, 320), 300)
+            self._text(draw, (center, 530), team.get('name', ''), self._fit_size(team.get('name', ''), 56, 520), TEXT)
+
+        # Score ou « VS » au centre
+        if inputs['score']:
+            score_a, score_b = inputs['score']
+            self._text(draw, (width // 2, 300), f"{score_a['sets']} - {score_b['sets']}", 110, ACCENT)
+            self._text(draw, (width // 2, 400), f"{score_a['score']} - {score_b['score']}", 56, TEXT)
+        else:
+            self._text(draw, (width // 2, 320), 'VS', 120, ACCENT)
+
+        # Date
+        self._text(draw, (width // 2, 650), inputs['date'], 40, MUTED)
+        return image
+
+    def _paste_logo(self, image, logo, center, box):
+        """Colle le logo d'une équipe centré dans un carré de `box` pixels"""
+        path = self.logo_pipeline.path_for(logo, 'roster') if logo else None
+        if not path:
+            return
+        try:
+            with Image.open(path) as source:
+                logo_image = source.convert('RGBA')
+            logo_image.thumbnail((box, box), Image.LANCZOS)
+            position = (center[0] - logo_image.width // 2, center[1] - logo_image.height // 2)
+            image.paste(logo_image, position, logo_image)
+        except Exception as e:
+            logger.warning(f"Logo ignoré pour la miniature ({path}): {e}")
+
+    def _text(self, draw, center, text, size, fill):
+        """Écrit un texte centré sur un point"""
+        draw.text(center, text, font=self._font(size), fill=fill, anchor='mm')
+
+    def _fit_size(self, text, size, max_width):
+        """Réduit la taille de police jusqu'à ce que le texte tienne dans max_width"""
+        while size > 20 and self._font(size).getlength(text) > max_width:
+            size -= 4
+        return size
+
+    def _font(self, size):
+        """Charge (une fois par taille) la première police disponible"""
+        if size not in self._fonts:
+            font = None
+            for candidate in FONT_CANDIDATES:
+                try:
+                    font = ImageFont.truetype(candidate, size)
+                    break
+                except OSError:
+                    continue
+            self._fonts[size] = font or ImageFont.load_default(size=size)
+        return self._fonts[size]
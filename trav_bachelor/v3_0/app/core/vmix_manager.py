@@ -5,8 +5,12 @@
 import requests
 from requests import RequestException
 from urllib.parse import urljoin # this import is used to construct URLs correctly
+from urllib.parse import urlencode
 import xml.etree.ElementTree as ET #todo source de cet import
+import time
+import socket
 import logging
+import threading
 # Configuration du logger
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -17,20 +21,222 @@ logger = logging.getLogger('vmix_manager')
 #host = '127.0.0.1'
 #port = 8088
 
+
+def categorize_inputs(inputs):
+    """
+    Répartit les inputs vMix par catégorie pour l'interface
+
+    Args:
+        inputs (list): Inputs retournés par VMixManager
+
+    Returns:
+        dict: {'video': [...], 'audio': [...], 'title': [...], 'other': [...]}
+    """
+    categorized_inputs = {
+        'video': [],
+        'audio': [],
+        'title': [],
+        'other': []
+    }
+
+    for input_data in inputs:
+        input_type = input_data.get('type', '').lower()
+        name = input_data.get('title', '').lower()
+
+        # Déterminer la catégorie de l'input
+        if any(keyword in input_type for keyword in ['capture', 'camera', 'video']):
+            category = 'video'
+        elif any(keyword in input_type for keyword in ['audio', 'sound']) or \
+             any(keyword in name for keyword in ['mic', 'audio', 'sound', 'comment', 'ambiance']):
+            category = 'audio'
+        elif any(keyword in input_type for keyword in ['title', 'gt']):
+            category = 'title'
+        else:
+            category = 'other'
+
+        # Ajouter l'input à sa catégorie avec toutes les informations nécessaires
+        categorized_inputs[category].append({
+            'id': input_data.get('number'),
+            'name': input_data.get('title'),
+            'type': input_data.get('type'),
+            'state': input_data.get('state')
+        })
+
+    return categorized_inputs
+
+
+def player_card_fields(player, team_name=None):
+    """
+    Champs du titre de détail d'un joueur
+
+    Args:
+        player (dict): Données du joueur (prenom, nom, numero, position, taille)
+        team_name (str): Nom de l'équipe (optionnel)
+
+    Returns:
+        dict: {nom_champ: valeur}
+    """
+    fields = {
+        "PlayerName": f"{player.get('prenom', '')} {player.get('nom', '').upper()}",
+        "PlayerNumber": player.get('numero', 'N/A'),
+        "Position": player.get('position', 'Non spécifiée'),
+        "Height": f"{player.get('taille', 'N/A')} cm" if player.get('taille') else "Non spécifiée"
+    }
+    if team_name:
+        fields["TeamName"] = team_name
+    return fields
+
+
 class VMixManager:
-    def __init__(self, host='127.0.0.1', port=8088):
+    def __init__(self, host='127.0.0.1', port=8088, snapshot_ttl=0.5, tcp_port=8099):
         """
         Initialise le gestionnaire vMix
 
         Args:
             host: Adresse IP du serveur vMix
             port: Port du serveur vMix
+            snapshot_ttl: Durée (secondes) pendant laquelle l'état XML de vMix est réutilisé
+            tcp_port: Port de l'API TCP de vMix (envoi de commandes groupées)
         """
         self.host = host
         self.port = port
+        self.tcp_port = tcp_port
         self.base_url = f"http://{host}:{port}/api/"
         logger.info(f"VMixManager initialized with base URL: {self.base_url}")
 
+        # Instantané de l'état de vMix (une seule requête XML pour tous les lecteurs)
+        self.snapshot_ttl = snapshot_ttl
+        self.snapshot_version = 0
+        self._snapshot = None
+        self._levels = {'inputs': {}, 'master': None, 'buses': {}}
+        self._snapshot_time = 0.0
+        self._snapshot_lock = threading.Lock()
+
+    def get_snapshot(self, max_age=None):
+        """
+        Récupère l'état complet de vMix à partir d'une seule requête XML
+
+        L'instantané est réutilisé pendant `max_age` secondes ; les requêtes
+        simultanées attendent la même requête vers vMix. Sa version n'augmente
+        que si l'état a réellement changé.
+
+        Args:
+            max_age: Âge maximal (secondes) de l'instantané réutilisé (par défaut snapshot_ttl)
+
+        Returns:
+            dict: {'connected', 'version', 'inputs', 'active', 'preview', 'overlays',
+                   'streaming', 'recording', 'external', 'replay', 'fetchedAt'}
+                  ('replay' : état de l'input Replay {'input', 'recording', 'live', 'eventsList'} ou None)
+        """
+        max_age = self.snapshot_ttl if max_age is None else max_age
+        with self._snapshot_lock:
+            if self._snapshot is not None and time.monotonic() - self._snapshot_time < max_age:
+                return self._snapshot
+
+            state, self._levels = self._fetch_state()
+            previous = self._snapshot
+            if previous is None or any(previous.get(key) != value for key, value in state.items()):
+                self.snapshot_version += 1
+
+            self._snapshot = dict(state, version=self.snapshot_version, fetchedAt=time.time())
+            self._snapshot_time = time.monotonic()
+            return self._snapshot
+
+    def get_levels(self, max_age=None):
+        """
+        Récupère les niveaux audio (meterF1/meterF2) lus avec l'instantané
+
+        Les niveaux changent en permanence : ils ne font pas partie de l'état
+        versionné, mais sont lus par la même requête XML que l'instantané.
+
+        Args:
+            max_age: Âge maximal (secondes) de l'instantané réutilisé
+
+        Returns:
+            dict: {'inputs': {numéro: (gauche, droite)}, 'master': (gauche, droite) ou None,
+                   'buses': {nom: (gauche, droite)}} (amplitudes linéaires 0-1)
+        """
+        self.get_snapshot(max_age)
+        return self._levels
+
+    def _fetch_state(self):
+        """Interroge vMix et convertit son état XML en dictionnaire (état, niveaux audio)"""
+        levels = {'inputs': {}, 'master': None, 'buses': {}}
+        state = {
+            'connected': False,
+            'inputs': [],
+            'active': None,
+            'preview': None,
+            'overlays': {},
+            'streaming': False,
+            'recording': False,
+            'external': False,
+            'replay': None
+        }
+        try:
+            response = requests.get(self.base_url, timeout=2)
+            if response.status_code != 200:
+                return state, levels
+            root = ET.fromstring(response.text)
+        except (RequestException, ET.ParseError) as e:
+            logger.debug(f"État vMix indisponible: {e}")
+            return state, levels
+
+        state['connected'] = True
+        for input_elem in root.findall('./inputs/input'):
+            number = input_elem.get('number', '')
+            title = input_elem.get('title', '') or f"Input {number}"
+            input_type = input_elem.get('type', '')
+            state['inputs'].append({
+                'id': number,
+                'number': number,
+                'key': input_elem.get('key', ''),
+                'name': title,
+                'title': title,
+                'type': input_type,
+                'state': input_elem.get('state', ''),
+                'muted': input_elem.get('muted') == 'True',
+                'volume': input_elem.get('volume'),
+                'audiobusses': input_elem.get('audiobusses', ''),
+                'category': self._determine_input_category(input_type, title)
+            })
+            if input_elem.get('meterF1') is not None:
+                levels['inputs'][number] = self._meter(input_elem)
+            replay = input_elem.find('replay')
+            if input_type == 'Replay' and replay is not None and state['replay'] is None:
+                state['replay'] = {
+                    'input': number,
+                    'recording': replay.get('recording') == 'True',
+                    'live': replay.get('live') == 'True',
+                    'eventsList': int(replay.get('events')) if (replay.get('events') or '').isdigit() else 1
+                }
+
+        state['active'] = root.findtext('active')
+        state['preview'] = root.findtext('preview')
+        for overlay in root.findall('./overlays/overlay'):
+            if overlay.text:
+                state['overlays'][overlay.get('number', '')] = overlay.text
+        for key in ('streaming', 'recording', 'external'):
+            state[key] = root.findtext(key) == 'True'
+
+        audio = root.find('audio')
+        if audio is not None:
+            for bus in audio:
+                if bus.tag == 'master':
+                    levels['master'] = self._meter(bus)
+                elif bus.tag.startswith('bus'):
+                    levels['buses'][bus.tag[3:]] = self._meter(bus)
+        return state, levels
+
+    def _meter(self, element):
+        """Lit les niveaux gauche/droite (meterF1/meterF2) d'un élément XML"""
+        def to_float(value):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return 0.0
+        return to_float(element.get('meterF1')), to_float(element.get('meterF2'))
+
     def check_connection(self):
         """Vérifie la connexion à vMix"""
         try:
@@ -201,50 +407,12 @@ class VMixManager:
 
             # Envoi des données à vMix
             responses = []
-
-            # Nom du joueur
-            params = {
-                "Function": "SetText",
-                "Input": title_input,
-                "SelectedName": "PlayerName",
-                "Value": f"{player.get('prenom', '')} {player.get('nom', '').upper()}"
-            }
-            responses.append(requests.get(self.base_url, params=params, timeout=2))
-
-            # Numéro du joueur
-            params = {
-                "Function": "SetText",
-                "Input": title_input,
-                "SelectedName": "PlayerNumber",
-                "Value": player.get('numero', 'N/A')
-            }
-            responses.append(requests.get(self.base_url, params=params, timeout=2))
-
-            # Position du joueur
-            params = {
-                "Function": "SetText",
-                "Input": title_input,
-                "SelectedName": "Position",
-                "Value": player.get('position', 'Non spécifiée')
-            }
-            responses.append(requests.get(self.base_url, params=params, timeout=2))
-
-            # Taille du joueur
-            params = {
-                "Function": "SetText",
-                "Input": title_input,
-                "SelectedName": "Height",
-                "Value": f"{player.get('taille', 'N/A')} cm" if player.get('taille') else "Non spécifiée"
-            }
-            responses.append(requests.get(self.base_url, params=params, timeout=2))
-
-            # Équipe du joueur (si fournie)
-            if team_name:
+            for field_name, value in player_card_fields(player, team_name).items():
                 params = {
                     "Function": "SetText",
                     "Input": title_input,
-                    "SelectedName": "TeamName",
-                    "Value": team_name
+                    "SelectedName": field_name,
+                    "Value": value
                 }
                 responses.append(requests.get(self.base_url, params=params, timeout=2))
 
@@ -358,6 +526,63 @@ class VMixManager:
             logger.error(f"Erreur lors de l'envoi de la commande: {str(e)}")
             return False
 
+    def send_batch(self, commands):
+        """
+        Envoie plusieurs commandes à vMix en un seul envoi
+
+        Les commandes sont écrites ensemble sur une connexion à l'API TCP
+        (une ligne FUNCTION par commande) ; si l'API TCP est injoignable,
+        elles sont envoyées une par une à l'API HTTP. Une fois écrites, elles
+        ne sont jamais renvoyées, même si les réponses n'arrivent pas toutes.
+
+        Args:
+            commands (list): [(fonction, {paramètre: valeur})]
+
+        Returns:
+            int: Nombre de commandes exécutées avec succès
+        """
+        if not commands:
+            return 0
+        lines = "".join(f"FUNCTION {function} {urlencode(params)}\r\n" for function, params in commands)
+        responses = None
+        try:
+            with socket.create_connection((self.host, self.tcp_port), timeout=2) as connection:
+                connection.sendall(lines.encode('utf-8'))
+                # Une réponse par commande : 'FUNCTION OK ...' ou 'FUNCTION ER ...'
+                # (le message d'accueil 'VERSION OK ...' n'en fait pas partie)
+                responses = []
+                buffer = b''
+                try:
+                    while len(responses) < len(commands):
+                        data = connection.recv(4096)
+                        if not data:
+                            break
+                        *complete, buffer = (buffer + data).split(b'\r\n')
+                        responses += [line.decode('utf-8', errors='replace') for line in complete
+                                      if line.startswith(b'FUNCTION')]
+                except OSError as e:
+                    # Commandes déjà écrites : ne compter que les réponses reçues
+                    logger.warning(f"Réponses vMix incomplètes ({len(responses)}/{len(commands)}): {e}")
+        except OSError as e:
+            if responses is None:
+                logger.debug(f"API TCP de vMix indisponible ({e}) : envoi des commandes par HTTP")
+
+        if responses is not None:
+            for line in responses:
+                if not line.startswith('FUNCTION OK'):
+                    logger.warning(f"Commande vMix refusée: {line}")
+            logger.info(f"{len(commands)} commandes vMix envoyées en un lot (TCP)")
+            return sum(1 for line in responses if line.startswith('FUNCTION OK'))
+
+        succeeded = 0
+        for function, params in commands:
+            try:
+                response = requests.get(self.base_url, params=dict(params, Function=function), timeout=2)
+                succeeded += response.status_code == 200
+            except RequestException as e:
+                logger.error(f"Erreur lors de l'envoi de la commande {function}: {e}")
+        return succeeded
+
     ######### title cmd #########
 
     def set_title_text(self, input_id, field_name, text):
@@ -726,6 +951,31 @@ class VMixManager:
             logger.error(f"Error adjusting volume in vMix: {e}")
             return False
 
+    def set_volume_fade(self, input_number, volume, duration_ms):
+        """
+        Amène le volume d'une entrée audio à une valeur par un fondu exécuté par vMix
+
+        Args:
+            input_number: Numéro ou nom de l'input
+            volume: Volume final (entre 0 et 100)
+            duration_ms: Durée du fondu (millisecondes)
+
+        Returns:
+            bool: True si l'opération a réussi, False sinon
+        """
+        try:
+            params = {
+                "Function": "SetVolumeFade",
+                "Input": input_number,
+                "Value": f"{int(round(max(0, min(100, volume))))},{int(max(0, duration_ms))}"
+            }
+            logger.debug(f"Fondu du volume de l'input {input_number}: {params['Value']}")
+            response = requests.get(self.base_url, params=params, timeout=2)
+            return response.status_code == 200
+        except RequestException as e:
+            logger.error(f"Error fading volume in vMix: {e}")
+            return False
+
     def get_audio_status(self, input_number=None):
         """
         Récupère le statut audio des entrées vMix
@@ -929,18 +1179,8 @@ class VMixManager:
             return False
 
     def get_active_input(self):
-        """Récupère l'entrée actuellement active dans vMix"""
-        try:
-            response = requests.get(self.base_url, timeout=3)
-            if response.status_code == 200:
-                root = ET.fromstring(response.text)
-                active = root.find('active')
-                if active is not None:
-                    return active.text
-            return None
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération de l'entrée active: {str(e)}")
-            return None
+        """Récupère l'entrée actuellement active dans vMix (depuis l'instantané partagé)"""
+        return self.get_snapshot()['active']
 
 
     #### méthode pour le voleyball ####
@@ -53,10 +53,13 @@ const app = Vue.createApp({
     // Vérification initiale de la connexion vMix
     this.checkVMixConnection();
 
-    // Mise à jour périodique du statut de connexion
-    setInterval(() => {
-      this.checkVMixConnection();
-    }, 180000); // Vérifier toutes les 3 minutes
+    // Mises à jour du statut de connexion poussées par le serveur
+    if (typeof io !== 'undefined') {
+      const socket = io();
+      socket.on('vmix_status', (data) => {
+        this.connected = data.connected;
+      });
+    }
   }
 });
 
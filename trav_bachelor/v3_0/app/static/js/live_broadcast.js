@@ -66,6 +66,9 @@ createApp({
             // Événements de replay marqués
             replayEvents: [],
 
+            // Résumé en cours (clips enchaînés par le serveur)
+            highlight: { status: 'idle' },
+
             // Nom pour le marquage d'événements
             eventName: "",
 
@@ -75,6 +78,21 @@ createApp({
             // Statut du rafraîchissement
             isRefreshing: false,
 
+            // ETag du dernier état du direct reçu (/api/live/state)
+            liveStateEtag: null,
+
+            // Match suivi (salon Socket.IO) et tally vMix
+            matchId: null,
+            vmixConnected: false,
+            tally: {
+                program: null,
+                preview: null
+            },
+            overlays: {},
+
+            // Vumètres : {canal: [gauche, droite, crête gauche, crête droite]} en dBFS
+            audioLevels: {},
+
             // Variables pour suivre les points consécutifs
             consecutivePoints: {
                 A: 0,
@@ -117,20 +135,17 @@ createApp({
         // Initialisation unifiée de l'application
         async initialize() {
             try {
-                // Récupérer le statut de connexion à vMix
-                await this.checkVMixConnection();
-
-                // Récupérer les entrées vidéo disponibles
-                await this.loadVMixInputs();
-
-                // Charger les données des équipes du match
-                await this.loadMatchTeams();
-
-                // Vérifier l'état de streaming et d'enregistrement
-                await this.checkStreamingStatus();
-
-                // Charger les événements de replay existants
-                await this.loadReplayEvents();
+                // Récupérer tout l'état du direct en une seule requête
+                const loaded = await this.loadLiveState();
+
+                if (!loaded) {
+                    // Repli sur les appels individuels
+                    await this.checkVMixConnection();
+                    await this.loadVMixInputs();
+                    await this.loadMatchTeams();
+                    await this.checkStreamingStatus();
+                    await this.loadReplayEvents();
+                }
 
                 // Détecter les inputs pour le commentateur et l'ambiance
                 this.detectSpecialInputs();
@@ -144,6 +159,44 @@ createApp({
             }
         },
 
+        // Charger l'état agrégé du direct (304 si rien n'a changé depuis le dernier chargement)
+        async loadLiveState() {
+            try {
+                const headers = this.liveStateEtag ? { 'If-None-Match': this.liveStateEtag } : {};
+                const response = await fetch('/api/live/state', { headers });
+
+                if (response.status === 304) {
+                    return true;
+                }
+                if (!response.ok) {
+                    return false;
+                }
+
+                this.liveStateEtag = response.headers.get('ETag');
+                const state = await response.json();
+
+                this.matchId = state.matchId;
+                this.vmixConnected = state.vmix.connected;
+                this.tally = { program: state.tally.program, preview: state.tally.preview };
+                this.overlays = state.tally.overlays || {};
+
+                if (state.vmix.connected) {
+                    this.addNotification(`Connecté à vMix (${state.vmix.host}:${state.vmix.port})`, "success");
+                } else {
+                    this.addNotification("Impossible de se connecter à vMix", "danger");
+                }
+
+                this.applyVMixInputs(state.inputs);
+                this.applyMatchTeams(state.match);
+                this.updateStreamingStatus(state.streaming);
+                this.replayEvents = state.replay.events || [];
+                return true;
+            } catch (error) {
+                console.error("Erreur lors du chargement de l'état du direct:", error);
+                return false;
+            }
+        },
+
         // Vérifier la connexion à vMix
         async checkVMixConnection() {
             try {
@@ -164,34 +217,134 @@ createApp({
             }
         },
 
+        // Gestionnaires des événements du direct (communs à Socket.IO et au flux SSE)
+        liveEventHandlers() {
+            return {
+                // Connexion à vMix
+                vmix_status: (data) => {
+                    if (data.connected !== this.vmixConnected) {
+                        this.addNotification(
+                            data.connected ? `Connecté à vMix (${data.host}:${data.port})` : "Connexion à vMix perdue",
+                            data.connected ? "success" : "danger"
+                        );
+                    }
+                    this.vmixConnected = data.connected;
+                },
+
+                // Tally (program / preview) et overlays
+                tally_updated: (data) => {
+                    this.tally = data;
+                },
+                overlays_updated: (data) => {
+                    this.overlays = data.overlays || {};
+                },
+
+                // Mises à jour de score
+                score_updated: (data) => {
+                    this.scoreData = data;
+                },
+
+                // Mises à jour de l'état de streaming
+                streaming_status: (data) => {
+                    this.updateStreamingStatus(data);
+                },
+
+                // Mises à jour des entrées vMix
+                vmix_inputs_updated: (data) => {
+                    this.applyVMixInputs(data.inputs);
+                },
+
+                // Notifications d'événements
+                event_notification: (data) => {
+                    this.addNotification(data.message, data.type || 'info');
+                },
+
+                // Mises à jour des événements de replay
+                replay_events_updated: (data) => {
+                    this.replayEvents = data.events;
+                },
+
+                // Avancement du résumé en cours
+                highlight_updated: (data) => {
+                    this.highlight = data;
+                }
+            };
+        },
+
+        // Changement de match : mettre à jour les équipes affichées
+        onMatchUpdated(data) {
+            this.matchId = data.matchId;
+            this.applyMatchTeams(data);
+        },
+
         // Configuration de socket.io
         setupSocketConnection() {
-            const socket = io();
+            if (typeof io === 'undefined') {
+                this.setupEventSource();
+                return;
+            }
 
-            // Gérer les mises à jour de score
-            socket.on('score_updated', (data) => {
-                this.scoreData = data;
+            const socket = io({ reconnectionAttempts: 3 });
+            let failures = 0;
+
+            // WebSocket bloqué (proxy, poste verrouillé) : repli sur le flux SSE
+            socket.on('connect_error', () => {
+                failures += 1;
+                if (failures >= 3 && !this.eventSource) {
+                    socket.close();
+                    this.setupEventSource();
+                }
             });
 
-            // Gérer les mises à jour de l'état de streaming
-            socket.on('streaming_status', (data) => {
-                this.updateStreamingStatus(data);
+            // S'abonner au salon du match à la connexion (et à chaque reconnexion)
+            socket.on('status', (data) => {
+                socket.emit('subscribe', { match_id: this.matchId || data.matchId });
+                socket.emit('subscribe_meters');
             });
 
-            // Gérer les mises à jour des entrées vMix
-            socket.on('vmix_inputs_updated', (data) => {
-                this.videoInputs = data.inputs;
-                this.initializeAudioStates();
+            // Trames des vumètres (uniquement via Socket.IO : trop fréquentes pour le flux SSE)
+            socket.on('audio_levels', (data) => {
+                this.audioLevels = data.channels;
+            });
+
+            // Changement de match : rejoindre le salon du nouveau match
+            socket.on('match_updated', (data) => {
+                this.onMatchUpdated(data);
+                socket.emit('subscribe', { match_id: data.matchId });
             });
 
-            // Gérer les notifications d'événements
-            socket.on('event_notification', (data) => {
-                this.addNotification(data.message, data.type || 'info');
+            Object.entries(this.liveEventHandlers()).forEach(([name, handler]) => socket.on(name, handler));
+        },
+
+        // Flux Server-Sent Events (reprise automatique avec Last-Event-ID)
+        setupEventSource(lastEventId = null) {
+            const params = new URLSearchParams();
+            if (this.matchId) params.set('match_id', this.matchId);
+            if (lastEventId) params.set('last_event_id', lastEventId);
+
+            const source = new EventSource(`/api/live/events?${params}`);
+            this.eventSource = source;
+
+            const listen = (name, handler) => {
+                source.addEventListener(name, (event) => {
+                    this.lastEventId = event.lastEventId;
+                    handler(JSON.parse(event.data));
+                });
+            };
+
+            Object.entries(this.liveEventHandlers()).forEach(([name, handler]) => listen(name, handler));
+
+            // Événements manqués plus disponibles : recharger l'état complet
+            listen('reset', () => {
+                this.liveStateEtag = null;
+                this.loadLiveState();
             });
 
-            // Gérer les mises à jour des événements de replay
-            socket.on('replay_events_updated', (data) => {
-                this.replayEvents = data.events;
+            // Changement de match : rouvrir le flux sur le nouveau match sans perdre la position
+            listen('match_updated', (data) => {
+                this.onMatchUpdated(data);
+                source.close();
+                this.setupEventSource(this.lastEventId);
             });
         },
 
@@ -200,7 +353,17 @@ createApp({
             try {
                 const response = await fetch('/api/vmix/inputs');
                 const data = await response.json();
+                this.applyVMixInputs(data);
+            } catch (error) {
+                console.error('Erreur lors du chargement des entrées vMix:', error);
+                this.addNotification('Erreur lors du chargement des entrées vMix', 'danger');
+                this.loading = false;
+            }
+        },
 
+        // Appliquer la liste des entrées vMix (par catégorie)
+        applyVMixInputs(data) {
+            try {
                 // Organiser les inputs par catégorie
                 this.videoInputs = data.video || [];
 
@@ -238,6 +401,27 @@ createApp({
             }
         },
 
+        // Largeur et couleur de la barre d'un vumètre (plancher -60 dB)
+        meterStyle(channel, side) {
+            const levels = this.audioLevels[channel];
+            const db = levels ? levels[side] : -60;
+            const color = db > -6 ? '#dc3545' : (db > -18 ? '#ffc107' : '#198754');
+            return { width: `${(db + 60) / 60 * 100}%`, backgroundColor: color };
+        },
+
+        // Position de l'indicateur de crête d'un vumètre
+        meterHoldStyle(channel, side) {
+            const levels = this.audioLevels[channel];
+            const db = levels ? levels[side + 2] : -60;
+            return { left: `calc(${(db + 60) / 60 * 100}% - 2px)`, display: db > -60 ? 'block' : 'none' };
+        },
+
+        // Niveaux affichés au survol d'un vumètre
+        meterTitle(channel) {
+            const levels = this.audioLevels[channel];
+            return levels ? `G ${levels[0]} dB / D ${levels[1]} dB (crêtes ${levels[2]} / ${levels[3]} dB)` : 'Aucun signal';
+        },
+
         // Trouver un input par mot-clé dans son nom
         findInput(inputs, keyword) {
             return inputs.find(input =>
@@ -443,20 +627,23 @@ createApp({
         loadMatchTeams() {
             return fetch('/api/teams/match/current')
                 .then(response => response.json())
-                .then(data => {
-                    if (data.team_a) {
-                        this.scoreData.teamA.name = data.team_a.name;
-                    }
-
-                    if (data.team_b) {
-                        this.scoreData.teamB.name = data.team_b.name;
-                    }
-                })
+                .then(data => this.applyMatchTeams(data))
                 .catch(error => {
                     console.error('Erreur lors du chargement des équipes du match:', error);
                 });
         },
 
+        // Appliquer les équipes du match au score affiché
+        applyMatchTeams(data) {
+            if (data.team_a) {
+                this.scoreData.teamA.name = data.team_a.name;
+            }
+
+            if (data.team_b) {
+                this.scoreData.teamB.name = data.team_b.name;
+            }
+        },
+
         // Vérifier l'état de streaming et d'enregistrement
         checkStreamingStatus() {
             return fetch('/api/vmix/streaming-status')
@@ -995,6 +1182,45 @@ createApp({
             });
         },
 
+        // Lancer un résumé (ex. les 5 derniers points du set qui vient de se terminer)
+        playHighlights(criteria, name) {
+            fetch('/api/replay/highlights/play', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ ...criteria, name: name })
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.status === 'success') {
+                    this.highlight = data.highlight;
+                    this.addNotification(`${data.highlight.name} : ${data.highlight.events.length} clips`, 'success');
+                } else {
+                    this.addNotification(data.error || 'Erreur lors du lancement du résumé', 'danger');
+                }
+            })
+            .catch(error => {
+                console.error('Erreur lors du lancement du résumé:', error);
+                this.addNotification('Erreur lors du lancement du résumé', 'danger');
+            });
+        },
+
+        // Arrêter le résumé en cours
+        stopHighlights() {
+            fetch('/api/replay/highlights/stop', {
+                method: 'POST'
+            })
+            .then(response => response.json())
+            .then(data => {
+                this.highlight = data.highlight;
+            })
+            .catch(error => {
+                console.error('Erreur lors de l\'arrêt du résumé:', error);
+                this.addNotification('Erreur lors de l\'arrêt du résumé', 'danger');
+            });
+        },
+
         // Mettre en pause le replay
         pauseReplay() {
             fetch('/api/replay/pause', {
@@ -1060,14 +1286,15 @@ createApp({
         },
 
         // Lire un événement de replay spécifique
-        playReplayEvent(eventIndex, speed) {
+        // (identifiant stable de l'événement, ou index pour les événements sans identifiant)
+        playReplayEvent(eventRef, speed) {
             fetch('/api/replay/play-event', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
                 body: JSON.stringify({
-                    eventIndex: eventIndex,
+                    ...(typeof eventRef === 'number' ? { eventIndex: eventRef } : { eventId: eventRef }),
                     speed: speed
                 })
             })
@@ -1086,16 +1313,14 @@ createApp({
         },
 
         // Supprimer un événement de replay
-        deleteReplayEvent(eventIndex) {
+        deleteReplayEvent(eventRef) {
             if (confirm('Êtes-vous sûr de vouloir supprimer cet événement ?')) {
                 fetch('/api/replay/delete-event', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json'
                     },
-                    body: JSON.stringify({
-                        eventIndex: eventIndex
-                    })
+                    body: JSON.stringify(typeof eventRef === 'number' ? { eventIndex: eventRef } : { eventId: eventRef })
                 })
                 .then(response => response.json())
                 .then(data => {
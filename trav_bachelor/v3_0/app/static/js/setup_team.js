@@ -63,6 +63,15 @@ createApp({
         }
     },
 
+    watch: {
+        // Le joueur sélectionné est le prochain affiché le plus probable
+        selectedPlayerId(index) {
+            if (index !== '') {
+                this.preparePlayerCard(index);
+            }
+        }
+    },
+
     computed: {
         // Propriété calculée pour obtenir les détails du joueur sélectionné
         selectedPlayer() {
@@ -620,13 +629,14 @@ createApp({
             const player = this.teamPlayers[this.selectedPlayerId];
             console.log("Affichage des détails du joueur dans vMix:", player);
             
-            fetch('/api/vmix/player-details', {
+            // Fiche déjà préparée hors antenne à la sélection : un seul changement d'overlay
+            fetch('/api/overlays/player-card', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
                 body: JSON.stringify({
-                    team_id: this.selectedTeamId,
+                    teamId: this.selectedTeamId,
                     player: player
                 })
             })
@@ -642,6 +652,28 @@ createApp({
                 console.error("Erreur lors de l'affichage des détails du joueur:", error);
                 this.addNotification(`Erreur lors de l'affichage des détails du joueur: ${error.message}`, 'danger');
             });
+        },
+
+        // Préparer la fiche d'un joueur dans le titre hors antenne (affichage instantané ensuite)
+        preparePlayerCard(index) {
+            const player = this.teamPlayers[index];
+            if (!this.selectedTeamId || !player) {
+                return;
+            }
+
+            fetch('/api/overlays/player-card/prepare', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({
+                    teamId: this.selectedTeamId,
+                    player: player
+                })
+            })
+            .catch(error => {
+                console.error("Erreur lors de la préparation de la fiche joueur:", error);
+            });
         }
     }
 }).mount('#setup-team-app');
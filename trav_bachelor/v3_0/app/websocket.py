@@ -0,0 +1,126 @@
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
+import logging
+from .core.event_bus import event_bus, match_room
+from .core.audio_meter import METERS_ROOM
+from .core.tally import tally_room
+from .api.live import live_monitor, audio_meter
+from .api.tally import tally_service
+from .api.vmix import audio_ducker
+
+# Configuration du logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('websocket')
+
+# Initialisation de l'extension (les gestionnaires sont enregistrés à l'appel de init_app)
+socketio = SocketIO()
+
+
+def init_app(app, **kwargs):
+    """
+    Initialise l'extension SocketIO avec l'application Flask
+
+    Args:
+        app: Application Flask
+        **kwargs: Options supplémentaires de SocketIO (async_mode, etc.)
+
+    Returns:
+        SocketIO: Extension initialisée
+    """
+    socketio.init_app(app, cors_allowed_origins="*", **kwargs)
+    event_bus.subscribe(forward_event)
+    audio_meter.listeners = meter_listeners
+    # Le ducking ne dépend d'aucun navigateur : il reprend dès le lancement s'il était activé
+    if audio_ducker.config['enabled']:
+        audio_ducker.start()
+    # Les sessions d'enregistrement (exports d'après-match) sont suivies même sans navigateur ouvert
+    live_monitor.start()
+    return socketio
+
+
+def meter_listeners():
+    """Indique si au moins un client est abonné aux vumètres"""
+    try:
+        return any(True for _ in socketio.server.manager.get_participants('/', METERS_ROOM))
+    except Exception:
+        return False
+
+
+def forward_event(event):
+    """
+    Transmet un événement du bus aux clients Socket.IO
+
+    Un seul emit par événement : le paquet est encodé une fois puis envoyé
+    à tous les clients du salon (ou à tous les clients si l'événement est global).
+    """
+    if socketio.server is None:
+        return
+    socketio.emit(event['name'], event['data'], to=event['room'])
+
+
+@socketio.on('connect')
+def handle_connect():
+    """Gère la connexion d'un client WebSocket"""
+    # Surveillance lancée avec l'application ; relancée ici si elle s'est arrêtée
+    live_monitor.start()
+    emit('status', {'connected': True, 'matchId': event_bus.match_id})
+
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    """Gère la déconnexion d'un client WebSocket"""
+    logger.debug("Client déconnecté du WebSocket")
+
+
+@socketio.on('subscribe')
+def handle_subscribe(data=None):
+    """
+    Abonne le client au salon d'un match (quitte le salon du match précédent)
+
+    Args:
+        data (dict): {'match_id': ...} (par défaut le match en cours)
+    """
+    match_id = (data or {}).get('match_id') or event_bus.match_id
+    room = match_room(match_id)
+
+    for joined in rooms():
+        if joined.startswith('match:') and joined != room:
+            leave_room(joined)
+    join_room(room)
+
+    emit('subscribed', {'matchId': match_id, 'room': room})
+
+
+@socketio.on('subscribe_meters')
+def handle_subscribe_meters():
+    """Abonne le client aux trames des vumètres audio"""
+    join_room(METERS_ROOM)
+    audio_meter.start()
+    emit('meters_config', audio_meter.config())
+    # Niveaux stables : aucune nouvelle trame ne serait envoyée avant le prochain changement
+    if audio_meter.last_frame is not None:
+        emit('audio_levels', audio_meter.last_frame)
+
+
+@socketio.on('unsubscribe_meters')
+def handle_unsubscribe_meters():
+    """Désabonne le client des vumètres (le service s'arrête sans abonné)"""
+    leave_room(METERS_ROOM)
+
+
+@socketio.on('subscribe_tally')
+def handle_subscribe_tally(data=None):
+    """
+    Abonne le client au tally d'un seul input
+
+    Args:
+        data (dict): {'input': numéro de l'input vMix}
+    """
+    input_number = str((data or {}).get('input', ''))
+    if not input_number:
+        return
+    for joined in rooms():
+        if joined.startswith('tally:'):
+            leave_room(joined)
+    join_room(tally_room(input_number))
+    tally_service.start()
+    emit('tally', tally_service.state(input_number))
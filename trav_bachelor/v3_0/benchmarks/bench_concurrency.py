@@ -0,0 +1,162 @@
+"""
+Test de charge : requêtes simultanées des opérateurs pendant que vMix répond lentement.
+
+Usage:
+    python benchmarks/bench_concurrency.py [--modes threading,gevent] [--clients 1,8,32,64]
+                                           [--requests 20] [--vmix-latency 0.3]
+
+Un faux vMix (port 8088, réponse XML après --vmix-latency secondes) remplace
+vMix. Pour chaque modèle de concurrence, le serveur est lancé avec
+`run.py --prod --async-mode <mode>` puis chaque client envoie alternativement
+une requête qui interroge vMix (/api/vmix/status) et une requête servie depuis
+la mémoire (/api/teams). Le débit et les latences montrent si une requête
+bloquée sur vMix retarde les autres.
+"""
+import argparse
+import http.server
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VMIX_PORT = 8088
+VMIX_XML = (b'<vmix><version>27.0.0.0</version><inputs>'
+            b'<input key="k1" number="1" type="Capture" title="Cam 1" state="Running"/>'
+            b'<input key="k2" number="2" type="Audio" title="Micro commentateur" state="Running"/>'
+            b'</inputs><active>1</active><preview>2</preview>'
+            b'<streaming>False</streaming><recording>False</recording></vmix>')
+
+SLOW_PATH = '/api/vmix/status'
+FAST_PATH = '/api/teams'
+
+
+def start_fake_vmix(latency):
+    """Démarre un faux serveur vMix qui répond après `latency` secondes"""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/xml')
+            self.send_header('Content-Length', str(len(VMIX_XML)))
+            self.end_headers()
+            self.wfile.write(VMIX_XML)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', VMIX_PORT), Handler)
+    except OSError:
+        sys.exit(f"Le port {VMIX_PORT} est déjà utilisé (vMix est-il lancé ?) : arrêter vMix pour ce test")
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    """Retourne un port TCP libre"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, port):
+    """Lance l'application en mode production et attend qu'elle réponde"""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(current_dir, 'run.py'), '--prod', '--async-mode', mode,
+         '--host', '127.0.0.1', '--port', str(port)],
+        cwd=current_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"Le serveur ({mode}) s'est arrêté au démarrage")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}{FAST_PATH}", timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    sys.exit(f"Le serveur ({mode}) ne répond pas")
+
+
+def run_clients(port, clients, requests_per_client):
+    """Lance les clients simultanés et retourne (durée, latences lentes, latences rapides, erreurs)"""
+    slow, fast, errors = [], [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client(index):
+        barrier.wait()
+        for number in range(requests_per_client):
+            path = SLOW_PATH if (index + number) % 2 == 0 else FAST_PATH
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=30).read()
+            except OSError as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                (slow if path == SLOW_PATH else fast).append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, slow, fast, errors
+
+
+def percentile(values, ratio):
+    """Percentile simple (valeurs en secondes, résultat en millisecondes)"""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du serveur en mode production")
+    parser.add_argument('--modes', default='threading,gevent', help="Modèles de concurrence à comparer")
+    parser.add_argument('--clients', default='1,8,32,64', help="Nombres de clients simultanés")
+    parser.add_argument('--requests', type=int, default=20, help="Requêtes par client")
+    parser.add_argument('--vmix-latency', type=float, default=0.3, help="Temps de réponse du faux vMix (secondes)")
+    args = parser.parse_args()
+
+    start_fake_vmix(args.vmix_latency)
+    print(f"Faux vMix: {args.vmix_latency * 1000:.0f} ms par requête")
+    print(f"{'mode':<10} {'clients':>7} {'req/s':>8} {'rapide p50':>11} {'rapide p95':>11} "
+          f"{'vMix p50':>9} {'vMix p95':>9} {'erreurs':>8}")
+
+    for mode in args.modes.split(','):
+        if mode in ('gevent', 'eventlet'):
+            try:
+                __import__(mode)
+            except ImportError:
+                print(f"{mode:<10} non installé (pip install {mode})")
+                continue
+
+        port = free_port()
+        process = start_server(mode, port)
+        try:
+            for clients in (int(value) for value in args.clients.split(',')):
+                duration, slow, fast, errors = run_clients(port, clients, args.requests)
+                total = len(slow) + len(fast)
+                print(f"{mode:<10} {clients:>7} {total / duration:>8.1f} {percentile(fast, 0.5):>9.1f}ms "
+                      f"{percentile(fast, 0.95):>9.1f}ms {percentile(slow, 0.5):>7.0f}ms "
+                      f"{percentile(slow, 0.95):>7.0f}ms {len(errors):>8}")
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Mesure l'import en flux d'un export de ligue (plusieurs équipes par fichier).
+
+Usage:
+    python benchmarks/bench_roster_import.py [--rows 50000] [--teams 2000] [--storage json|sqlite|all]
+
+Génère un CSV de test dans un répertoire temporaire puis mesure la durée et
+le débit de l'import pour chaque stockage. Le pic de mémoire Python est
+mesuré dans un second passage (tracemalloc ralentit fortement l'import).
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Ajouter le répertoire v3_0 au chemin de recherche de Python
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(current_dir)
+
+from app.core.persistence import JsonStore
+from app.core.roster_importer import RosterImporter
+from app.core.team_repository import TeamRepository
+from app.core.sqlite_team_repository import SqliteTeamRepository
+
+POSITIONS = ('Passeur', 'Pointu', 'Réceptionneur-attaquant', 'Central', 'Libéro')
+
+
+def generate_csv(path, rows, teams):
+    """Écrit un export de ligue factice de `rows` joueurs répartis en `teams` équipes"""
+    random.seed(42)
+    per_team = max(1, rows // teams)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Équipe', 'Numéro', 'Nom', 'Prénom', 'Poste', 'Taille', 'Date de naissance', 'Licence'])
+        for index in range(rows):
+            team = index // per_team
+            writer.writerow([
+                f"Club {team:04d}",
+                index % per_team % 100,
+                f"Nom{index}",
+                f"Prenom{index}",
+                random.choice(POSITIONS),
+                random.randint(165, 215),
+                f"{random.randint(1, 28):02d}/{random.randint(1, 12):02d}/{random.randint(1985, 2008)}",
+                f"LIC{index:07d}"
+            ])
+
+
+def run(storage, csv_path, work_dir, trace_memory=False):
+    """Importe le fichier dans un dépôt vide et retourne (rapport, durée, pic mémoire ou None)"""
+    os.makedirs(work_dir)
+    if storage == 'sqlite':
+        repository = SqliteTeamRepository(os.path.join(work_dir, 'teams.db'))
+    else:
+        teams_file = os.path.join(work_dir, 'teams.json')
+        JsonStore.for_file(teams_file, indent=4).save_now([])
+        repository = TeamRepository(teams_file)
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with open(csv_path, 'rb') as f:
+        report = RosterImporter(repository).import_file(f)
+    JsonStore.flush_all()
+    duration = time.perf_counter() - start
+
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return report, duration, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'import CSV des effectifs")
+    parser.add_argument('--rows', type=int, default=50000, help="Nombre de lignes du fichier généré")
+    parser.add_argument('--teams', type=int, default=2000, help="Nombre d'équipes dans le fichier")
+    parser.add_argument('--storage', choices=('json', 'sqlite', 'all'), default='all')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'league.csv')
+        generate_csv(csv_path, args.rows, args.teams)
+        size = os.path.getsize(csv_path) / (1024 * 1024)
+        print(f"Fichier généré: {args.rows} lignes, {args.teams} équipes, {size:.1f} Mo")
+
+        for storage in (('json', 'sqlite') if args.storage == 'all' else (args.storage,)):
+            report, duration, _ = run(storage, csv_path, os.path.join(tmp, storage))
+            _, _, peak = run(storage, csv_path, os.path.join(tmp, f"{storage}-memory"), trace_memory=True)
+            print(f"[{storage}] {report['rows']} lignes, {report['teamsCreated']} équipes, "
+                  f"{report['errorCount']} erreurs en {duration:.2f}s "
+                  f"({report['rows'] / duration:,.0f} lignes/s, pic mémoire {peak / (1024 * 1024):.1f} Mo)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Importe teams.json et current_match.json dans la base SQLite des équipes.
+
+Usage:
+    python migrate_teams_to_sqlite.py [--data-dir app/data] [--db app/data/teams.db]
+
+Démarrer ensuite l'application avec VOLLEYBACH_STORAGE=sqlite pour utiliser la base.
+"""
+import argparse
+import os
+import sys
+
+# Ajouter le répertoire courant au chemin de recherche de Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from app.core.sqlite_team_repository import SqliteTeamRepository
+
+
+def main():
+    default_data_dir = os.path.join(current_dir, 'app', 'data')
+
+    parser = argparse.ArgumentParser(description="Migration des équipes JSON vers SQLite")
+    parser.add_argument('--data-dir', default=default_data_dir, help="Répertoire contenant teams.json et current_match.json")
+    parser.add_argument('--db', default=None, help="Chemin de la base SQLite (défaut: <data-dir>/teams.db)")
+    args = parser.parse_args()
+
+    teams_file = os.path.join(args.data_dir, 'teams.json')
+    match_file = os.path.join(args.data_dir, 'current_match.json')
+    db_file = args.db or os.path.join(args.data_dir, 'teams.db')
+
+    if not os.path.exists(teams_file):
+        print(f"Fichier introuvable: {teams_file}")
+        return 1
+
+    repository = SqliteTeamRepository(db_file)
+    summary = repository.import_json(teams_file, match_file)
+
+    print(f"{summary['teams']} équipes et {summary['players']} joueurs importés dans {db_file}")
+    if summary['match']:
+        print("Configuration du match actuel importée")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
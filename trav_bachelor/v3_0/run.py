@@ -1,6 +1,80 @@
-from flask import Flask
 import sys
 import os
+import argparse
+
+# Modes d'exécution de Flask-SocketIO essayés dans l'ordre en production
+# gevent et eventlet sont optionnels (hors requirements.txt) : pip install gevent
+ASYNC_MODES = ('gevent', 'eventlet', 'threading')
+
+
+def parse_args(argv=None):
+    """
+    Lit les options de lancement
+
+    Args:
+        argv: Arguments de la ligne de commande (par défaut sys.argv)
+
+    Returns:
+        argparse.Namespace: Options
+    """
+    parser = argparse.ArgumentParser(description="Serveur de l'application Volleybach")
+    parser.add_argument('--prod', action='store_true',
+                        help="Mode production : sans debug ni rechargement, E/S vMix non bloquantes (gevent/eventlet) ou serveur multi-thread")
+    parser.add_argument('--async-mode', choices=('auto',) + ASYNC_MODES, default='auto',
+                        help="Modèle de concurrence en mode production (auto : gevent, puis eventlet, puis threading)")
+    parser.add_argument('--host', default=None, help="Adresse d'écoute (par défaut 127.0.0.1, 0.0.0.0 en production)")
+    parser.add_argument('--port', type=int, default=5000, help="Port d'écoute")
+    return parser.parse_args(argv)
+
+
+def prepare_async_mode(requested='auto'):
+    """
+    Choisit le modèle de concurrence et applique le monkey patching nécessaire
+
+    Doit être appelé avant l'import de l'application : avec gevent ou eventlet,
+    les sockets (requêtes vers vMix), les threads et les verrous deviennent
+    coopératifs et une requête bloquée sur vMix ne retient plus les autres.
+
+    Args:
+        requested: 'auto', 'gevent', 'eventlet' ou 'threading'
+
+    Returns:
+        str: Mode retenu
+    """
+    candidates = ASYNC_MODES if requested == 'auto' else (requested,)
+    for mode in candidates:
+        if mode == 'gevent':
+            # vMix est joignable par son adresse IP : la résolution bloquante évite la file
+            # d'attente du pool de threads de résolution DNS de gevent sous forte charge
+            os.environ.setdefault('GEVENT_RESOLVER', 'block')
+            try:
+                from gevent import monkey
+            except ImportError:
+                continue
+            monkey.patch_all()
+            return mode
+        if mode == 'eventlet':
+            try:
+                import eventlet
+            except ImportError:
+                continue
+            eventlet.monkey_patch()
+            return mode
+        if mode == 'threading':
+            if requested == 'auto':
+                print("gevent/eventlet non installés : serveur multi-thread (pip install gevent pour des E/S vMix non bloquantes)")
+            return mode
+    raise SystemExit(f"Mode '{requested}' indisponible : installer le paquet correspondant (pip install {requested})")
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    async_mode = prepare_async_mode(args.async_mode) if args.prod else 'threading'
+else:
+    args = None
+    async_mode = None
+
+from flask import Flask
 
 # Ajouter le répertoire parent au chemin de recherche de Python
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,7 +89,7 @@ from app.api import api_bp
 if hasattr(core_bp, 'create_app'):
     app = create_app()
 else:
-    app = Flask(__name__, 
+    app = Flask(__name__,
                 static_folder=os.path.join(current_dir, 'app', 'static'),
                 static_url_path='/static')
     app.register_blueprint(core_bp)
@@ -23,15 +97,24 @@ else:
 
 # Configuration de Socket.IO
 try:
-    from flask_socketio import SocketIO
-    socketio = SocketIO(app)
+    from app.websocket import init_app as init_socketio
+    socketio = init_socketio(app, async_mode=async_mode)
     use_socketio = True
 except ImportError:
     use_socketio = False
     print("Flask-SocketIO non disponible, fonctionnalités temps réel désactivées")
 
 if __name__ == '__main__':
-    if use_socketio:
-        socketio.run(app, debug=True, allow_unsafe_werkzeug=True)
+    if args.prod:
+        host = args.host or '0.0.0.0'
+        print(f"Mode production ({async_mode}) sur http://{host}:{args.port}")
+        if use_socketio:
+            # En mode threading, le serveur Werkzeug multi-thread est utilisé (sans debug ni rechargement)
+            socketio.run(app, host=host, port=args.port, debug=False, use_reloader=False,
+                         log_output=False, allow_unsafe_werkzeug=async_mode == 'threading')
+        else:
+            app.run(host=host, port=args.port, debug=False, use_reloader=False, threaded=True)
+    elif use_socketio:
+        socketio.run(app, host=args.host or '127.0.0.1', port=args.port, debug=True, allow_unsafe_werkzeug=True)
     else:
-        app.run(debug=True)
+        app.run(host=args.host or '127.0.0.1', port=args.port, debug=True)